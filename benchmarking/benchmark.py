@@ -18,9 +18,9 @@ from epinterface.sbem.flat_model import FlatModel
 from epinterface.weather import WeatherUrl
 
 
-def benchmark() -> None:
-    """Benchmark the flat model's runtime for different number of floors and with/without overheating calculation."""
-    base_parameters = FlatModel(
+def base_flat_model() -> FlatModel:
+    """The flat model which the benchmarks vary."""
+    return FlatModel(
         F2FHeight=3.25,
         Width=40,
         Depth=40,
@@ -95,6 +95,74 @@ def benchmark() -> None:
         ),
     )
 
+
+def overheating_config() -> OverheatingAnalysisConfig:
+    """The overheating analysis configuration used by the benchmarks."""
+    return OverheatingAnalysisConfig(
+        heat_thresholds=(
+            ThresholdWithCriteria(
+                threshold=26.0,
+                count_failure=CountFailureCriterion(max_hours=50),
+                streak_failure=StreakCriterion(min_streak_length_hours=50, max_count=0),
+                integrated_streak_failure=IntegratedStreakCriterion(
+                    min_streak_length_hours=50, max_integral=0
+                ),
+                exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
+            ),
+            ThresholdWithCriteria(
+                threshold=30.0,
+                count_failure=CountFailureCriterion(max_hours=50),
+                streak_failure=StreakCriterion(min_streak_length_hours=50, max_count=0),
+                integrated_streak_failure=IntegratedStreakCriterion(
+                    min_streak_length_hours=50, max_integral=0
+                ),
+                exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
+            ),
+            ThresholdWithCriteria(
+                threshold=35.0,
+                count_failure=CountFailureCriterion(max_hours=50),
+                streak_failure=StreakCriterion(min_streak_length_hours=50, max_count=0),
+                integrated_streak_failure=IntegratedStreakCriterion(
+                    min_streak_length_hours=50, max_integral=0
+                ),
+                exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
+            ),
+        ),
+        cold_thresholds=(
+            ThresholdWithCriteria(
+                threshold=10.0,
+                count_failure=CountFailureCriterion(max_hours=50),
+                streak_failure=StreakCriterion(min_streak_length_hours=50, max_count=0),
+                integrated_streak_failure=IntegratedStreakCriterion(
+                    min_streak_length_hours=50, max_integral=0
+                ),
+                exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
+            ),
+            ThresholdWithCriteria(
+                threshold=5.0,
+                count_failure=CountFailureCriterion(max_hours=50),
+                streak_failure=StreakCriterion(min_streak_length_hours=50, max_count=0),
+                integrated_streak_failure=IntegratedStreakCriterion(
+                    min_streak_length_hours=50, max_integral=0
+                ),
+                exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
+            ),
+        ),
+        heat_index_criteria=HeatIndexCriteria(
+            caution_or_worse_hours=4000,
+        ),
+        thermal_comfort=ThermalComfortAssumptions(
+            met=1.1,
+            clo=0.5,
+            v=0.1,
+        ),
+    )
+
+
+def benchmark() -> None:
+    """Benchmark the flat model's runtime for different number of floors and with/without overheating calculation."""
+    base_parameters = base_flat_model()
+
     print("Benchmarking flat model runtime")
     print("NFloors\tcalculate_overheating\telapsed_s")
 
@@ -105,77 +173,7 @@ def benchmark() -> None:
             flat_model = base_parameters.model_copy(update={"NFloors": num_floors})
 
             start = perf_counter()
-            flat_model.simulate(
-                overheating_config=OverheatingAnalysisConfig(
-                    heat_thresholds=(
-                        ThresholdWithCriteria(
-                            threshold=26.0,
-                            count_failure=CountFailureCriterion(max_hours=50),
-                            streak_failure=StreakCriterion(
-                                min_streak_length_hours=50, max_count=0
-                            ),
-                            integrated_streak_failure=IntegratedStreakCriterion(
-                                min_streak_length_hours=50, max_integral=0
-                            ),
-                            exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
-                        ),
-                        ThresholdWithCriteria(
-                            threshold=30.0,
-                            count_failure=CountFailureCriterion(max_hours=50),
-                            streak_failure=StreakCriterion(
-                                min_streak_length_hours=50, max_count=0
-                            ),
-                            integrated_streak_failure=IntegratedStreakCriterion(
-                                min_streak_length_hours=50, max_integral=0
-                            ),
-                            exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
-                        ),
-                        ThresholdWithCriteria(
-                            threshold=35.0,
-                            count_failure=CountFailureCriterion(max_hours=50),
-                            streak_failure=StreakCriterion(
-                                min_streak_length_hours=50, max_count=0
-                            ),
-                            integrated_streak_failure=IntegratedStreakCriterion(
-                                min_streak_length_hours=50, max_integral=0
-                            ),
-                            exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
-                        ),
-                    ),
-                    cold_thresholds=(
-                        ThresholdWithCriteria(
-                            threshold=10.0,
-                            count_failure=CountFailureCriterion(max_hours=50),
-                            streak_failure=StreakCriterion(
-                                min_streak_length_hours=50, max_count=0
-                            ),
-                            integrated_streak_failure=IntegratedStreakCriterion(
-                                min_streak_length_hours=50, max_integral=0
-                            ),
-                            exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
-                        ),
-                        ThresholdWithCriteria(
-                            threshold=5.0,
-                            count_failure=CountFailureCriterion(max_hours=50),
-                            streak_failure=StreakCriterion(
-                                min_streak_length_hours=50, max_count=0
-                            ),
-                            integrated_streak_failure=IntegratedStreakCriterion(
-                                min_streak_length_hours=50, max_integral=0
-                            ),
-                            exceedance_failure=ExceedanceCriterion(max_deg_hours=50),
-                        ),
-                    ),
-                    heat_index_criteria=HeatIndexCriteria(
-                        caution_or_worse_hours=4000,
-                    ),
-                    thermal_comfort=ThermalComfortAssumptions(
-                        met=1.1,
-                        clo=0.5,
-                        v=0.1,
-                    ),
-                )
-            )
+            flat_model.simulate(overheating_config=overheating_config())
             elapsed = perf_counter() - start
 
             results.append((num_floors, calculate_overheating, elapsed))
@@ -0,0 +1,83 @@
+"""Compare the runtime of each EnergyPlus executor for shoeboxes of increasing height."""
+
+import csv
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+import pandas as pd
+from benchmark import base_flat_model
+
+from epinterface.data import DefaultEPWZipPath
+from epinterface.executor import default_worker_pool
+from epinterface.settings import energyplus_settings
+
+N_FLOORS = (1, 4, 16)
+EXECUTORS = ("archetypal", "direct", "in_process")
+
+
+def report(
+    n_floors: tuple[int, ...] = N_FLOORS,
+    executors: tuple[str, ...] = EXECUTORS,
+    repeats: int = 3,
+) -> None:
+    """Simulate the benchmark model with each executor and report the median runtimes.
+
+    Each executor runs the model `repeats` times after one untimed warmup
+    run, so that the in-process worker has started and loaded EnergyPlus
+    before it is timed, as it would be in a long batch.
+
+    Args:
+        n_floors (tuple[int, ...]): The numbers of floors to simulate.
+        executors (tuple[str, ...]): The executors to compare.
+        repeats (int): The number of timed runs per executor and model.
+    """
+    base = base_flat_model().model_copy(update={"EPWURI": DefaultEPWZipPath})
+    default_executor = energyplus_settings.executor
+
+    print("Reporting executor runtimes")
+    print("NFloors\texecutor\tmedian_s\tspeedup")
+
+    rows: list[dict[str, float | str]] = []
+    try:
+        for floors in n_floors:
+            flat_model = base.model_copy(update={"NFloors": floors})
+            reference: float | None = None
+            reference_results: pd.Series | None = None
+            for executor in executors:
+                energyplus_settings.executor = executor  # pyright: ignore [reportAttributeAccessIssue]
+                if executor == "in_process":
+                    default_worker_pool()
+                results = flat_model.simulate()
+                elapsed = []
+                for _ in range(repeats):
+                    start = perf_counter()
+                    flat_model.simulate()
+                    elapsed.append(perf_counter() - start)
+                runtime = median(elapsed)
+                if reference is None or reference_results is None:
+                    reference, reference_results = runtime, results.energy_and_peak
+                pd.testing.assert_series_equal(
+                    results.energy_and_peak, reference_results, rtol=1e-6
+                )
+                row: dict[str, float | str] = {
+                    "n_floors": floors,
+                    "executor": executor,
+                    "median_s": runtime,
+                    "speedup": reference / runtime,
+                }
+                rows.append(row)
+                print(f"{floors}\t{executor}\t{runtime:.2f}\t{row['speedup']:.2f}")
+    finally:
+        energyplus_settings.executor = default_executor
+
+    csv_path = Path(__file__).with_suffix(".csv")
+    with csv_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote executor report to {csv_path}")
+
+
+if __name__ == "__main__":
+    report()
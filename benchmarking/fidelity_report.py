@@ -0,0 +1,108 @@
+"""Report the accuracy and runtime of each fidelity profile against the detailed profile."""
+
+import csv
+from pathlib import Path
+from time import perf_counter
+
+import pandas as pd
+from benchmark import base_flat_model
+
+from epinterface.interface import FIDELITY_PROFILES
+from epinterface.sbem.flat_model import FlatModel
+
+REFERENCE_PROFILE = "detailed"
+
+
+def end_uses_and_peaks(results) -> tuple[pd.Series, pd.Series]:
+    """The annual end uses and the annual peak of each raw meter.
+
+    Args:
+        results (ModelRunResults): The results of a run.
+
+    Returns:
+        energy (pd.Series): The annual energy of each end use [kWh/m²].
+        peaks (pd.Series): The annual peak of each raw meter [kW/m²].
+    """
+    energy = results.energy_and_peak["Energy"]["End Uses"].groupby(level="Meter").sum()
+    peaks = results.energy_and_peak["Peak"]["Raw"].groupby(level="Meter").max()
+    return energy, peaks
+
+
+def relative_deviation(value: float, reference: float) -> float:
+    """The deviation of a value from its reference, or zero if both are zero."""
+    if reference == 0:
+        return 0.0 if value == 0 else float("inf")
+    return (value - reference) / reference
+
+
+def report(models: dict[str, FlatModel] | None = None) -> None:
+    """Simulate each model with every fidelity profile and compare against the detailed profile.
+
+    Args:
+        models (dict[str, FlatModel] | None): The models to compare, by name.  Defaults to one and four storey variants of the benchmark model.
+    """
+    if models is None:
+        base = base_flat_model()
+        models = {
+            f"{n_floors}F": base.model_copy(update={"NFloors": n_floors})
+            for n_floors in (1, 4)
+        }
+
+    print("Reporting fidelity profiles against the detailed profile")
+    print(
+        "model\tprofile\truntime\tspeedup\ttotal\theating\tcooling\tpeak_heat\tpeak_cool"
+    )
+
+    rows: list[dict[str, float | str]] = []
+    for name, flat_model in models.items():
+        runs = {}
+        elapsed = {}
+        for profile in FIDELITY_PROFILES:
+            start = perf_counter()
+            runs[profile] = flat_model.model_copy(
+                update={"Fidelity": profile}
+            ).simulate()
+            elapsed[profile] = perf_counter() - start
+
+        ref_energy, ref_peaks = end_uses_and_peaks(runs[REFERENCE_PROFILE])
+        for profile, results in runs.items():
+            energy, peaks = end_uses_and_peaks(results)
+            row: dict[str, float | str] = {
+                "model": name,
+                "profile": profile,
+                "runtime_s": elapsed[profile],
+                "speedup": elapsed[REFERENCE_PROFILE] / elapsed[profile],
+                "total_energy_deviation": relative_deviation(
+                    energy.sum(), ref_energy.sum()
+                ),
+                "heating_deviation": relative_deviation(
+                    energy["Heating"], ref_energy["Heating"]
+                ),
+                "cooling_deviation": relative_deviation(
+                    energy["Cooling"], ref_energy["Cooling"]
+                ),
+                "peak_heating_deviation": relative_deviation(
+                    peaks["Heating"], ref_peaks["Heating"]
+                ),
+                "peak_cooling_deviation": relative_deviation(
+                    peaks["Cooling"], ref_peaks["Cooling"]
+                ),
+            }
+            rows.append(row)
+            print(
+                f"{name}\t{profile}\t{elapsed[profile]:.1f}s\t{row['speedup']:.2f}\t"
+                f"{row['total_energy_deviation']:+.2%}\t{row['heating_deviation']:+.2%}\t"
+                f"{row['cooling_deviation']:+.2%}\t{row['peak_heating_deviation']:+.2%}\t"
+                f"{row['peak_cooling_deviation']:+.2%}"
+            )
+
+    csv_path = Path(__file__).with_suffix(".csv")
+    with csv_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote fidelity report to {csv_path}")
+
+
+if __name__ == "__main__":
+    report()
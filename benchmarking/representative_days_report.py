@@ -0,0 +1,94 @@
+"""Report the accuracy and runtime of representative-day runs against the full year on the bundled Boston weather."""
+
+import csv
+from pathlib import Path
+from time import perf_counter
+
+from benchmark import base_flat_model
+from fidelity_report import end_uses_and_peaks, relative_deviation
+
+from epinterface.analysis.representative_days import RepresentativeDaysConfig
+from epinterface.data import DefaultEPWZipPath
+from epinterface.sbem.flat_model import FlatModel
+
+N_DAYS = (8, 12, 24, 48)
+
+
+def report(
+    models: dict[str, FlatModel] | None = None,
+    n_days: tuple[int, ...] = N_DAYS,
+) -> None:
+    """Simulate each model on representative days and compare against the full year.
+
+    Args:
+        models (dict[str, FlatModel] | None): The models to compare, by name.  Defaults to one and four storey variants of the benchmark model on the bundled Boston weather.
+        n_days (tuple[int, ...]): The numbers of representative days to compare.
+    """
+    if models is None:
+        base = base_flat_model().model_copy(update={"EPWURI": DefaultEPWZipPath})
+        models = {
+            f"{n_floors}F": base.model_copy(update={"NFloors": n_floors})
+            for n_floors in (1, 4)
+        }
+
+    print("Reporting representative days against the full year")
+    print(
+        "model\tdays\truntime\tspeedup\ttotal\theating\tcooling\tpeak_heat\tpeak_cool"
+    )
+
+    rows: list[dict[str, float | str]] = []
+    for name, flat_model in models.items():
+        start = perf_counter()
+        reference = flat_model.simulate()
+        reference_elapsed = perf_counter() - start
+        ref_energy, ref_peaks = end_uses_and_peaks(reference)
+
+        for n in (365, *n_days):
+            if n == 365:
+                results, elapsed = reference, reference_elapsed
+            else:
+                start = perf_counter()
+                results = flat_model.simulate(
+                    representative_days=RepresentativeDaysConfig(n_days=n)
+                )
+                elapsed = perf_counter() - start
+            energy, peaks = end_uses_and_peaks(results)
+            row: dict[str, float | str] = {
+                "model": name,
+                "n_days": n,
+                "runtime_s": elapsed,
+                "speedup": reference_elapsed / elapsed,
+                "total_energy_deviation": relative_deviation(
+                    energy.sum(), ref_energy.sum()
+                ),
+                "heating_deviation": relative_deviation(
+                    energy["Heating"], ref_energy["Heating"]
+                ),
+                "cooling_deviation": relative_deviation(
+                    energy["Cooling"], ref_energy["Cooling"]
+                ),
+                "peak_heating_deviation": relative_deviation(
+                    peaks["Heating"], ref_peaks["Heating"]
+                ),
+                "peak_cooling_deviation": relative_deviation(
+                    peaks["Cooling"], ref_peaks["Cooling"]
+                ),
+            }
+            rows.append(row)
+            print(
+                f"{name}\t{n}\t{elapsed:.1f}s\t{row['speedup']:.2f}\t"
+                f"{row['total_energy_deviation']:+.2%}\t{row['heating_deviation']:+.2%}\t"
+                f"{row['cooling_deviation']:+.2%}\t{row['peak_heating_deviation']:+.2%}\t"
+                f"{row['peak_cooling_deviation']:+.2%}"
+            )
+
+    csv_path = Path(__file__).with_suffix(".csv")
+    with csv_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote representative days report to {csv_path}")
+
+
+if __name__ == "__main__":
+    report()
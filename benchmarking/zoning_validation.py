@@ -0,0 +1,135 @@
+"""Validate auto zoning by measuring the deviation of by_storey from core/perim zoning on a sample of flat models."""
+
+import csv
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from benchmark import base_flat_model, overheating_config
+
+from epinterface.geometry import ShoeboxGeometry
+from epinterface.sbem.flat_model import FlatModel
+
+
+def sample_flat_models(n: int, seed: int = 42) -> list[FlatModel]:
+    """Sample flat models with varied footprints, glazing and heights.
+
+    Args:
+        n (int): The number of models to sample.
+        seed (int): The random seed.
+
+    Returns:
+        models (list[FlatModel]): The sampled models.
+    """
+    rng = np.random.default_rng(seed)
+    base = base_flat_model()
+    return [
+        base.model_copy(
+            update={
+                "Width": round(float(rng.uniform(5, 40)), 1),
+                "Depth": round(float(rng.uniform(5, 40)), 1),
+                "WWR": round(float(rng.uniform(0.05, 0.5)), 2),
+                "NFloors": int(rng.integers(1, 5)),
+                "Rotation": round(float(rng.uniform(0, 90))),
+            }
+        )
+        for _ in range(n)
+    ]
+
+
+def zone_weighted_edh(results) -> pd.Series:
+    """The zone weighted exceedance degree hours for each threshold.
+
+    Args:
+        results (ModelRunResults): The results of a run with an overheating analysis.
+
+    Returns:
+        edh (pd.Series): The exceedance degree hours, indexed by polarity and threshold.
+    """
+    return results.overheating_results.edh.xs(
+        ("Building", "Zone Weighted"), level=["Aggregation Unit", "Group"]
+    )["EDH [degC-hr]"]
+
+
+def validate(n: int = 12, tolerance: float = 0.1) -> None:
+    """Compare by_storey against core/perim zoning and check the auto zoning error bound.
+
+    Args:
+        n (int): The number of models to sample.
+        tolerance (float): The auto zoning tolerance to report decisions for.
+    """
+    print("Validating auto zoning")
+    print(
+        "Width\tDepth\tWWR\tNFloors\testimated\tenergy_dev\tmax_edh_dev\tauto\tspeedup"
+    )
+
+    rows: list[dict[str, float | int | str]] = []
+    for flat_model in sample_flat_models(n):
+        model, _ = flat_model.to_model()
+        geometry: ShoeboxGeometry = model.geometry.model_copy(
+            update={"zoning_tolerance": tolerance}
+        )
+        if not geometry.has_core:
+            # core/perim zoning is impossible, so there is nothing to compare
+            continue
+
+        runs = {}
+        elapsed = {}
+        for zoning in ("core/perim", "by_storey"):
+            start = perf_counter()
+            runs[zoning] = flat_model.model_copy(update={"Zoning": zoning}).simulate(
+                overheating_config=overheating_config()
+            )
+            elapsed[zoning] = perf_counter() - start
+
+        energy = {
+            zoning: r.energy_and_peak["Energy"].sum() for zoning, r in runs.items()
+        }
+        energy_dev = (energy["by_storey"] - energy["core/perim"]) / energy["core/perim"]
+        edh_dev = (
+            (
+                zone_weighted_edh(runs["by_storey"])
+                - zone_weighted_edh(runs["core/perim"])
+            )
+            .abs()
+            .max()
+        )
+
+        row: dict[str, float | int | str] = {
+            "Width": flat_model.Width,
+            "Depth": flat_model.Depth,
+            "WWR": flat_model.WWR,
+            "NFloors": flat_model.NFloors,
+            "estimated_deviation": geometry.estimated_zoning_deviation,
+            "energy_deviation": energy_dev,
+            "max_edh_deviation_degC_hr": edh_dev,
+            "auto_zoning": geometry.resolved_zoning,
+            "speedup": elapsed["core/perim"] / elapsed["by_storey"],
+        }
+        rows.append(row)
+        print(
+            f"{row['Width']}\t{row['Depth']}\t{row['WWR']}\t{row['NFloors']}\t"
+            f"{geometry.estimated_zoning_deviation:.3f}\t{energy_dev:+.3f}\t"
+            f"{edh_dev:.1f}\t{row['auto_zoning']}\t{row['speedup']:.2f}"
+        )
+
+    exceeded = [
+        r
+        for r in rows
+        if abs(float(r["energy_deviation"])) > float(r["estimated_deviation"])
+    ]
+    print(
+        f"Measured energy deviation exceeded the estimate for {len(exceeded)} of {len(rows)} samples."
+    )
+
+    csv_path = Path(__file__).with_suffix(".csv")
+    with csv_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote validation results to {csv_path}")
+
+
+if __name__ == "__main__":
+    validate()
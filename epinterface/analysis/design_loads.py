@@ -0,0 +1,82 @@
+"""Postprocess the zone sizing results of a sizing-only run to design heating and cooling loads (W, W/m²)."""
+
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+
+import pandas as pd
+from archetypal.idfclass.sql import Sql
+
+from epinterface.analysis.outputs import OutputPlan
+
+ZONE_SIZES_COLUMNS = {
+    "ZoneName": "Zone",
+    "LoadType": "Load Type",
+    "CalcDesLoad": "Calculated Load [W]",
+    "UserDesLoad": "Design Load [W]",
+    "UserDesFlow": "Design Air Flow [m3/s]",
+    "DesDayName": "Design Day",
+    "PeakHrMin": "Peak Time",
+    "PeakTemp": "Peak Outdoor Temperature [degC]",
+}
+
+
+@dataclass
+class DesignLoads:
+    """The design heating and cooling loads of a model.
+
+    The zone loads include the zone multipliers, and the design loads
+    include the sizing factors.  The building loads are the sums of the
+    zone peaks, which need not be coincident.
+    """
+
+    zones: pd.DataFrame
+    building: pd.Series
+    err_text: str
+
+
+def required_outputs() -> OutputPlan:
+    """The outputs read by `design_loads_postprocess`.
+
+    The zone sizing results are always written to the sql file, so no
+    meters, variables or reports are needed.
+
+    Returns:
+        plan: An empty output plan.
+    """
+    return OutputPlan()
+
+
+def design_loads_postprocess(
+    sql: Sql, *, normalizing_floor_area: float, err_text: str = ""
+) -> DesignLoads:
+    """Read the zone design loads from the sql file of a run with zone sizing.
+
+    Args:
+        sql: The sql file to postprocess.
+        normalizing_floor_area: Floor area [m²] used to normalize the building loads (e.g. total conditioned area).
+        err_text: The warnings from the EnergyPlus error file.
+
+    Returns:
+        loads: The zone and building design loads.
+    """
+    with closing(sqlite3.connect(sql.file_path)) as conn:
+        raw = pd.read_sql_query(
+            f"SELECT {', '.join(ZONE_SIZES_COLUMNS)} FROM ZoneSizes",  # noqa: S608
+            conn,
+        )
+    zones = (
+        raw.rename(columns=ZONE_SIZES_COLUMNS)
+        .set_index(["Zone", "Load Type"])
+        .sort_index()
+    )
+
+    totals = (
+        zones[["Calculated Load [W]", "Design Load [W]"]]
+        .groupby(level="Load Type")
+        .sum()
+    )
+    totals["Design Load [W/m2]"] = totals["Design Load [W]"] / normalizing_floor_area
+    building = totals.stack().rename("Value")
+    building.index.names = ["Load Type", "Quantity"]
+    return DesignLoads(zones=zones, building=building, err_text=err_text)
@@ -6,6 +6,9 @@ import numpy as np
 import pandas as pd
 from archetypal.idfclass.sql import Sql
 
+from epinterface.analysis.outputs import OutputMeter, OutputPlan
+from epinterface.analysis.representative_days import RepresentativeDays
+
 kWh_per_GJ = 277.778
 GJ_per_J = 1e-9
 
@@ -64,43 +67,74 @@ TABULAR_DATA_COLUMNS_FOR_VERSION = {
 }
 
 
-def standard_results_postprocess(
+def required_outputs(
+    ep_version_major: int, tabular_cross_check: bool = False
+) -> OutputPlan:
+    """The outputs read by `standard_results_postprocess`.
+
+    Args:
+        ep_version_major: EnergyPlus version major number.
+        tabular_cross_check: Whether the meters will be cross-checked against the tabular end uses.
+
+    Returns:
+        plan: The meters, and summary reports if cross-checking, the postprocessing reads.
+    """
+    desired_meters = DESIRED_METERS_FOR_VERSION[ep_version_major]
+    return OutputPlan(
+        meters=tuple(
+            OutputMeter(name=meter, frequency="Hourly") for meter in desired_meters
+        ),
+        summary_reports=(ANNUAL_SUMMARY_REPORT,) if tabular_cross_check else (),
+    )
+
+
+def monthly_totals_and_peaks(
+    hourly: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Aggregate hourly data to monthly totals and monthly peaks in a single grouped pass.
+
+    Months without any hourly data (e.g. in a partial-year run) are filled with zeros.
+
+    Args:
+        hourly: The hourly data, with a datetime index.
+
+    Returns:
+        totals: The sum of each column by calendar month, indexed by month number.
+        peaks: The maximum of each column by calendar month, indexed by month number.
+    """
+    months = pd.RangeIndex(1, 13, 1, name="Month")
+    aggregated = hourly.groupby(cast(pd.DatetimeIndex, hourly.index).month).agg([
+        "sum",
+        "max",
+    ])
+    aggregated = aggregated.reindex(months, fill_value=0)
+    totals = cast(pd.DataFrame, aggregated.xs("sum", level=-1, axis=1))
+    peaks = cast(pd.DataFrame, aggregated.xs("max", level=-1, axis=1))
+    totals.columns.name = hourly.columns.name
+    peaks.columns.name = hourly.columns.name
+    return totals, peaks
+
+
+def check_meters_against_tabular_end_uses(
     sql: Sql,
+    raw_monthly: pd.DataFrame,
     *,
     normalizing_floor_area: float,
-    heat_cop: float,
-    cool_cop: float,
-    dhw_cop: float,
-    heat_fuel: str | None,
-    cool_fuel: str | None,
-    dhw_fuel: str,
-    all_fuel_names: list[str],
     ep_version_major: int,
-) -> pd.Series:
-    """Postprocess the sql file to get the standard results.
+) -> None:
+    """Cross-check the monthly meters against the annual end uses in the tabular reports.
 
-    This will return a series with two levels:
-    - Aggregation: "Raw", "End Uses", "Utilities"
-    - Meter: ["Electricity", "Cooling", "Heating", "Domestic Hot Water"], ["Electricity", "Propane", ...]
+    This needs the `AnnualBuildingUtilityPerformanceSummary` report in the sql file.
 
     Args:
-        sql: The sql file to postprocess.
-        normalizing_floor_area: Floor area [m²] used to normalize energy and power (e.g. total conditioned area).
-        heat_cop: Effective COP of the heating system (site energy to delivered).
-        cool_cop: Effective COP of the cooling system.
-        dhw_cop: Effective COP of the DHW system.
-        heat_fuel: Fuel type name for heating (e.g. "DistrictHeating"), or None if no heating.
-        cool_fuel: Fuel type name for cooling, or None if no cooling.
-        dhw_fuel: Fuel type name for domestic hot water.
-        all_fuel_names: Sorted list of all fuel type names (union of HVAC and DHW fuel types) for utilities columns.
+        sql: The sql file to read the tabular end uses from.
+        raw_monthly: The monthly meter totals [kWh/m²], with a column per meter.
+        normalizing_floor_area: Floor area [m²] the meters were normalized by.
         ep_version_major: EnergyPlus version major number.
 
-    Returns:
-        series: The postprocessed results (Energy and Peak, with Aggregation and Meter index levels).
+    Raises:
+        ValueError: If there are end uses or fuels which the meters do not cover, or the totals disagree.
     """
-    desired_meters = DESIRED_METERS_FOR_VERSION[ep_version_major]
-    raw_hourly = sql.timeseries_by_name(desired_meters, "Hourly")
-    raw_monthly = sql.timeseries_by_name(desired_meters, "Monthly")
     raw_df = sql.tabular_data_by_name(ANNUAL_SUMMARY_REPORT, END_USES_TABLE)
 
     raw_df_relevant = (
@@ -128,33 +162,121 @@ def standard_results_postprocess(
     raw_series = raw_df_relevant.loc["Total End Uses"] - raw_series_hot_water
     raw_series["Domestic Hot Water"] = raw_series_hot_water.sum()
 
-    raw_monthly = (
-        (
-            raw_monthly.droplevel(["IndexGroup", "KeyValue"], axis=1)
-            * GJ_per_J
-            * kWh_per_GJ
-            / normalizing_floor_area
-        )
-        .rename(columns=DESIRED_METERS_COLUMN_NAMES_FOR_VERSION[ep_version_major])
-        .set_index(pd.RangeIndex(1, 13, 1, name="Month"))
-    )
-    raw_monthly.columns.name = "Meter"
-
     if not np.allclose(raw_series.sum(), raw_monthly.sum().sum(), atol=0.5):
         msg = "Raw series and raw monthly do not match: "
         msg += f"Raw series: {raw_series.sum()}"
         msg += f"Raw monthly: {raw_monthly.sum().sum()}"
         raise ValueError(msg)
 
+
+def check_tabular_cross_check_is_supported(
+    tabular_cross_check: bool,
+    representative_days: RepresentativeDays | None,
+    meters: dict[str, str] | None,
+) -> None:
+    """Check that the tabular end uses cover the same run and meters as the postprocessing.
+
+    Args:
+        tabular_cross_check: Whether the tabular cross-check is requested.  Nothing is checked otherwise.
+        representative_days: The representative days which were simulated instead of the whole year, if any.
+        meters: The meters the postprocessing reads, if not the facility meters.
+
+    Raises:
+        ValueError: If only representative days were simulated, since the tabular reports then only cover the simulated days, or if other meters than the facility meters are read, since the tabular reports do not break them down.
+    """
+    if not tabular_cross_check:
+        return
+    if representative_days is not None:
+        msg = (
+            "The tabular cross-check is not supported for runs of representative days."
+        )
+        raise ValueError(msg)
+    if meters is not None:
+        msg = "The tabular cross-check is only supported for the facility meters."
+        raise ValueError(msg)
+
+
+def standard_results_postprocess(
+    sql: Sql,
+    *,
+    normalizing_floor_area: float,
+    heat_cop: float,
+    cool_cop: float,
+    dhw_cop: float,
+    heat_fuel: str | None,
+    cool_fuel: str | None,
+    dhw_fuel: str,
+    all_fuel_names: list[str],
+    ep_version_major: int,
+    tabular_cross_check: bool = False,
+    representative_days: RepresentativeDays | None = None,
+    meters: dict[str, str] | None = None,
+) -> pd.Series:
+    """Postprocess the sql file to get the standard results.
+
+    This will return a series with two levels:
+    - Aggregation: "Raw", "End Uses", "Utilities"
+    - Meter: ["Electricity", "Cooling", "Heating", "Domestic Hot Water"], ["Electricity", "Propane", ...]
+
+    The results are computed from the hourly meters alone, so the tabular
+    reports are only needed when cross-checking against them.
+
+    When only representative days were simulated, the hourly meters are
+    first expanded to a full year, so that every total is weighted by the
+    number of days each representative day stands in for.
+
+    The meters default to the facility meters of the EnergyPlus version, but
+    can be replaced, e.g. by the custom meters of one building when several
+    buildings were simulated together.
+
+    Args:
+        sql: The sql file to postprocess.
+        normalizing_floor_area: Floor area [m²] used to normalize energy and power (e.g. total conditioned area).
+        heat_cop: Effective COP of the heating system (site energy to delivered).
+        cool_cop: Effective COP of the cooling system.
+        dhw_cop: Effective COP of the DHW system.
+        heat_fuel: Fuel type name for heating (e.g. "DistrictHeating"), or None if no heating.
+        cool_fuel: Fuel type name for cooling, or None if no cooling.
+        dhw_fuel: Fuel type name for domestic hot water.
+        all_fuel_names: Sorted list of all fuel type names (union of HVAC and DHW fuel types) for utilities columns.
+        ep_version_major: EnergyPlus version major number.
+        tabular_cross_check: Whether to cross-check the meters against the tabular end uses, which must then be in the sql file.
+        representative_days: The representative days which were simulated instead of the whole year, if any.
+        meters: The names of the meters to read, mapped to the standard column names ("Lighting", "Heating", ...).  Defaults to the facility meters of the EnergyPlus version.
+
+    Returns:
+        series: The postprocessed results (Energy and Peak, with Aggregation and Meter index levels).
+
+    Raises:
+        ValueError: If the tabular cross-check is requested for a run of representative days, whose tabular reports only cover the simulated days, or for other meters than the facility meters, which the tabular reports do not break down.
+    """
+    check_tabular_cross_check_is_supported(
+        tabular_cross_check, representative_days, meters
+    )
+    if meters is None:
+        meters = DESIRED_METERS_COLUMN_NAMES_FOR_VERSION[ep_version_major]
+    raw_hourly = sql.timeseries_by_name(tuple(meters), "Hourly")
+
     raw_hourly = (
         (raw_hourly.droplevel(["IndexGroup", "KeyValue"], axis=1))
         * GJ_per_J
         * kWh_per_GJ
         / normalizing_floor_area
-    ).rename(columns=DESIRED_METERS_COLUMN_NAMES_FOR_VERSION[ep_version_major])
+    ).rename(columns=meters)
+    if representative_days is not None:
+        raw_hourly = representative_days.expand(raw_hourly)
     raw_hourly.columns.name = "Meter"
     raw_hourly_max: pd.Series = raw_hourly.max(axis=0)
-    raw_monthly_hourly_max = raw_hourly.resample("MS").max()
+    # hourly energy in kWh/m2 is also the average power over the hour in kW/m2
+    raw_monthly, raw_monthly_hourly_max = monthly_totals_and_peaks(raw_hourly)
+
+    if tabular_cross_check:
+        check_meters_against_tabular_end_uses(
+            sql,
+            raw_monthly,
+            normalizing_floor_area=normalizing_floor_area,
+            ep_version_major=ep_version_major,
+        )
 
     heat_use = (
         raw_monthly["Heating"] / heat_cop
@@ -252,7 +374,7 @@ def standard_results_postprocess(
         raise ValueError(msg)
 
     utility_max = utilities_df_hourly.max()
-    utility_monthly_hourly_max = utilities_df_hourly.resample("MS").max()
+    _, utility_monthly_hourly_max = monthly_totals_and_peaks(utilities_df_hourly)
     utility_max.index.name = "Meter"
     max_data = pd.concat(
         [utility_max, raw_hourly_max],
@@ -262,13 +384,11 @@ def standard_results_postprocess(
     ).fillna(0)
     max_data = cast(pd.Series, max_data).rename("kW/m2")
 
-    utility_monthly_hourly_max.index = pd.RangeIndex(1, 13, 1, name="Month")
-    raw_monthly_hourly_max.index = pd.RangeIndex(1, 13, 1, name="Month")
     max_data_monthly = pd.concat(
         [utility_monthly_hourly_max, raw_monthly_hourly_max],
         axis=1,
         keys=["Utilities", "Raw"],
-        names=["Aggregation"],
+        names=["Aggregation", "Meter"],
     ).fillna(0)
 
     peaks_series = cast(pd.Series, max_data_monthly.unstack()).fillna(0).rename("kW/m2")
@@ -0,0 +1,132 @@
+"""Plan the EnergyPlus output requests which the postprocessing analyses read."""
+
+from typing import Literal
+
+from archetypal.idfclass import IDF
+from pydantic import BaseModel, Field
+
+ReportingFrequency = Literal["Timestep", "Hourly", "Daily", "Monthly", "RunPeriod"]
+
+PLANNED_OUTPUT_KEYS = (
+    "OUTPUT:METER",
+    "OUTPUT:VARIABLE",
+    "OUTPUT:TABLE:SUMMARYREPORTS",
+    "OUTPUT:SQLITE",
+    "OUTPUTCONTROL:TABLE:STYLE",
+    "OUTPUTCONTROL:FILES",
+)
+
+# the error file is always written, so the SQL file is the only one to keep
+KEPT_OUTPUT_FILE_FIELDS = ("Output_SQLite",)
+
+
+class OutputMeter(BaseModel, frozen=True):
+    """An `Output:Meter` request."""
+
+    name: str = Field(..., description="The name of the meter.")
+    frequency: ReportingFrequency = Field(
+        ..., description="The reporting frequency of the meter."
+    )
+
+
+class OutputVariable(BaseModel, frozen=True):
+    """An `Output:Variable` request."""
+
+    name: str = Field(..., description="The name of the variable.")
+    frequency: ReportingFrequency = Field(
+        ..., description="The reporting frequency of the variable."
+    )
+    key: str = Field(default="*", description="The key value, e.g. a zone name.")
+
+
+class OutputPlan(BaseModel, frozen=True):
+    """The minimal set of outputs which a combination of analyses needs EnergyPlus to write.
+
+    Each analysis declares the outputs it reads, and plans are combined with
+    `|`, so that a model only ever writes what will actually be postprocessed.
+    """
+
+    meters: tuple[OutputMeter, ...] = Field(
+        default=(), description="The meters to write."
+    )
+    variables: tuple[OutputVariable, ...] = Field(
+        default=(), description="The variables to write."
+    )
+    summary_reports: tuple[str, ...] = Field(
+        default=(),
+        description="The tabular summary reports to write to the SQL file.",
+    )
+    keep_all_files: bool = Field(
+        default=False,
+        description="Whether to write every output file EnergyPlus supports, rather than only the SQL and error files.",
+    )
+
+    def __or__(self, other: "OutputPlan") -> "OutputPlan":
+        """Combine two plans, keeping the first occurrence of each request."""
+        return OutputPlan(
+            meters=tuple(dict.fromkeys([*self.meters, *other.meters])),
+            variables=tuple(dict.fromkeys([*self.variables, *other.variables])),
+            summary_reports=tuple(
+                dict.fromkeys([*self.summary_reports, *other.summary_reports])
+            ),
+            keep_all_files=self.keep_all_files or other.keep_all_files,
+        )
+
+    def apply(self, idf: IDF) -> IDF:
+        """Replace the output requests of an IDF model with the planned outputs.
+
+        Any existing meters, variables, summary reports and SQL output settings
+        are removed first, so the model writes exactly what the plan asks for.
+        Unless all files are kept, an `OutputControl:Files` object also turns
+        off every output file except the SQL file; tabular reports still reach
+        the SQL file.
+
+        Args:
+            idf (IDF): The IDF model to add the outputs to.
+
+        Returns:
+            idf (IDF): The IDF model with the planned outputs.
+        """
+        for key in PLANNED_OUTPUT_KEYS:
+            for obj in list(idf.idfobjects[key]):
+                idf.removeidfobject(obj)
+
+        for meter in self.meters:
+            idf.newidfobject(
+                "OUTPUT:METER",
+                Key_Name=meter.name,
+                Reporting_Frequency=meter.frequency,
+            )
+        for variable in self.variables:
+            idf.newidfobject(
+                "OUTPUT:VARIABLE",
+                Key_Value=variable.key,
+                Variable_Name=variable.name,
+                Reporting_Frequency=variable.frequency,
+            )
+        if self.summary_reports:
+            idf.newidfobject(
+                "OUTPUT:TABLE:SUMMARYREPORTS",
+                **{
+                    f"Report_{i}_Name": report
+                    for i, report in enumerate(self.summary_reports, start=1)
+                },
+            )
+            # tabular results are read from the SQL file in GJ, so no unit conversion
+            idf.newidfobject(
+                "OUTPUTCONTROL:TABLE:STYLE",
+                Column_Separator="CommaAndHTML",
+                Unit_Conversion="None",
+            )
+            idf.newidfobject(
+                "OUTPUT:SQLITE",
+                Option_Type="SimpleAndTabular",
+                Unit_Conversion_for_Tabular_Data="UseOutputControlTableStyle",
+            )
+        else:
+            idf.newidfobject("OUTPUT:SQLITE", Option_Type="Simple")
+        if not self.keep_all_files:
+            files = idf.newidfobject("OUTPUTCONTROL:FILES")
+            for field in files.fieldnames[1:]:
+                files[field] = "Yes" if field in KEPT_OUTPUT_FILE_FIELDS else "No"
+        return idf
@@ -9,6 +9,8 @@ from archetypal.idfclass.sql import Sql
 from numpy.typing import NDArray
 from pydantic import BaseModel, Field
 
+from epinterface.analysis.outputs import OutputPlan, OutputVariable
+
 # ---------------------------------------------------------------------------
 # Configuration models
 # ---------------------------------------------------------------------------
@@ -1103,6 +1105,27 @@ def compute_zone_at_risk(
     return out
 
 
+OVERHEATING_HOURLY_VARIABLES = (
+    "Zone Mean Air Temperature",
+    "Zone Air Relative Humidity",
+    "Zone Mean Radiant Temperature",
+)
+
+
+def required_outputs() -> OutputPlan:
+    """The outputs read by `overheating_results_postprocess`.
+
+    Returns:
+        plan: The hourly zone variables the postprocessing reads.
+    """
+    return OutputPlan(
+        variables=tuple(
+            OutputVariable(name=variable, frequency="Hourly")
+            for variable in OVERHEATING_HOURLY_VARIABLES
+        )
+    )
+
+
 def overheating_results_postprocess(
     sql: Sql,
     zone_weights: NDArray[np.float64],
@@ -1122,14 +1145,7 @@ def overheating_results_postprocess(
     """
     _config = config if config is not None else OverheatingAnalysisConfig()
     # TODO: compare the single request flamegraph to splitting it out as multiple requests
-    hourly = sql.timeseries_by_name(
-        [
-            "Zone Mean Air Temperature",
-            "Zone Air Relative Humidity",
-            "Zone Mean Radiant Temperature",
-        ],
-        "Hourly",
-    )
+    hourly = sql.timeseries_by_name(list(OVERHEATING_HOURLY_VARIABLES), "Hourly")
     hourly.index.names = ["Timestep"]
     hourly.columns.names = ["_", "Zone", "Meter"]
 
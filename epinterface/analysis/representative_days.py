@@ -0,0 +1,292 @@
+"""Select representative days from a weather file and reconstruct annual hourly results from them."""
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Literal, cast
+
+import numpy as np
+import pandas as pd
+from archetypal.idfclass import IDF
+from ladybug.epw import EPW
+from numpy.typing import NDArray
+from pydantic import BaseModel, Field, model_validator
+
+from epinterface.interface import RunPeriod
+
+DAYS_PER_YEAR = 365
+HOURS_PER_DAY = 24
+Weekday = Literal[
+    "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"
+]
+# the annual run period starts on a Sunday, so day i of the year falls on WEEKDAYS[i % 7]
+WEEKDAYS: tuple[Weekday, ...] = (
+    "Sunday",
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+)
+# the (non-leap) year which archetypal assigns to the timeseries it reads from the sql file
+SQL_TIMESERIES_YEAR = 2018
+
+
+class RepresentativeDays(BaseModel, frozen=True):
+    """A set of representative days, and the representative day of every day of the year."""
+
+    days: tuple[int, ...] = Field(
+        ..., description="The day of the year (1-365) of each representative day."
+    )
+    assignment: tuple[int, ...] = Field(
+        ...,
+        description="For each day of the year, the position in `days` of the day which represents it.",
+    )
+
+    @model_validator(mode="after")
+    def check_assignment(self):
+        """Check that every day of the year is represented by one of the days.
+
+        Raises:
+            ValueError
+        """
+        if len(self.assignment) != DAYS_PER_YEAR:
+            msg = f"Expected an assignment for each of the {DAYS_PER_YEAR} days, got {len(self.assignment)}."
+            raise ValueError(msg)
+        if not all(0 <= a < len(self.days) for a in self.assignment):
+            msg = "Every day must be assigned to one of the representative days."
+            raise ValueError(msg)
+        return self
+
+    @property
+    def weights(self) -> NDArray[np.int64]:
+        """The number of days of the year which each representative day stands in for."""
+        return np.bincount(self.assignment, minlength=len(self.days))
+
+    def apply(self, idf: IDF) -> IDF:
+        """Replace the run periods of an IDF model with one run period per representative day.
+
+        Each run period starts on the same day of the week as the day has in
+        the annual run period, so that weekday and weekend schedules match.
+
+        Args:
+            idf (IDF): The IDF model to configure.
+
+        Returns:
+            idf (IDF): The IDF model which only simulates the representative days.
+        """
+        for obj in list(idf.idfobjects[RunPeriod.key]):
+            idf.removeidfobject(obj)
+        for day in self.days:
+            day_date = date(SQL_TIMESERIES_YEAR, 1, 1) + timedelta(days=day - 1)
+            RunPeriod(
+                Name=f"Representative Day {day}",
+                Use_Weather_File_Daylight_Saving_Period="No",
+                Use_Weather_File_Rain_Indicators="No",
+                Use_Weather_File_Snow_Indicators="No",
+                Use_Weather_File_Holidays_and_Special_Days="No",
+                Begin_Month=day_date.month,
+                Begin_Day_of_Month=day_date.day,
+                End_Month=day_date.month,
+                End_Day_of_Month=day_date.day,
+                Day_of_Week_for_Start_Day=WEEKDAYS[(day - 1) % 7],
+            ).add(idf)
+        return idf
+
+    def expand(self, hourly: pd.DataFrame) -> pd.DataFrame:
+        """Reconstruct a year of hourly data from the hourly data of the representative days.
+
+        Every day of the year takes the hourly values of its representative
+        day, so that annual and monthly totals are weighted by the number of
+        days each representative day stands in for.
+
+        Args:
+            hourly (pd.DataFrame): The hourly data of the representative days, with a datetime index.
+
+        Returns:
+            annual (pd.DataFrame): The reconstructed hourly data for the whole year.
+
+        Raises:
+            ValueError: If a representative day does not have a full day of hourly data.
+        """
+        day_of_year = cast(pd.DatetimeIndex, hourly.index).dayofyear
+        values = hourly.to_numpy()
+        blocks = []
+        for day in self.days:
+            block = values[day_of_year == day]
+            if len(block) != HOURS_PER_DAY:
+                msg = f"Expected {HOURS_PER_DAY} hourly values for representative day {day}, got {len(block)}."
+                raise ValueError(msg)
+            blocks.append(block)
+        index = pd.date_range(
+            f"{SQL_TIMESERIES_YEAR}-01-01",
+            periods=DAYS_PER_YEAR * HOURS_PER_DAY,
+            freq="h",
+        )
+        return pd.DataFrame(
+            np.concatenate([blocks[a] for a in self.assignment]),
+            index=index,
+            columns=hourly.columns,
+        )
+
+
+class RepresentativeDaysConfig(BaseModel, frozen=True):
+    """How to cluster the days of a weather file into representative days.
+
+    Days are clustered with k-medoids on their standardized hourly drybulb
+    temperature, global horizontal radiation and relative humidity, with
+    weekdays and weekends clustered separately so that every representative
+    day shares its schedules with the days it stands in for.
+    """
+
+    n_days: int = Field(
+        default=12,
+        ge=4,
+        le=DAYS_PER_YEAR,
+        description="The total number of representative days to simulate.",
+    )
+    include_extreme_days: bool = Field(
+        default=True,
+        description="Whether to simulate the hottest and coldest days as their own representative days, to better capture the peaks.",
+    )
+    seed: int = Field(default=42, description="The seed for the clustering.")
+    n_init: int = Field(
+        default=10, ge=1, description="The number of clustering restarts."
+    )
+
+    def select(self, epw_path: Path) -> RepresentativeDays:
+        """Select the representative days of a weather file.
+
+        Args:
+            epw_path (Path): The weather file.
+
+        Returns:
+            representative_days (RepresentativeDays): The representative days and the day each day is represented by.
+        """
+        epw = EPW(epw_path.as_posix())
+        variables = [
+            np.asarray(collection.values[: DAYS_PER_YEAR * HOURS_PER_DAY], dtype=float)
+            for collection in (
+                epw.dry_bulb_temperature,
+                epw.global_horizontal_radiation,
+                epw.relative_humidity,
+            )
+        ]
+        features = np.concatenate(
+            [
+                ((v - v.mean()) / (v.std() or 1)).reshape(DAYS_PER_YEAR, HOURS_PER_DAY)
+                for v in variables
+            ],
+            axis=1,
+        )
+        drybulb = variables[0].reshape(DAYS_PER_YEAR, HOURS_PER_DAY)
+        return self.cluster(
+            features,
+            hottest=int(drybulb.max(axis=1).argmax()),
+            coldest=int(drybulb.min(axis=1).argmin()),
+        )
+
+    def cluster(
+        self, features: NDArray[np.float64], hottest: int, coldest: int
+    ) -> RepresentativeDays:
+        """Cluster the days of the year by their features.
+
+        Args:
+            features (NDArray[np.float64]): The features of each day of the year, with shape (365, n_features).
+            hottest (int): The (zero-based) index of the hottest day.
+            coldest (int): The (zero-based) index of the coldest day.
+
+        Returns:
+            representative_days (RepresentativeDays): The representative days and the day each day is represented by.
+        """
+        rng = np.random.default_rng(self.seed)
+        indices = np.arange(DAYS_PER_YEAR)
+        extremes = sorted({hottest, coldest}) if self.include_extreme_days else []
+        pool = indices[~np.isin(indices, extremes)]
+        is_weekend = np.isin(pool % 7, (0, 6))
+        weekends, weekdays = pool[is_weekend], pool[~is_weekend]
+
+        n_clustered = self.n_days - len(extremes)
+        n_weekend = min(
+            max(1, round(n_clustered * len(weekends) / len(pool))), n_clustered - 1
+        )
+        medoids = [
+            *extremes,
+            *_k_medoids(features, weekdays, n_clustered - n_weekend, rng, self.n_init),
+            *_k_medoids(features, weekends, n_weekend, rng, self.n_init),
+        ]
+
+        # extreme days only represent themselves, while every other day is
+        # represented by the nearest medoid of its own day type
+        assignment = np.zeros(DAYS_PER_YEAR, dtype=int)
+        medoid_array = np.array(medoids)
+        medoid_is_weekend = np.isin(medoid_array % 7, (0, 6))
+        candidates = np.flatnonzero(~np.isin(medoid_array, extremes))
+        for day in indices:
+            if day in extremes:
+                assignment[day] = medoids.index(day)
+                continue
+            same_type = candidates[medoid_is_weekend[candidates] == (day % 7 in (0, 6))]
+            distances = np.linalg.norm(
+                features[medoid_array[same_type]] - features[day], axis=1
+            )
+            assignment[day] = same_type[distances.argmin()]
+
+        return RepresentativeDays(
+            days=tuple(int(m) + 1 for m in medoids),
+            assignment=tuple(int(a) for a in assignment),
+        )
+
+
+def _k_medoids(
+    features: NDArray[np.float64],
+    candidates: NDArray[np.int64],
+    k: int,
+    rng: np.random.Generator,
+    n_init: int,
+    max_iter: int = 100,
+) -> list[int]:
+    """Choose k medoids among the candidate days with the alternating k-medoids algorithm.
+
+    Args:
+        features (NDArray[np.float64]): The features of each day of the year.
+        candidates (NDArray[np.int64]): The indices of the days to cluster.
+        k (int): The number of medoids.
+        rng (np.random.Generator): The random generator for the k-medoids++ initialization.
+        n_init (int): The number of restarts, of which the lowest cost clustering is kept.
+        max_iter (int): The maximum number of iterations per restart.
+
+    Returns:
+        medoids (list[int]): The indices of the medoid days.
+    """
+    points = features[candidates]
+    distances = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=-1)
+    n = len(candidates)
+    k = min(k, n)
+
+    best_medoids: NDArray[np.int64] = np.arange(k)
+    best_cost = np.inf
+    for _ in range(n_init):
+        medoids = [int(rng.integers(n))]
+        for _ in range(1, k):
+            nearest = distances[:, medoids].min(axis=1) ** 2
+            total = nearest.sum()
+            p = nearest / total if total > 0 else None
+            medoids.append(int(rng.choice(n, p=p)))
+        current = np.array(medoids)
+        for _ in range(max_iter):
+            labels = distances[:, current].argmin(axis=1)
+            updated = current.copy()
+            for j in range(k):
+                members = np.flatnonzero(labels == j)
+                if len(members) == 0:
+                    continue
+                within = distances[np.ix_(members, members)].sum(axis=1)
+                updated[j] = members[within.argmin()]
+            if np.array_equal(np.sort(updated), np.sort(current)):
+                break
+            current = updated
+        cost = distances[:, current].min(axis=1).sum()
+        if cost < best_cost:
+            best_cost, best_medoids = cost, current
+    return [int(candidates[m]) for m in best_medoids]
@@ -0,0 +1,186 @@
+"""Size-bounded on-disk caches and the hashing helpers used to key them."""
+
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, ClassVar
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+_file_hash_memo: dict[tuple[str, int, int], str] = {}
+
+
+def canonical_hash(obj: Any) -> str:
+    """Hash a JSON-serializable object independently of key order.
+
+    Args:
+        obj (Any): The object to hash, e.g. the output of `model_dump(mode="json")`.
+
+    Returns:
+        digest (str): The hex sha256 digest of the canonical JSON representation.
+    """
+    payload = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def epinterface_version() -> str:
+    """The installed version of epinterface, used to invalidate caches across releases."""
+    try:
+        return importlib.metadata.version("epinterface")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def file_hash(path: Path) -> str:
+    """Hash the contents of a file, memoized on its path, size and modification time.
+
+    Args:
+        path (Path): The file to hash.
+
+    Returns:
+        digest (str): The hex sha256 digest of the file contents.
+    """
+    stat = path.stat()
+    memo_key = (path.resolve().as_posix(), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _file_hash_memo:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _file_hash_memo[memo_key] = h.hexdigest()
+    return _file_hash_memo[memo_key]
+
+
+class LRUDirectoryCache(BaseModel):
+    """A directory of cache entries, evicted least-recently-used first once it grows too large.
+
+    Each entry is a single file named after its key.  Reads refresh the
+    entry's modification time, which is what eviction orders by, and writes
+    are atomic so that several processes can share one cache directory.
+
+    Writes keep a running estimate of the cache size, and only scan the
+    directory once the estimate exceeds the bound.  Eviction then shrinks
+    the cache to `evict_fraction` of the bound, so that filling a large
+    cache does not rescan every entry on every write.  Entries written by
+    other processes sharing the directory are only counted at the next scan.
+    """
+
+    cache_dir: Path
+    max_size_bytes: int = Field(
+        default=2 * 1024**3,
+        gt=0,
+        description="The total size above which the least recently used entries are evicted.",
+    )
+    evict_fraction: float = Field(
+        default=0.8,
+        gt=0,
+        le=1,
+        description="The fraction of the maximum size eviction shrinks the cache to.",
+    )
+
+    suffix: ClassVar[str] = ".bin"
+
+    _size_estimate: int | None = PrivateAttr(default=None)
+
+    def path_for(self, key: str) -> Path:
+        """The path of the entry for a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            path (Path): The path of the entry.
+        """
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def read_bytes(self, key: str) -> bytes | None:
+        """Read an entry, marking it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            data (bytes | None): The entry contents, or None on a miss.
+        """
+        path = self.path_for(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def write_bytes(self, key: str, data: bytes) -> None:
+        """Atomically write an entry and evict old entries if the cache is too large.
+
+        Args:
+            key (str): The cache key.
+            data (bytes): The entry contents.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        if self._size_estimate is not None:
+            self._size_estimate += len(data) - replaced
+        if self._size_estimate is None or self._size_estimate > self.max_size_bytes:
+            self.evict()
+
+    def entries(self) -> list[Path]:
+        """The entry files currently in the cache."""
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob(f"*{self.suffix}"))
+
+    @property
+    def size_bytes(self) -> int:
+        """The total size of the entries in the cache."""
+        total = 0
+        for path in self.entries():
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+
+    def evict(self) -> None:
+        """Scan the cache and, if it exceeds its size bound, remove least recently used entries until it is back under `evict_fraction` of the bound."""
+        stats: list[tuple[float, int, Path]] = []
+        for path in self.entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            stats.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in stats)
+        if total > self.max_size_bytes:
+            target = self.max_size_bytes * self.evict_fraction
+            for _, size, path in sorted(stats, key=lambda s: s[0]):
+                if total <= target:
+                    break
+                logger.debug(f"Evicting cache entry {path}")
+                path.unlink(missing_ok=True)
+                total -= size
+        self._size_estimate = total
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for path in self.entries():
+            path.unlink(missing_ok=True)
+        self._size_estimate = 0
@@ -394,10 +394,10 @@ class Model(BaseWeather, validate_assignment=True):
             )
         ]
 
-        conditioned_storey_count = self.geometry.num_stories + (
+        conditioned_storey_count = self.geometry.modeled_stories + (
             1 if self.conditioned_basement else 0
         )
-        zones_per_storey = 1 if self.geometry.zoning == "by_storey" else 5
+        zones_per_storey = self.geometry.zones_per_storey
         expected_zone_count = conditioned_storey_count * zones_per_storey
         if len(conditioned_zone_names) != expected_zone_count:
             msg = f"Expected {expected_zone_count} zones, but found {len(conditioned_zone_names)}."
@@ -0,0 +1,790 @@
+"""Launching EnergyPlus directly, without going through `IDF.simulate`."""
+
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+from uuid import uuid4
+
+import psutil
+from archetypal import EnergyPlusVersion
+from archetypal.eplus_interface.exceptions import (
+    EnergyPlusProcessError,
+    EnergyPlusVersionError,
+)
+from archetypal.idfclass import IDF
+from pydantic import BaseModel, Field
+
+from epinterface.interface import FidelityProfile
+from epinterface.settings import energyplus_settings
+
+logger = logging.getLogger(__name__)
+
+
+def energyplus_executable(version: EnergyPlusVersion) -> Path:
+    """Get the path to the EnergyPlus executable for a given version.
+
+    Args:
+        version (EnergyPlusVersion): The EnergyPlus version.
+
+    Returns:
+        exe (Path): The path to the EnergyPlus executable.
+
+    Raises:
+        EnergyPlusVersionError: If no executable is found for the version.
+    """
+    exe = shutil.which("energyplus", path=str(version.current_install_dir))
+    if exe is None:
+        msg = f"No EnergyPlus executable found for version {version.dash}."
+        raise EnergyPlusVersionError(msg)
+    return Path(exe)
+
+
+def has_hvac_templates(idf: IDF) -> bool:
+    """Whether an IDF model has HVACTemplate objects, which ExpandObjects must expand.
+
+    Args:
+        idf (IDF): The IDF model.
+
+    Returns:
+        has_templates (bool): True if the model has any HVACTemplate objects.
+    """
+    return any(
+        len(objs) > 0
+        for key, objs in idf.idfobjects.items()
+        if key.upper().startswith("HVACTEMPLATE:")
+    )
+
+
+def threads_env(threads: int | None) -> dict[str, str]:
+    """The environment for an EnergyPlus process limited to a number of OpenMP threads.
+
+    Args:
+        threads (int | None): The number of threads.  Leaves the environment unchanged if None.
+
+    Returns:
+        env (dict[str, str]): The environment of the process.
+    """
+    env = dict(os.environ)
+    if threads is not None:
+        env["OMP_NUM_THREADS"] = str(threads)
+    return env
+
+
+class PeakMemoryMonitor:
+    """Track the peak resident memory of a process and its children from a background thread.
+
+    Use as a context manager around waiting for the process; the peak is
+    available from `peak` once the context exits.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        """Initialize the monitor.
+
+        Args:
+            pid (int): The process to monitor.
+            interval (float): The time between samples [s].
+        """
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        """Sample the memory of the process tree until stopped or the process exits."""
+        try:
+            proc = psutil.Process(self.pid)
+            while not self._stop.is_set():
+                rss = proc.memory_info().rss
+                for child in proc.children(recursive=True):
+                    try:
+                        rss += child.memory_info().rss
+                    except psutil.Error:
+                        # the child exited since it was listed
+                        continue
+                self.peak = max(self.peak, rss)
+                self._stop.wait(self.interval)
+        except psutil.Error:
+            # the process has exited
+            return
+
+    def __enter__(self) -> "PeakMemoryMonitor":
+        """Start sampling."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        self._thread.join()
+
+
+class RunLimits(BaseModel, frozen=True):
+    """Wall-clock and CPU-time limits for a single EnergyPlus run."""
+
+    wall_seconds: float | None = Field(
+        default=None,
+        gt=0,
+        description="The wall-clock time after which EnergyPlus is killed [s].  Unlimited if None.",
+    )
+    cpu_seconds: float | None = Field(
+        default=None,
+        gt=0,
+        description="The CPU time of the EnergyPlus process tree after which it is killed [s].  Unlimited if None.",
+    )
+    retry_fidelity: FidelityProfile | None = Field(
+        default=None,
+        description="The fidelity profile `Model.run` retries a timed out model with, e.g. 'screening'.  Does not retry if None.",
+    )
+    retry_scale: float = Field(
+        default=1.0,
+        ge=1,
+        description="The factor the wall-clock and CPU-time limits are multiplied by for the retry at the retry fidelity.",
+    )
+    poll_interval: float = Field(
+        default=0.25,
+        gt=0,
+        description="The time between checks of the limits [s].",
+    )
+
+    def exceeded(
+        self, wall_seconds: float, cpu_seconds: float
+    ) -> tuple[Literal["wall", "cpu"], float] | None:
+        """The limit a run has exceeded, if any.
+
+        Args:
+            wall_seconds (float): The wall-clock time of the run so far [s].
+            cpu_seconds (float): The CPU time of the run so far [s].
+
+        Returns:
+            exceeded (tuple[Literal["wall", "cpu"], float] | None): The kind and value of the exceeded limit, or None.
+        """
+        if self.wall_seconds is not None and wall_seconds > self.wall_seconds:
+            return "wall", self.wall_seconds
+        if self.cpu_seconds is not None and cpu_seconds > self.cpu_seconds:
+            return "cpu", self.cpu_seconds
+        return None
+
+    def for_retry(self) -> "RunLimits":
+        """The limits of the retry at the retry fidelity, which is not retried again.
+
+        Returns:
+            limits (RunLimits): The limits scaled by `retry_scale`, without a retry fidelity.
+        """
+        wall, cpu, scale = self.wall_seconds, self.cpu_seconds, self.retry_scale
+        return self.model_copy(
+            update={
+                "wall_seconds": wall and wall * scale,
+                "cpu_seconds": cpu and cpu * scale,
+                "retry_fidelity": None,
+            }
+        )
+
+
+@dataclass(frozen=True)
+class SimulationTimeout:
+    """A description of an EnergyPlus run which was killed for exceeding its limits."""
+
+    limit: Literal["wall", "cpu"]
+    limit_seconds: float
+    wall_seconds: float
+    cpu_seconds: float
+    err_text: str
+    idf_path: Path
+
+
+def _tree_cpu_seconds(root: psutil.Process, seen: dict[int, float]) -> float:
+    """The CPU time used by a process and its children, including children which have exited.
+
+    Args:
+        root (psutil.Process): The root of the process tree.
+        seen (dict[int, float]): The last CPU time of every process seen so far, updated in place.
+
+    Returns:
+        cpu_seconds (float): The CPU time of the tree [s].
+    """
+    try:
+        procs = [root, *root.children(recursive=True)]
+    except psutil.Error:
+        procs = []
+    for proc in procs:
+        try:
+            times = proc.cpu_times()
+        except psutil.Error:
+            continue
+        seen[proc.pid] = times.user + times.system
+    return sum(seen.values())
+
+
+def kill_process_tree(pid: int) -> None:
+    """Kill a process and all of its children, and wait for them to exit.
+
+    Args:
+        pid (int): The root of the process tree.
+    """
+    try:
+        root = psutil.Process(pid)
+        procs = [*root.children(recursive=True), root]
+    except psutil.Error:
+        return
+    for proc in procs:
+        try:
+            proc.kill()
+        except psutil.Error:
+            continue
+    psutil.wait_procs(procs, timeout=5)
+
+
+class EnergyPlusRunError(EnergyPlusProcessError):
+    """An error raised when an EnergyPlus run launched by epinterface fails."""
+
+    def __init__(
+        self, cmd: list[str], stderr: str, idf_path: Path, returncode: int | None = None
+    ):
+        """Initialize the error.
+
+        Args:
+            cmd (list[str]): The command which was run.
+            stderr (str): The contents of the EnergyPlus error file, or the process stderr.
+            idf_path (Path): The path to the simulated IDF file.
+            returncode (int | None): The exit code of the EnergyPlus process, if it exited.
+        """
+        self.idf_path = idf_path
+        self.returncode = returncode
+        super().__init__(cmd=cmd, stderr=stderr, idf=None)
+
+    def __str__(self):
+        """Return the IDF path, the exit code and the error text."""
+        return f"{self.idf_path} (exit code {self.returncode}):\n{self.stderr}"
+
+
+class EnergyPlusTimeoutError(EnergyPlusRunError):
+    """An error raised when an EnergyPlus run is killed for exceeding its limits."""
+
+    def __init__(self, cmd: list[str], timeout: SimulationTimeout):
+        """Initialize the error.
+
+        Args:
+            cmd (list[str]): The command which was run.
+            timeout (SimulationTimeout): The description of the timeout, with the partial error file.
+        """
+        self.timeout = timeout
+        super().__init__(cmd=cmd, stderr=timeout.err_text, idf_path=timeout.idf_path)
+
+    def __str__(self):
+        """Return the IDF path, the exceeded limit and the partial error text."""
+        t = self.timeout
+        return (
+            f"{self.idf_path} exceeded its {t.limit} time limit of "
+            f"{t.limit_seconds:.1f}s (wall {t.wall_seconds:.1f}s, CPU "
+            f"{t.cpu_seconds:.1f}s):\n{self.stderr}"
+        )
+
+
+@dataclass
+class EnergyPlusRun:
+    """A prepared EnergyPlus invocation.
+
+    The simulation runs in a staging directory which is moved to the
+    `simulation_dir` once EnergyPlus succeeds, so that `idf.sql_file` and
+    `idf.simulation_files` behave as they do after `IDF.simulate`.
+
+    A prepared run only holds paths, so it can be handed to another thread
+    or process than the one which built the IDF.  Runs launched as a
+    subprocess record the peak resident memory of EnergyPlus in
+    `peak_memory`.
+    """
+
+    cmd: list[str]
+    idf_path: Path
+    run_dir: Path
+    simulation_dir: Path
+    output_prefix: str = "eplus"
+    threads: int | None = None
+    peak_memory: int | None = None
+
+    @classmethod
+    def Prepare(
+        cls,
+        idf: IDF,
+        expand_objects: bool | None = None,
+        readvars: bool = False,
+        threads: int | None = None,
+    ) -> "EnergyPlusRun":
+        """Write the IDF to a staging directory and build the command.
+
+        The weather file is read in place rather than copied next to the IDF.
+
+        Args:
+            idf (IDF): The IDF model to simulate.
+            expand_objects (bool | None): Whether EnergyPlus should run ExpandObjects first (required for HVACTemplate objects).  If None, it only runs when the IDF has HVACTemplate objects.
+            readvars (bool): Whether EnergyPlus should run ReadVarsESO after the simulation, to convert the .eso file to csv.
+            threads (int | None): The number of OpenMP threads EnergyPlus may use.  Defaults to the configured number of threads.
+
+        Returns:
+            run (EnergyPlusRun): The prepared run.
+        """
+        if not idf.epw:
+            msg = f"No weather file specified for {idf.name}."
+            raise ValueError(msg)
+        if idf.file_version is None:
+            msg = f"EnergyPlus version not found in IDF file: {idf.name}"
+            raise ValueError(msg)
+        output_directory = Path(idf.output_directory)
+        simulation_dir = Path(idf.simulation_dir)
+        run_dir = output_directory / f"eplus_run_{str(uuid4())[:8]}"
+        run_dir.mkdir(parents=True, exist_ok=False)
+        idf_path = run_dir / idf.name
+        idf.savecopy(idf_path.as_posix())
+        epw_path = Path(idf.epw).resolve()
+
+        cmd = [
+            energyplus_executable(idf.file_version).as_posix(),
+            "-d",
+            run_dir.as_posix(),
+            "-p",
+            idf.output_prefix,
+            "-s",
+            "L",
+            "-w",
+            epw_path.as_posix(),
+        ]
+        if expand_objects is None:
+            expand_objects = has_hvac_templates(idf)
+        if expand_objects:
+            cmd.append("-x")
+        if readvars:
+            cmd.append("-r")
+        cmd.append(idf_path.as_posix())
+        return cls(
+            cmd=cmd,
+            idf_path=idf_path,
+            run_dir=run_dir,
+            simulation_dir=simulation_dir,
+            output_prefix=idf.output_prefix,
+            threads=threads or energyplus_settings.energyplus_threads,
+        )
+
+    @property
+    def sql_path(self) -> Path:
+        """The path to the sql results file once the run has been finalized."""
+        return self.simulation_dir / f"{self.output_prefix}out.sql"
+
+    @property
+    def err_path(self) -> Path:
+        """The path to the EnergyPlus error file in the staging directory."""
+        return self.run_dir / f"{self.output_prefix}out.err"
+
+    def finalize(self, returncode: int, stderr: str) -> None:
+        """Move the results into place, or raise if EnergyPlus failed.
+
+        Args:
+            returncode (int): The return code of the EnergyPlus process.
+            stderr (str): The captured standard error of the process.
+
+        Raises:
+            EnergyPlusRunError: If EnergyPlus failed.
+        """
+        if returncode != 0:
+            err_text = self.err_path.read_text() if self.err_path.exists() else stderr
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+            raise EnergyPlusRunError(
+                cmd=self.cmd,
+                stderr=err_text,
+                idf_path=self.idf_path,
+                returncode=returncode,
+            )
+        shutil.rmtree(self.simulation_dir, ignore_errors=True)
+        self.run_dir.rename(self.simulation_dir)
+
+    def run(self, limits: RunLimits | None = None) -> None:
+        """Run EnergyPlus as a blocking subprocess and move the results into place.
+
+        If the run exceeds its limits, EnergyPlus and its children are
+        killed and the staging directory is removed, keeping only the
+        partial error file in the raised error.
+
+        Args:
+            limits (RunLimits | None): The wall-clock and CPU-time limits of the run.  Unlimited if None.
+
+        Raises:
+            EnergyPlusRunError: If EnergyPlus failed.
+            EnergyPlusTimeoutError: If EnergyPlus exceeded its limits.
+        """
+        logger.debug(f"Launching EnergyPlus: {' '.join(self.cmd)}")
+        proc = subprocess.Popen(  # noqa: S603
+            self.cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            cwd=self.run_dir,
+            env=threads_env(self.threads),
+        )
+        with PeakMemoryMonitor(proc.pid) as monitor:
+            if limits is None:
+                _, stderr = proc.communicate()
+            else:
+                stderr = self._communicate_within(proc, limits)
+        self.peak_memory = monitor.peak
+        self.finalize(proc.returncode, stderr.decode("utf-8", errors="replace"))
+
+    def _communicate_within(self, proc: subprocess.Popen, limits: RunLimits) -> bytes:
+        """Wait for EnergyPlus to exit, killing it if it exceeds its limits.
+
+        Args:
+            proc (subprocess.Popen): The EnergyPlus process.
+            limits (RunLimits): The limits of the run.
+
+        Returns:
+            stderr (bytes): The standard error of the process.
+
+        Raises:
+            EnergyPlusTimeoutError: If EnergyPlus exceeded its limits.
+        """
+        start = time.monotonic()
+        root = psutil.Process(proc.pid)
+        seen: dict[int, float] = {}
+        while True:
+            try:
+                _, stderr = proc.communicate(timeout=limits.poll_interval)
+            except subprocess.TimeoutExpired:
+                pass
+            else:
+                return stderr
+            wall_seconds = time.monotonic() - start
+            cpu_seconds = _tree_cpu_seconds(root, seen)
+            exceeded = limits.exceeded(wall_seconds, cpu_seconds)
+            if exceeded is None:
+                continue
+            logger.warning(
+                f"Killing EnergyPlus for {self.idf_path} after {wall_seconds:.1f}s "
+                f"(CPU {cpu_seconds:.1f}s): {exceeded[0]} time limit exceeded."
+            )
+            kill_process_tree(proc.pid)
+            proc.communicate()
+            err_text = (
+                self.err_path.read_text(errors="replace")
+                if self.err_path.exists()
+                else ""
+            )
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+            raise EnergyPlusTimeoutError(
+                cmd=self.cmd,
+                timeout=SimulationTimeout(
+                    limit=exceeded[0],
+                    limit_seconds=exceeded[1],
+                    wall_seconds=wall_seconds,
+                    cpu_seconds=cpu_seconds,
+                    err_text=err_text,
+                    idf_path=self.idf_path,
+                ),
+            )
+
+    async def arun(self) -> None:
+        """Run EnergyPlus as an asyncio subprocess and move the results into place.
+
+        Raises:
+            EnergyPlusRunError: If EnergyPlus failed.
+        """
+        logger.debug(f"Launching EnergyPlus: {' '.join(self.cmd)}")
+        proc = await asyncio.create_subprocess_exec(
+            *self.cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.run_dir,
+            env=threads_env(self.threads),
+        )
+        try:
+            with PeakMemoryMonitor(proc.pid) as monitor:
+                _, stderr = await proc.communicate()
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+            raise
+        self.peak_memory = monitor.peak
+        self.finalize(
+            proc.returncode if proc.returncode is not None else -1,
+            stderr.decode("utf-8", errors="replace"),
+        )
+
+
+async def asimulate_idf(idf: IDF) -> IDF:
+    """Simulate an IDF model with an asyncio-managed EnergyPlus subprocess.
+
+    Args:
+        idf (IDF): The IDF model to simulate.
+
+    Returns:
+        idf (IDF): The simulated IDF model, whose `simulation_dir` holds the results.
+    """
+    run = await asyncio.to_thread(EnergyPlusRun.Prepare, idf)
+    await run.arun()
+    return idf
+
+
+def energyplus_api(version: EnergyPlusVersion) -> Any:
+    """Load the Python API bundled with an EnergyPlus installation.
+
+    Args:
+        version (EnergyPlusVersion): The EnergyPlus version.
+
+    Returns:
+        api (pyenergyplus.api.EnergyPlusAPI): The EnergyPlus API.
+
+    Raises:
+        EnergyPlusVersionError: If the installation does not provide `pyenergyplus`.
+    """
+    install_dir = str(version.current_install_dir)
+    if install_dir not in sys.path:
+        sys.path.append(install_dir)
+    try:
+        from pyenergyplus.api import (
+            EnergyPlusAPI,  # pyright: ignore [reportMissingImports]
+        )
+    except ImportError as e:
+        msg = f"No pyenergyplus API found for EnergyPlus version {version.dash}."
+        raise EnergyPlusVersionError(msg) from e
+    return EnergyPlusAPI()
+
+
+@dataclass
+class _InProcessWorker:
+    """The EnergyPlus API loaded by a single worker process."""
+
+    api: Any
+    idd_path: Path
+
+
+_in_process_worker: _InProcessWorker | None = None
+
+
+def _init_in_process_worker(version: str, threads: int | None = None) -> None:
+    """Load the EnergyPlus API for a worker process.
+
+    Args:
+        version (str): The EnergyPlus version, e.g. "24-1-0".
+        threads (int | None): The number of OpenMP threads EnergyPlus may use.  Leaves the limit to EnergyPlus if None.
+    """
+    global _in_process_worker
+    if threads is not None:
+        # OpenMP reads the limit when the library is loaded
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+    energyplus_version = EnergyPlusVersion(version)
+    api = energyplus_api(energyplus_version)
+    _in_process_worker = _InProcessWorker(
+        api=api,
+        idd_path=Path(energyplus_version.current_install_dir) / "Energy+.idd",
+    )
+
+
+def _run_in_process(cmd: list[str], run_dir: Path) -> int:
+    """Run EnergyPlus inside a worker process with a fresh simulation state.
+
+    `reset_state` does not clear everything a previous run leaves behind, so
+    each run gets its own state, which is deleted once the run finishes.
+
+    Args:
+        cmd (list[str]): The EnergyPlus command, whose arguments are passed to the API.
+        run_dir (Path): The staging directory of the run.
+
+    Returns:
+        returncode (int): The exit code EnergyPlus would have returned.
+    """
+    worker = _in_process_worker
+    if worker is None:
+        msg = "In-process EnergyPlus worker was not initialized."
+        raise RuntimeError(msg)
+    api = worker.api
+    state = api.state_manager.new_state()
+    api.runtime.set_console_output_status(state, False)
+    args = cmd[1:]
+    if "-x" in args:
+        # ExpandObjects needs the IDD, which the API otherwise looks for next
+        # to the loaded library rather than in the installation
+        args = ["-i", worker.idd_path.as_posix(), *args]
+    cwd = Path.cwd()
+    os.chdir(run_dir)
+    try:
+        return api.runtime.run_energyplus(state, args)
+    finally:
+        os.chdir(cwd)
+        api.state_manager.delete_state(state)
+
+
+class EnergyPlusWorkerPool:
+    """Long-lived worker processes which run EnergyPlus through its Python API.
+
+    Each worker loads the EnergyPlus library once and gives every run a
+    fresh simulation state, so that consecutive runs skip the process
+    startup and library loading of a fresh EnergyPlus process.  Runs still
+    happen in separate processes from the caller, since EnergyPlus keeps
+    global state which is not safe to share between threads.
+
+    If a worker crashes (e.g. EnergyPlus aborts on `std::bad_alloc`), the
+    run raises an `EnergyPlusRunError` and the workers are restarted, so
+    that later runs on the pool are unaffected.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = 1,
+        version: EnergyPlusVersion | None = None,
+        threads: int | None = None,
+    ):
+        """Start the worker processes.
+
+        Args:
+            max_workers (int | None): The number of worker processes.  Defaults to the number of CPUs if None.
+            version (EnergyPlusVersion | None): The EnergyPlus version to load.  Defaults to the configured version.
+            threads (int | None): The number of OpenMP threads each worker's EnergyPlus may use.  Defaults to the configured number of threads.
+        """
+        version = version or energyplus_settings.archetypal_energyplus_version
+        self._max_workers = max_workers
+        self._initargs = (
+            version.dash,
+            threads or energyplus_settings.energyplus_threads,
+        )
+        self._lock = threading.Lock()
+        self._pool = self._start()
+
+    def _start(self) -> ProcessPoolExecutor:
+        """Start a fresh set of worker processes."""
+        return ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            initializer=_init_in_process_worker,
+            initargs=self._initargs,
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken set of workers, unless another run already has.
+
+        Args:
+            broken (ProcessPoolExecutor): The workers which crashed.
+        """
+        with self._lock:
+            if self._pool is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._start()
+
+    def run(self, run: EnergyPlusRun) -> None:
+        """Run a prepared EnergyPlus invocation on one of the workers and move the results into place.
+
+        Args:
+            run (EnergyPlusRun): The prepared run.
+
+        Raises:
+            EnergyPlusRunError: If EnergyPlus failed, or its worker crashed.
+        """
+        logger.debug(f"Running EnergyPlus in-process: {' '.join(run.cmd)}")
+        with self._lock:
+            pool = self._pool
+        try:
+            returncode = pool.submit(_run_in_process, run.cmd, run.run_dir).result()
+        except BrokenProcessPool as e:
+            logger.warning(f"EnergyPlus worker crashed, restarting the pool: {e}")
+            self._restart(pool)
+            err_text = (
+                run.err_path.read_text(errors="replace")
+                if run.err_path.exists()
+                else ""
+            )
+            shutil.rmtree(run.run_dir, ignore_errors=True)
+            raise EnergyPlusRunError(
+                cmd=run.cmd,
+                stderr=f"The EnergyPlus worker process crashed.\n{err_text}",
+                idf_path=run.idf_path,
+            ) from e
+        run.finalize(returncode, "")
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            pool = self._pool
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "EnergyPlusWorkerPool":
+        """Use the pool as a context manager which shuts it down on exit."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Shut down the pool."""
+        self.shutdown()
+
+
+_default_worker_pool: EnergyPlusWorkerPool | None = None
+_default_worker_pool_lock = threading.Lock()
+
+
+def default_worker_pool() -> EnergyPlusWorkerPool:
+    """Get the single-worker pool used by the in-process executor, starting it on first use.
+
+    Returns:
+        pool (EnergyPlusWorkerPool): The shared worker pool.
+    """
+    global _default_worker_pool
+    with _default_worker_pool_lock:
+        if _default_worker_pool is None:
+            _default_worker_pool = EnergyPlusWorkerPool(max_workers=1)
+        return _default_worker_pool
+
+
+def simulate_idf(
+    idf: IDF,
+    readvars: bool = False,
+    limits: RunLimits | None = None,
+    worker_pool: EnergyPlusWorkerPool | None = None,
+) -> Path:
+    """Simulate an IDF model with the configured executor.
+
+    The `archetypal` executor delegates to `IDF.simulate`.  The `direct`
+    executor saves the IDF once and launches EnergyPlus with only the flags
+    the model needs, which avoids the fixed overhead of `IDF.simulate` on
+    short runs.  The `in_process` executor prepares the run the same way,
+    but runs it on a long-lived worker process through the EnergyPlus
+    Python API, which also avoids starting a new EnergyPlus process.  If
+    a worker pool is provided, the run uses it instead of the configured
+    executor.
+
+    Runs with limits are always launched as a subprocess by the direct
+    executor, since only a process epinterface owns can be killed cleanly.
+
+    Args:
+        idf (IDF): The IDF model to simulate.
+        readvars (bool): Whether to convert the .eso file to csv after the simulation.
+        limits (RunLimits | None): The wall-clock and CPU-time limits of the run.  Unlimited if None.
+        worker_pool (EnergyPlusWorkerPool | None): The in-process workers to run EnergyPlus on.  Uses the configured executor if None.
+
+    Returns:
+        sql_path (Path): The path to the sql results file.
+
+    Raises:
+        EnergyPlusRunError: If EnergyPlus fails when run by the direct or in-process executor.
+        EnergyPlusTimeoutError: If EnergyPlus exceeds its limits.
+    """
+    if limits is not None:
+        run = EnergyPlusRun.Prepare(idf, readvars=readvars)
+        run.run(limits)
+        return run.sql_path
+    if worker_pool is None and energyplus_settings.executor == "archetypal":
+        idf.simulate(readvars=readvars)
+        return Path(idf.sql_file)
+    run = EnergyPlusRun.Prepare(idf, readvars=readvars)
+    if worker_pool is not None:
+        worker_pool.run(run)
+    elif energyplus_settings.executor == "in_process":
+        default_worker_pool().run(run)
+    else:
+        run.run()
+    return run.sql_path
@@ -1,17 +1,25 @@
 """Geometry utilities for the UBEM construction."""
 
+import logging
+import pickle
 from collections.abc import Sequence
-from typing import Literal, cast
+from pathlib import Path
+from typing import Any, ClassVar, Literal, cast
 
 import numpy as np
 from archetypal.idfclass import IDF
 from geomeppy.geom.polygons import Polygon3D
 from geomeppy.geom.vectors import Vector2D
 from numpy.typing import ArrayLike
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from shapely import LineString, Polygon, from_wkt
 from shapely.affinity import translate
 
+from epinterface.cache import LRUDirectoryCache, canonical_hash, epinterface_version
+from epinterface.data import EnergyPlusArtifactDir
+
+logger = logging.getLogger(__name__)
+
 
 def match_idf_to_building_and_neighbors(
     idf: IDF,
@@ -313,6 +321,35 @@ def prepare_neighbor_shading_for_idf(
 
 
 ZoningType = Literal["core/perim", "by_storey"]
+ZoningChoice = ZoningType | Literal["auto"]
+
+# An upper envelope on the relative deviation in annual heating and cooling
+# energy between by_storey and core/perim zoning, as a function of the
+# window-to-wall ratio.  The deviation is driven by lumping together perimeter
+# zones with different orientations (and hence solar gains) rather than by the
+# size of the core, so the footprint dimensions barely matter.  Fit to paired
+# simulations of single storey shoeboxes in Boston; use
+# `benchmarking/zoning_validation.py` to check it for other climates.
+ZONING_DEVIATION_BASE = 0.055
+ZONING_DEVIATION_PER_WWR = 0.38
+GeometryEngine = Literal["geomeppy", "analytic"]
+
+
+def vertex_fields(vertices: Sequence[tuple[float, float, float]]) -> dict[str, float]:
+    """Convert a list of vertices to the vertex fields of an EnergyPlus surface.
+
+    Args:
+        vertices (Sequence[tuple[float, float, float]]): The vertices of the surface.
+
+    Returns:
+        fields (dict[str, float]): The vertex fields, e.g. `Vertex_1_Xcoordinate`.
+    """
+    fields = {}
+    for i, (x, y, z) in enumerate(vertices, start=1):
+        fields[f"Vertex_{i}_Xcoordinate"] = x
+        fields[f"Vertex_{i}_Ycoordinate"] = y
+        fields[f"Vertex_{i}_Zcoordinate"] = z
+    return fields
 
 
 class ShoeboxGeometry(BaseModel):
@@ -332,10 +369,17 @@ class ShoeboxGeometry(BaseModel):
         ge=1,
         description="The number of stories in the building.",
     )
-    zoning: ZoningType = Field(
+    zoning: ZoningChoice = Field(
         ...,
         title="Zoning type",
-        description="Whether to use core/perim or full-floor zones.",
+        description="Whether to use core/perim or full-floor zones, or to pick between them automatically.",
+    )
+    zoning_tolerance: float = Field(
+        default=0.05,
+        title="Auto zoning tolerance",
+        description="When using auto zoning, the largest estimated relative deviation in annual energy "
+        "from core/perim zoning which is accepted in exchange for a single zone per storey.",
+        ge=0,
     )
     perim_depth: float = Field(
         default=3,
@@ -366,6 +410,19 @@ class ShoeboxGeometry(BaseModel):
         ge=0,
         le=1,
     )
+    floor_multiplier: bool = Field(
+        default=False,
+        title="Floor multiplier",
+        description="Whether to model only the ground, one representative middle and the top storey, "
+        "using an EnergyPlus zone multiplier on the middle storey to stand in for the rest.  "
+        "Only takes effect with more than three stories.",
+    )
+    engine: GeometryEngine = Field(
+        default="geomeppy",
+        title="Geometry engine",
+        description="Whether to construct the surfaces with geomeppy's block, intersect and match methods, "
+        "or to write the (identically named and matched) surfaces directly from the shoebox dimensions.",
+    )
 
     @property
     def basement_storey_count(self) -> int:
@@ -377,6 +434,68 @@ class ShoeboxGeometry(BaseModel):
         """Return the number of attic stories."""
         return 1 if self.roof_height else 0
 
+    @property
+    def has_core(self) -> bool:
+        """Return whether the footprint is large enough to fit a core inside the perimeter zones."""
+        return 2 * self.perim_depth < min(self.w, self.d)
+
+    @property
+    def estimated_zoning_deviation(self) -> float:
+        """Return the estimated relative deviation in annual energy of by_storey from core/perim zoning.
+
+        Footprints without room for a core cannot be zoned core/perim, so
+        there is nothing to deviate from.
+        """
+        if not self.has_core:
+            return 0.0
+        return ZONING_DEVIATION_BASE + ZONING_DEVIATION_PER_WWR * self.wwr
+
+    @property
+    def resolved_zoning(self) -> ZoningType:
+        """Return the zoning which is actually used, resolving auto zoning.
+
+        Auto zoning uses a single zone per storey when the footprint has no
+        room for a core, or when the estimated deviation from core/perim zoning
+        is within the zoning tolerance.
+        """
+        if self.zoning != "auto":
+            return self.zoning
+        if self.estimated_zoning_deviation <= self.zoning_tolerance:
+            return "by_storey"
+        return "core/perim"
+
+    @property
+    def modeled_stories(self) -> int:
+        """Return the number of above-ground stories which are explicitly modeled."""
+        if self.floor_multiplier and self.num_stories > 3:
+            return 3
+        return self.num_stories
+
+    @property
+    def middle_storey_multiplier(self) -> int:
+        """Return the zone multiplier of the representative middle storey."""
+        return self.num_stories - self.modeled_stories + 1
+
+    @property
+    def middle_storey_suffix(self) -> str:
+        """Return the suffix of the zone names on the representative middle storey."""
+        return f"Storey {self._typical_storey_number(1)}"
+
+    @property
+    def top_storey_suffix(self) -> str:
+        """Return the suffix of the zone names on the top storey when using a floor multiplier."""
+        return f"Storey {self._typical_storey_number(2)}"
+
+    def _typical_storey_number(self, storey: int) -> int:
+        """Return the number in the zone names of an above-ground storey of the floor-multiplied model."""
+        if self.modeled_stories == self.num_stories:
+            msg = "Building is not modeled with a floor multiplier."
+            raise ValueError(msg)
+        ground_storey = (
+            1 if self.basement and self.resolved_zoning == "core/perim" else 0
+        )
+        return ground_storey + storey
+
     @property
     def zones_height(self) -> float:
         """Return the total height of the zones, excluding any gabling."""
@@ -412,23 +531,256 @@ class ShoeboxGeometry(BaseModel):
         if not self.basement:
             msg = "Building has no basement."
             raise ValueError(msg)
-        return "Storey 0" if self.zoning == "core/perim" else "Storey -1"
+        return "Storey 0" if self.resolved_zoning == "core/perim" else "Storey -1"
 
     @property
     def zones_per_storey(self) -> int:
         """Return the number of zones per storey."""
-        if self.zoning == "core/perim":
+        if self.resolved_zoning == "core/perim":
             return 5
         else:
             return 1
 
-    def add(self, idf: IDF) -> IDF:  # noqa: C901
+    @property
+    def cache_key(self) -> str:
+        """A key for the geometry cache covering every parameter which shapes the surfaces.
+
+        The position of the shoebox is excluded, since cached surfaces are
+        stored relative to the origin and translated when they are replayed.
+        """
+        return canonical_hash({
+            "w": round(self.w, 6),
+            "d": round(self.d, 6),
+            "h": round(self.h, 6),
+            "num_stories": self.num_stories,
+            "zoning": self.resolved_zoning,
+            "perim_depth": round(self.perim_depth, 6),
+            "roof_height": round(self.roof_height, 6) if self.roof_height else None,
+            "basement": self.basement,
+            "exposed_basement_frac": round(self.exposed_basement_frac, 6),
+            "wwr": round(self.wwr, 6),
+            "floor_multiplier": self.floor_multiplier,
+            "engine": self.engine,
+            "epinterface_version": epinterface_version(),
+        })
+
+    def add(self, idf: IDF, cache: "GeometryCache | None" = None) -> IDF:
         """Constructs a simple shoebox geometry in the IDF model.
 
-        Takes advantage of the geomeppy methods to do so.
+        Takes advantage of the geomeppy methods to do so, unless the analytic
+        engine is selected, in which case the surfaces are written directly.
 
         Can create gables, basements, and various zoning strategies.
 
+        If a geometry cache is provided, the zones, surfaces, windows and
+        default constructions created for an identical shoebox are replayed
+        into the IDF instead of being recomputed.  The cache is only used when
+        the IDF has no zones yet, since surfaces are otherwise intersected
+        with the existing geometry.
+
+        If the floor multiplier is enabled, only the ground, one middle and
+        the top storey are created, and the middle storey's zones are given a
+        multiplier so that they stand in for every intermediate storey.
+
+        Args:
+            idf: The IDF model to add the geometry to.
+            cache: The geometry cache to consult.  Skips if None.
+
+        Returns:
+            The IDF model with the added geometry.
+        """
+        if self.modeled_stories < self.num_stories:
+            typical = self.model_copy(
+                update={"num_stories": self.modeled_stories, "floor_multiplier": False}
+            )
+            idf = typical.add(idf, cache=cache)
+            return self._apply_floor_multiplier(idf)
+        if self.engine == "analytic":
+            return self._add_analytic(idf)
+        if cache is None or len(idf.idfobjects["ZONE"]) > 0:
+            return self._add(idf)
+
+        key = self.cache_key
+        objects = cache.get(key)
+        if objects is not None:
+            replay_geometry_objects(idf, objects, offset=(self.x, self.y))
+            return idf
+
+        existing = {
+            (obj_key, obj.Name)
+            for obj_key in GEOMETRY_OBJECT_KEYS
+            for obj in idf.idfobjects[obj_key]
+        }
+        idf = self._add(idf)
+        objects = [
+            (
+                obj_key,
+                _translate_vertices(
+                    {f: obj[f] for f in obj.fieldnames[1:] if obj[f] != ""},
+                    offset=(-self.x, -self.y),
+                ),
+            )
+            for obj_key in GEOMETRY_OBJECT_KEYS
+            for obj in idf.idfobjects[obj_key]
+            if (obj_key, obj.Name) not in existing
+        ]
+        cache.put(key, objects)
+        return idf
+
+    def _apply_floor_multiplier(self, idf: IDF) -> IDF:
+        """Turn the middle storey of a three storey shoebox into a representative storey.
+
+        The middle storey's zones get the zone multiplier, and their floors are
+        paired with their own ceilings so that each copy sits between identical
+        storeys rather than between the ground and top storeys.  The ground
+        storey's ceilings are paired with the top storey's floors in turn.
+
+        The middle storey is raised to the average height of the stories it
+        stands in for, and the top storey (and attic) to their true height, since
+        EnergyPlus varies the outdoor air temperature and wind speed with height.
+        Interzone surfaces only need to match in area, so the resulting gaps
+        between the stories are harmless.
+
+        Args:
+            idf: The IDF model with the three storey shoebox.
+
+        Returns:
+            The IDF model with the representative middle storey.
+        """
+        surfaces = idf.idfobjects["BUILDINGSURFACE:DETAILED"]
+        surfaces_by_name = {srf.Name: srf for srf in surfaces}
+        for zone in idf.idfobjects["ZONE"]:
+            if not zone.Name.endswith(f" {self.middle_storey_suffix}"):
+                continue
+            zone.Multiplier = self.middle_storey_multiplier
+
+            floor, ceiling = (
+                next(
+                    srf
+                    for srf in surfaces
+                    if srf.Zone_Name == zone.Name
+                    and srf.Surface_Type.lower() == surface_type
+                    and srf.Outside_Boundary_Condition.lower() == "surface"
+                )
+                for surface_type in ("floor", "ceiling")
+            )
+            below = surfaces_by_name[floor.Outside_Boundary_Condition_Object]
+            above = surfaces_by_name[ceiling.Outside_Boundary_Condition_Object]
+            floor.Outside_Boundary_Condition_Object = ceiling.Name
+            ceiling.Outside_Boundary_Condition_Object = floor.Name
+            below.Outside_Boundary_Condition_Object = above.Name
+            above.Outside_Boundary_Condition_Object = below.Name
+
+        skipped_stories = self.num_stories - self.modeled_stories
+        offsets = {
+            zone.Name: self.h * skipped_stories / 2
+            if zone.Name.endswith(f" {self.middle_storey_suffix}")
+            else self.h * skipped_stories
+            for zone in idf.idfobjects["ZONE"]
+            if zone.Name.endswith(f" {self.middle_storey_suffix}")
+            or zone.Name.endswith(f" {self.top_storey_suffix}")
+            or "attic" in zone.Name.lower()
+        }
+        surface_offsets = {}
+        for srf in surfaces:
+            if srf.Zone_Name in offsets:
+                surface_offsets[srf.Name] = offsets[srf.Zone_Name]
+                _raise_vertices(srf, offsets[srf.Zone_Name])
+        for window in idf.idfobjects["FENESTRATIONSURFACE:DETAILED"]:
+            if window.Building_Surface_Name in surface_offsets:
+                _raise_vertices(window, surface_offsets[window.Building_Surface_Name])
+        return idf
+
+    def attic_envelope(
+        self,
+    ) -> list[tuple[str, str, list[tuple[float, float, float]]]]:
+        """The exterior surfaces of the attic: two sloped gables and two triangular endcaps.
+
+        Returns:
+            surfaces (list[tuple[str, str, list[tuple[float, float, float]]]]): The name, surface type and vertices of each surface.
+        """
+        if not self.roof_height:
+            msg = "Building has no attic."
+            raise ValueError(msg)
+
+        # we always want the centerline of a gable to be paralle to the longer
+        # edge
+        centerline_parallel_to = "w" if self.w > self.d else "d"
+
+        # the centerline is the midpoint of the shorter edge
+        # since it is parallel to the longer edge
+        roof_centerline = (
+            (self.x + self.w / 2)
+            if centerline_parallel_to == "d"
+            else (self.y + self.d / 2)
+        )
+
+        if centerline_parallel_to == "d":
+            # this gable goes from the left edge of the building to
+            # the midpoint on the x-axis
+            # it starts in the "upper left" corner in plan
+            # and goes counter clockwise to the "lower left" corner
+            # then to the roof centerline (and up in the z-axis)
+            gable_1 = [
+                (self.x, self.y + self.d, self.zones_height),
+                (self.x, self.y, self.zones_height),
+                (roof_centerline, self.y, self.total_height_with_gabling),
+                (roof_centerline, self.y + self.d, self.total_height_with_gabling),
+            ]
+            gable_2 = [
+                (self.x + self.w, self.y, self.zones_height),
+                (self.x + self.w, self.y + self.d, self.zones_height),
+                (roof_centerline, self.y + self.d, self.total_height_with_gabling),
+                (roof_centerline, self.y, self.total_height_with_gabling),
+            ]
+            # make triangular endcaps
+            endcap_1 = [
+                (self.x, self.y, self.zones_height),
+                (self.x + self.w, self.y, self.zones_height),
+                (roof_centerline, self.y, self.total_height_with_gabling),
+            ]
+            endcap_2 = [
+                (self.x + self.w, self.y + self.d, self.zones_height),
+                (self.x, self.y + self.d, self.zones_height),
+                (roof_centerline, self.y + self.d, self.total_height_with_gabling),
+            ]
+        else:
+            # this gable goes from the middle of the left edge at the top of the
+            # gable and goes counter clockwise down to the lower left corner
+            # then the lower right corner, and then back up.
+            gable_1 = [
+                (self.x, roof_centerline, self.total_height_with_gabling),
+                (self.x, self.y, self.zones_height),
+                (self.x + self.w, self.y, self.zones_height),
+                (self.x + self.w, roof_centerline, self.total_height_with_gabling),
+            ]
+            gable_2 = [
+                (self.x, roof_centerline, self.total_height_with_gabling),
+                (self.x + self.w, roof_centerline, self.total_height_with_gabling),
+                (self.x + self.w, self.y + self.d, self.zones_height),
+                (self.x, self.y + self.d, self.zones_height),
+            ]
+            # make triangular endcaps
+            endcap_1 = [
+                (self.x, self.y, self.zones_height),
+                (self.x, roof_centerline, self.total_height_with_gabling),
+                (self.x, self.y + self.d, self.zones_height),
+            ]
+            endcap_2 = [
+                (self.x + self.w, self.y, self.zones_height),
+                (self.x + self.w, self.y + self.d, self.zones_height),
+                (self.x + self.w, roof_centerline, self.total_height_with_gabling),
+            ]
+        return [
+            ("Gable1", "Roof", gable_1),
+            ("Gable2", "Roof", gable_2),
+            ("Endcap1", "Wall", endcap_1),
+            ("Endcap2", "Wall", endcap_2),
+        ]
+
+    def _add(self, idf: IDF) -> IDF:
+        """Constructs the shoebox geometry with geomeppy.
+
         Args:
             idf: The IDF model to add the geometry to.
 
@@ -449,14 +801,14 @@ class ShoeboxGeometry(BaseModel):
             name="shoebox",
             coordinates=bottom_plane,
             height=self.zones_height
-            + (self.h if self.basement and self.zoning == "core/perim" else 0),
+            + (self.h if self.basement and self.resolved_zoning == "core/perim" else 0),
             num_stories=self.num_stories + self.basement_storey_count,
-            zoning=self.zoning,
+            zoning=self.resolved_zoning,
             perim_depth=self.perim_depth,
             below_ground_stories=self.basement_storey_count,
             below_ground_storey_height=self.h,
         )
-        if self.basement and self.zoning == "core/perim":
+        if self.basement and self.resolved_zoning == "core/perim":
             idf.translate((0, 0, -self.h))
 
         if self.roof_height:
@@ -477,179 +829,17 @@ class ShoeboxGeometry(BaseModel):
             # create the zone
             idf.newidfobject("ZONE", Name="Attic")
 
-            # we always want the centerline of a gable to be paralle to the longer
-            # edge
-            centerline_parallel_to = "w" if self.w > self.d else "d"
-
-            # the centerline is the midpoint of the shorter edge
-            # since it is parallel to the longer edge
-            roof_centerline = (
-                (self.x + self.w / 2)
-                if centerline_parallel_to == "d"
-                else (self.y + self.d / 2)
-            )
-
-            if centerline_parallel_to == "d":
-                # this gable goes from the left edge of the building to
-                # the midpoint on the x-axis
-                # it starts in the "upper left" corner in plan
-                # and goes counter clockwise to the "lower left" corner
-                # then to the roof centerline (and up in the z-axis)
-                vert_0 = (self.x, self.y + self.d, self.zones_height)
-                vert_1 = (self.x, self.y, self.zones_height)
-                vert_2 = (roof_centerline, self.y, self.total_height_with_gabling)
-                vert_3 = (
-                    roof_centerline,
-                    self.y + self.d,
-                    self.total_height_with_gabling,
-                )
-            else:
-                # this gable goes from the middle of the left edge at the top of the
-                # gable and goes counter clockwise down to the lower left corner
-                # then the lower right corner, and then back up.
-                vert_0 = (self.x, roof_centerline, self.total_height_with_gabling)
-                vert_1 = (self.x, self.y, self.zones_height)
-                vert_2 = (self.x + self.w, self.y, self.zones_height)
-                vert_3 = (
-                    self.x + self.w,
-                    roof_centerline,
-                    self.total_height_with_gabling,
-                )
-
-            idf.newidfobject(
-                "BUILDINGSURFACE:DETAILED",
-                Name="Gable1",
-                Surface_Type="Roof",
-                Number_of_Vertices=4,
-                View_Factor_to_Ground=0,
-                Vertex_1_Xcoordinate=vert_0[0],
-                Vertex_1_Ycoordinate=vert_0[1],
-                Vertex_1_Zcoordinate=vert_0[2],
-                Vertex_2_Xcoordinate=vert_1[0],
-                Vertex_2_Ycoordinate=vert_1[1],
-                Vertex_2_Zcoordinate=vert_1[2],
-                Vertex_3_Xcoordinate=vert_2[0],
-                Vertex_3_Ycoordinate=vert_2[1],
-                Vertex_3_Zcoordinate=vert_2[2],
-                Vertex_4_Xcoordinate=vert_3[0],
-                Vertex_4_Ycoordinate=vert_3[1],
-                Vertex_4_Zcoordinate=vert_3[2],
-                Zone_Name="Attic",
-            )
-
-            if centerline_parallel_to == "d":
-                vert_0 = (self.x + self.w, self.y, self.zones_height)
-                vert_1 = (self.x + self.w, self.y + self.d, self.zones_height)
-                vert_2 = (
-                    roof_centerline,
-                    self.y + self.d,
-                    self.total_height_with_gabling,
-                )
-                vert_3 = (
-                    roof_centerline,
-                    self.y,
-                    self.total_height_with_gabling,
-                )
-            else:
-                vert_0 = (self.x, roof_centerline, self.total_height_with_gabling)
-                vert_1 = (
-                    self.x + self.w,
-                    roof_centerline,
-                    self.total_height_with_gabling,
-                )
-                vert_2 = (
-                    self.x + self.w,
-                    self.y + self.d,
-                    self.zones_height,
-                )
-                vert_3 = (
-                    self.x,
-                    self.y + self.d,
-                    self.zones_height,
-                )
-
-            idf.newidfobject(
-                "BUILDINGSURFACE:DETAILED",
-                Name="Gable2",
-                Surface_Type="Roof",
-                Number_of_Vertices=4,
-                View_Factor_to_Ground=0,
-                Vertex_1_Xcoordinate=vert_0[0],
-                Vertex_1_Ycoordinate=vert_0[1],
-                Vertex_1_Zcoordinate=vert_0[2],
-                Vertex_2_Xcoordinate=vert_1[0],
-                Vertex_2_Ycoordinate=vert_1[1],
-                Vertex_2_Zcoordinate=vert_1[2],
-                Vertex_3_Xcoordinate=vert_2[0],
-                Vertex_3_Ycoordinate=vert_2[1],
-                Vertex_3_Zcoordinate=vert_2[2],
-                Vertex_4_Xcoordinate=vert_3[0],
-                Vertex_4_Ycoordinate=vert_3[1],
-                Vertex_4_Zcoordinate=vert_3[2],
-                Zone_Name="Attic",
-            )
-
-            # make triangular endcaps
-            if centerline_parallel_to == "d":
-                vert_0 = (self.x, self.y, self.zones_height)
-                vert_1 = (self.x + self.w, self.y, self.zones_height)
-                vert_2 = (roof_centerline, self.y, self.total_height_with_gabling)
-            else:
-                vert_0 = (self.x, self.y, self.zones_height)
-                vert_1 = (self.x, roof_centerline, self.total_height_with_gabling)
-                vert_2 = (self.x, self.y + self.d, self.zones_height)
-
-            idf.newidfobject(
-                "BUILDINGSURFACE:DETAILED",
-                Name="Endcap1",
-                Surface_Type="Wall",
-                Number_of_Vertices=3,
-                Vertex_1_Xcoordinate=vert_0[0],
-                Vertex_1_Ycoordinate=vert_0[1],
-                Vertex_1_Zcoordinate=vert_0[2],
-                Vertex_2_Xcoordinate=vert_1[0],
-                Vertex_2_Ycoordinate=vert_1[1],
-                Vertex_2_Zcoordinate=vert_1[2],
-                Vertex_3_Xcoordinate=vert_2[0],
-                Vertex_3_Ycoordinate=vert_2[1],
-                Vertex_3_Zcoordinate=vert_2[2],
-                Zone_Name="Attic",
-            )
-
-            if centerline_parallel_to == "d":
-                vert_0 = (self.x + self.w, self.y + self.d, self.zones_height)
-                vert_1 = (self.x, self.y + self.d, self.zones_height)
-                vert_2 = (
-                    roof_centerline,
-                    self.y + self.d,
-                    self.total_height_with_gabling,
-                )
-            else:
-                vert_0 = (self.x + self.w, self.y, self.zones_height)
-                vert_1 = (self.x + self.w, self.y + self.d, self.zones_height)
-                vert_2 = (
-                    self.x + self.w,
-                    roof_centerline,
-                    self.total_height_with_gabling,
+            for name, surface_type, vertices in self.attic_envelope():
+                idf.newidfobject(
+                    "BUILDINGSURFACE:DETAILED",
+                    Name=name,
+                    Surface_Type=surface_type,
+                    Number_of_Vertices=len(vertices),
+                    **({"View_Factor_to_Ground": 0} if surface_type == "Roof" else {}),
+                    **vertex_fields(vertices),
+                    Zone_Name="Attic",
                 )
 
-            idf.newidfobject(
-                "BUILDINGSURFACE:DETAILED",
-                Name="Endcap2",
-                Surface_Type="Wall",
-                Number_of_Vertices=3,
-                Vertex_1_Xcoordinate=vert_0[0],
-                Vertex_1_Ycoordinate=vert_0[1],
-                Vertex_1_Zcoordinate=vert_0[2],
-                Vertex_2_Xcoordinate=vert_1[0],
-                Vertex_2_Ycoordinate=vert_1[1],
-                Vertex_2_Zcoordinate=vert_1[2],
-                Vertex_3_Xcoordinate=vert_2[0],
-                Vertex_3_Ycoordinate=vert_2[1],
-                Vertex_3_Zcoordinate=vert_2[2],
-                Zone_Name="Attic",
-            )
-
             # We will create identical floor surfaces for the attic to match
             # the zone below.  While we could just add a single plane and let
             # the `intersect_match` handle it, this is more robust; the geomeppy
@@ -704,6 +894,362 @@ class ShoeboxGeometry(BaseModel):
         )
         return idf
 
+    def plan_zones(
+        self,
+    ) -> list[tuple[str, list[tuple[float, float]], list[tuple[str, int] | None]]]:
+        """The zones of a single storey in plan, as laid out by geomeppy's `add_block`.
+
+        Each footprint is counter-clockwise when viewed from above, and the
+        i-th wall of a zone runs from its i-th to its (i+1)-th footprint vertex.
+
+        Returns:
+            zones (list[tuple[str, list[tuple[float, float]], list[tuple[str, int] | None]]]): The label and footprint of each zone, along with the adjacent zone label and wall number (or None if exterior) for each wall.
+        """
+        outer = [
+            (self.x, self.y),
+            (self.x + self.w, self.y),
+            (self.x + self.w, self.y + self.d),
+            (self.x, self.y + self.d),
+        ]
+        if self.resolved_zoning == "by_storey":
+            return [("shoebox", outer, [None, None, None, None])]
+
+        p = self.perim_depth
+        if not self.has_core:
+            msg = f"Perimeter depth {p} is too deep for a {self.w}x{self.d} footprint."
+            raise ValueError(msg)
+        inner = [
+            (self.x + p, self.y + p),
+            (self.x + self.w - p, self.y + p),
+            (self.x + self.w - p, self.y + self.d - p),
+            (self.x + p, self.y + self.d - p),
+        ]
+        zones: list[
+            tuple[str, list[tuple[float, float]], list[tuple[str, int] | None]]
+        ] = []
+        for j in range(4):
+            k = j + 1
+            zones.append((
+                f"Perimeter_Zone_{k}",
+                [inner[j], outer[j], outer[(j + 1) % 4], inner[(j + 1) % 4]],
+                [
+                    (f"Perimeter_Zone_{(j - 1) % 4 + 1}", 3),
+                    None,
+                    (f"Perimeter_Zone_{(j + 1) % 4 + 1}", 1),
+                    ("Core_Zone", k),
+                ],
+            ))
+        zones.append((
+            "Core_Zone",
+            inner,
+            [(f"Perimeter_Zone_{k}", 4) for k in range(1, 5)],
+        ))
+        return zones
+
+    def _add_analytic(self, idf: IDF) -> IDF:  # noqa: C901
+        """Constructs the shoebox geometry by writing the surfaces directly.
+
+        The zones, surfaces, boundary conditions and windows match what the
+        geomeppy engine produces for a standalone shoebox, but are computed
+        from the shoebox dimensions rather than by intersecting and matching
+        blocks, which is much faster and cannot create sliver surfaces.
+
+        Args:
+            idf: The IDF model to add the geometry to.
+
+        Returns:
+            The IDF model with the added geometry.
+        """
+        plan = self.plan_zones()
+        storey_count = self.num_stories + self.basement_storey_count
+        # geomeppy numbers the basement as storey 0 when using core/perim
+        # zoning, since the block is created above ground and then translated
+        first_storey = (
+            -1 if self.basement and self.resolved_zoning == "by_storey" else 0
+        )
+
+        def zone_name(label: str, storey: int) -> str:
+            return f"Block {label} Storey {storey + first_storey}"
+
+        def add_surface(**fields: Any) -> None:
+            # `addidfobject` skips the (quadratic) duplicate name check
+            # performed by `newidfobject`; the names here are unique by construction
+            idf.addidfobject(idf.anidfobject("BUILDINGSURFACE:DETAILED", **fields))
+
+        def exposure(boundary_condition: str) -> dict[str, str]:
+            exposed = boundary_condition == "outdoors"
+            return {
+                "Outside_Boundary_Condition": boundary_condition,
+                "Sun_Exposure": "SunExposed" if exposed else "NoSun",
+                "Wind_Exposure": "WindExposed" if exposed else "NoWind",
+            }
+
+        for label, _, _ in plan:
+            for storey in range(storey_count):
+                idf.addidfobject(idf.anidfobject("ZONE", Name=zone_name(label, storey)))
+        if self.roof_height:
+            idf.addidfobject(idf.anidfobject("ZONE", Name="Attic"))
+
+        window_walls: list[tuple[str, list[tuple[float, float, float]]]] = []
+        for i, (label, footprint, adjacencies) in enumerate(plan):
+            for storey in range(storey_count):
+                name = zone_name(label, storey)
+                z_bot = (storey - self.basement_storey_count) * self.h
+                z_top = z_bot + self.h
+                below_ground = storey < self.basement_storey_count
+
+                for wall_ix, adjacent in enumerate(adjacencies, start=1):
+                    (x0, y0), (x1, y1) = (
+                        footprint[wall_ix - 1],
+                        footprint[wall_ix % len(footprint)],
+                    )
+                    vertices = [
+                        (x0, y0, z_top),
+                        (x0, y0, z_bot),
+                        (x1, y1, z_bot),
+                        (x1, y1, z_top),
+                    ]
+                    if adjacent is None:
+                        boundary = exposure("ground" if below_ground else "outdoors")
+                        wall_name = f"{name} Wall {wall_ix:04d}"
+                        if not below_ground:
+                            window_walls.append((wall_name, vertices))
+                    else:
+                        adjacent_label, adjacent_wall_ix = adjacent
+                        boundary = {
+                            **exposure("surface"),
+                            "Outside_Boundary_Condition_Object": f"{zone_name(adjacent_label, storey)} Wall {adjacent_wall_ix:04d}_1",
+                        }
+                        wall_name = f"{name} Wall {wall_ix:04d}_1"
+                    add_surface(
+                        Name=wall_name,
+                        Surface_Type="wall",
+                        Zone_Name=name,
+                        **boundary,
+                        **vertex_fields(vertices),
+                    )
+
+                if storey == 0:
+                    floor = {"Name": f"{name} Floor 0001", **exposure("ground")}
+                else:
+                    floor = {
+                        "Name": f"{name} Floor 0001_1",
+                        **exposure("surface"),
+                        "Outside_Boundary_Condition_Object": f"{zone_name(label, storey - 1)} Ceiling 0001_1",
+                    }
+                add_surface(
+                    Surface_Type="floor",
+                    Zone_Name=name,
+                    **floor,
+                    **vertex_fields([(x, y, z_bot) for x, y in reversed(footprint)]),
+                )
+
+                if storey < storey_count - 1:
+                    ceiling = {
+                        "Name": f"{name} Ceiling 0001_1",
+                        "Surface_Type": "ceiling",
+                        **exposure("surface"),
+                        "Outside_Boundary_Condition_Object": f"{zone_name(label, storey + 1)} Floor 0001_1",
+                    }
+                elif self.roof_height:
+                    ceiling = {
+                        "Name": f"{name} Roof 0001_1",
+                        "Surface_Type": "ceiling",
+                        **exposure("surface"),
+                        "Outside_Boundary_Condition_Object": f"attic_bottom_plane_{i}_1",
+                    }
+                else:
+                    ceiling = {
+                        "Name": f"{name} Roof 0001",
+                        "Surface_Type": "roof",
+                        **exposure("outdoors"),
+                    }
+                add_surface(
+                    Zone_Name=name,
+                    **ceiling,
+                    **vertex_fields([(x, y, z_top) for x, y in footprint]),
+                )
+
+        if self.roof_height:
+            for name, surface_type, vertices in self.attic_envelope():
+                add_surface(
+                    Name=name,
+                    Surface_Type=surface_type,
+                    Zone_Name="Attic",
+                    **exposure("outdoors"),
+                    **vertex_fields(vertices),
+                )
+            for i, (label, footprint, _) in enumerate(plan):
+                add_surface(
+                    Name=f"attic_bottom_plane_{i}_1",
+                    Surface_Type="Floor",
+                    Zone_Name="Attic",
+                    **exposure("surface"),
+                    Outside_Boundary_Condition_Object=f"{zone_name(label, storey_count - 1)} Roof 0001_1",
+                    **vertex_fields([
+                        (x, y, self.zones_height) for x, y in reversed(footprint)
+                    ]),
+                )
+
+        idf.set_default_constructions()
+
+        if self.wwr > 0:
+            for wall_name, vertices in window_walls:
+                centroid = np.mean(vertices, axis=0)
+                scale = np.array([0.999, 0.999, self.wwr])
+                window_vertices = [
+                    tuple(float(c) for c in (v - centroid) * scale + centroid)
+                    for v in np.array(vertices)
+                ]
+                idf.addidfobject(
+                    idf.anidfobject(
+                        "FENESTRATIONSURFACE:DETAILED",
+                        Name=f"{wall_name} window",
+                        Surface_Type="Window",
+                        Construction_Name="Project External Window",
+                        Building_Surface_Name=wall_name,
+                        View_Factor_to_Ground="autocalculate",
+                        **vertex_fields(window_vertices),
+                    )
+                )
+        return idf
+
+
+# The objects created by `ShoeboxGeometry.add`, in the order they are replayed.
+GEOMETRY_OBJECT_KEYS = (
+    "MATERIAL",
+    "WINDOWMATERIAL:SIMPLEGLAZINGSYSTEM",
+    "CONSTRUCTION",
+    "ZONE",
+    "BUILDINGSURFACE:DETAILED",
+    "FENESTRATIONSURFACE:DETAILED",
+)
+
+GeometryObjects = list[tuple[str, dict[str, Any]]]
+
+
+def _translate_vertices(
+    fields: dict[str, Any], offset: tuple[float, float]
+) -> dict[str, Any]:
+    """Translate the vertex coordinates of a surface's fields in plan.
+
+    Args:
+        fields (dict[str, Any]): The fields of the surface.
+        offset (tuple[float, float]): The x and y translation.
+
+    Returns:
+        fields (dict[str, Any]): The translated fields.
+    """
+    dx, dy = offset
+    translated = dict(fields)
+    for field, value in fields.items():
+        if not isinstance(value, int | float) or not field.startswith("Vertex_"):
+            continue
+        if field.endswith("_Xcoordinate"):
+            translated[field] = value + dx
+        elif field.endswith("_Ycoordinate"):
+            translated[field] = value + dy
+    return translated
+
+
+def _raise_vertices(srf, dz: float) -> None:
+    """Raise the vertices of a surface in place.
+
+    Args:
+        srf (EpBunch): The surface to raise.
+        dz (float): The vertical offset.
+    """
+    i = 1
+    while f"Vertex_{i}_Zcoordinate" in srf.fieldnames:
+        z = srf[f"Vertex_{i}_Zcoordinate"]
+        if z == "":
+            break
+        srf[f"Vertex_{i}_Zcoordinate"] = float(z) + dz
+        i += 1
+
+
+def replay_geometry_objects(
+    idf: IDF, objects: GeometryObjects, offset: tuple[float, float]
+) -> IDF:
+    """Add cached geometry objects to an IDF model.
+
+    Named objects which already exist in the model (e.g. constructions) are
+    left untouched, mirroring geomeppy's `set_default_constructions`.
+
+    Args:
+        idf (IDF): The IDF model to add the objects to.
+        objects (GeometryObjects): The cached objects, positioned relative to the origin.
+        offset (tuple[float, float]): The x and y position of the shoebox.
+
+    Returns:
+        idf (IDF): The IDF model with the added objects.
+    """
+    existing = {
+        (obj_key, obj.Name.lower())
+        for obj_key in GEOMETRY_OBJECT_KEYS
+        for obj in idf.idfobjects[obj_key]
+    }
+    for obj_key, fields in objects:
+        if (obj_key, str(fields.get("Name", "")).lower()) in existing:
+            continue
+        # the existence check above replaces the (quadratic) duplicate
+        # check performed by `newidfobject`
+        idf.addidfobject(
+            idf.anidfobject(obj_key, **_translate_vertices(fields, offset))
+        )
+    return idf
+
+
+class GeometryCache(LRUDirectoryCache):
+    """A cache of the objects created for each distinct shoebox.
+
+    Entries are pickled, so the cache directory should only ever be shared
+    with trusted processes.  Loaded entries are also kept in memory, since a
+    fleet of buildings typically reuses a small number of shoeboxes.
+    """
+
+    cache_dir: Path = Field(
+        default_factory=lambda: EnergyPlusArtifactDir / "cache" / "geometry",
+        description="The directory to store the cached geometry in.",
+    )
+
+    suffix: ClassVar[str] = ".pkl"
+
+    _loaded: dict[str, GeometryObjects] = PrivateAttr(default_factory=dict)
+
+    def get(self, key: str) -> GeometryObjects | None:
+        """Get the cached geometry objects for a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            objects (GeometryObjects | None): The cached objects, or None on a miss.
+        """
+        if key in self._loaded:
+            return self._loaded[key]
+        data = self.read_bytes(key)
+        if data is None:
+            return None
+        try:
+            objects = pickle.loads(data)  # noqa: S301
+        except Exception:
+            logger.warning(f"Discarding unreadable geometry cache entry {key}")
+            self.path_for(key).unlink(missing_ok=True)
+            return None
+        self._loaded[key] = objects
+        return objects
+
+    def put(self, key: str, objects: GeometryObjects) -> None:
+        """Store the geometry objects for a key.
+
+        Args:
+            key (str): The cache key.
+            objects (GeometryObjects): The objects, positioned relative to the origin.
+        """
+        self._loaded[key] = objects
+        self.write_bytes(key, pickle.dumps(objects))
+
 
 def get_zone_floor_area(idf: IDF, zone_name: str) -> float:
     """Get the floor area of a zone by iterating over building surfaces that are of type 'floor'.
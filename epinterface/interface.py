@@ -149,6 +149,168 @@ class SizingParameters(BaseObj, extra="ignore"):
     Cooling_Sizing_Factor: float
 
 
+class ShadowCalculation(BaseObj, extra="ignore"):
+    """ShadowCalculation object."""
+
+    key: ClassVar[str] = "SHADOWCALCULATION"
+    Shading_Calculation_Method: Literal["PolygonClipping", "PixelCounting"] = (
+        "PolygonClipping"
+    )
+    Shading_Calculation_Update_Frequency_Method: Literal["Periodic", "Timestep"] = (
+        "Periodic"
+    )
+    Shading_Calculation_Update_Frequency: int = Field(default=20, ge=1)
+    Maximum_Figures_in_Shadow_Overlap_Calculations: int = Field(default=15000, ge=200)
+
+
+SolarDistribution = Literal[
+    "MinimalShadowing",
+    "FullExterior",
+    "FullInteriorAndExterior",
+    "FullExteriorWithReflections",
+    "FullInteriorAndExteriorWithReflections",
+]
+
+# the timesteps per hour which EnergyPlus accepts
+VALID_TIMESTEPS_PER_HOUR = (1, 2, 3, 4, 5, 6, 10, 12, 15, 20, 30, 60)
+
+
+class SimulationFidelity(BaseModel, frozen=True):
+    """The settings which trade the accuracy of a simulation against its runtime.
+
+    The settings are applied together, so that a model is never simulated
+    with e.g. a fine timestep but coarse convergence tolerances.
+    """
+
+    timesteps_per_hour: int = Field(
+        ..., description="The number of zone timesteps per hour."
+    )
+    shading_update_frequency: int = Field(
+        ..., ge=1, description="The number of days between shading recalculations."
+    )
+    maximum_shadow_figures: int = Field(
+        default=15000,
+        ge=200,
+        description="The maximum number of figures in shadow overlap calculations.",
+    )
+    solar_distribution: SolarDistribution = Field(
+        ..., description="How beam solar radiation is distributed within the zones."
+    )
+    minimum_warmup_days: int = Field(
+        ..., ge=1, description="The minimum number of warmup days."
+    )
+    maximum_warmup_days: int = Field(
+        ..., ge=1, description="The maximum number of warmup days."
+    )
+    loads_convergence_tolerance: float = Field(
+        ...,
+        gt=0,
+        le=0.5,
+        description="The warmup convergence tolerance for zone loads [W].",
+    )
+    temperature_convergence_tolerance: float = Field(
+        ...,
+        gt=0,
+        le=0.5,
+        description="The warmup convergence tolerance for zone temperatures [deltaC].",
+    )
+
+    @field_validator("timesteps_per_hour")
+    @classmethod
+    def check_timesteps_per_hour(cls, v: int) -> int:
+        """Check that the timestep evenly divides an hour.
+
+        Raises:
+            ValueError
+        """
+        if v not in VALID_TIMESTEPS_PER_HOUR:
+            msg = f"Timesteps per hour must be one of {VALID_TIMESTEPS_PER_HOUR}, got {v}."
+            raise ValueError(msg)
+        return v
+
+    @model_validator(mode="after")
+    def check_warmup_days(self):
+        """Check that the warmup day bounds are ordered.
+
+        Raises:
+            ValueError
+        """
+        if self.minimum_warmup_days > self.maximum_warmup_days:
+            msg = f"Minimum warmup days ({self.minimum_warmup_days}) must not exceed the maximum ({self.maximum_warmup_days})."
+            raise ValueError(msg)
+        return self
+
+    def add(self, idf: IDF) -> IDF:
+        """Add the timestep and shadow calculation, and update the building, in the IDF model.
+
+        Any existing timestep and shadow calculation objects are replaced.
+
+        Args:
+            idf (IDF): The IDF model to configure.
+
+        Returns:
+            idf (IDF): The configured IDF model.
+        """
+        for key in (Timestep.key, ShadowCalculation.key):
+            for obj in list(idf.idfobjects[key]):
+                idf.removeidfobject(obj)
+        Timestep(Number_of_Timesteps_per_Hour=self.timesteps_per_hour).add(idf)
+        ShadowCalculation(
+            Shading_Calculation_Update_Frequency=self.shading_update_frequency,
+            Maximum_Figures_in_Shadow_Overlap_Calculations=self.maximum_shadow_figures,
+        ).add(idf)
+
+        buildings = idf.idfobjects["BUILDING"]
+        building = (
+            buildings[0] if buildings else idf.newidfobject("BUILDING", Name="Building")
+        )
+        building.Solar_Distribution = self.solar_distribution
+        building.Minimum_Number_of_Warmup_Days = self.minimum_warmup_days
+        building.Maximum_Number_of_Warmup_Days = self.maximum_warmup_days
+        building.Loads_Convergence_Tolerance_Value = self.loads_convergence_tolerance
+        building.Temperature_Convergence_Tolerance_Value = (
+            self.temperature_convergence_tolerance
+        )
+        return idf
+
+
+FidelityProfile = Literal["screening", "standard", "detailed"]
+
+FIDELITY_PROFILES: dict[FidelityProfile, SimulationFidelity] = {
+    # coarse timestep, rare shading updates and loose warmup convergence for
+    # quickly screening large design spaces
+    "screening": SimulationFidelity(
+        timesteps_per_hour=4,
+        shading_update_frequency=30,
+        solar_distribution="FullExterior",
+        minimum_warmup_days=1,
+        maximum_warmup_days=10,
+        loads_convergence_tolerance=0.1,
+        temperature_convergence_tolerance=0.5,
+    ),
+    # the settings of Minimal.idf and the EnergyPlus shading defaults
+    "standard": SimulationFidelity(
+        timesteps_per_hour=6,
+        shading_update_frequency=20,
+        solar_distribution="FullInteriorAndExterior",
+        minimum_warmup_days=6,
+        maximum_warmup_days=25,
+        loads_convergence_tolerance=0.04,
+        temperature_convergence_tolerance=0.4,
+    ),
+    # the reference which the other profiles are measured against
+    "detailed": SimulationFidelity(
+        timesteps_per_hour=12,
+        shading_update_frequency=1,
+        solar_distribution="FullInteriorAndExterior",
+        minimum_warmup_days=6,
+        maximum_warmup_days=50,
+        loads_convergence_tolerance=0.01,
+        temperature_convergence_tolerance=0.1,
+    ),
+}
+
+
 class SiteGroundTemperature(BaseObj, extra="ignore"):
     """GroundTemperature object."""
 
@@ -563,6 +725,166 @@ ThermostatType = Literal[
 ]
 
 
+class ScheduleConstant(BaseObj, extra="ignore"):
+    """ScheduleConstant object."""
+
+    key: ClassVar[str] = "SCHEDULE:CONSTANT"
+    Name: str
+    Schedule_Type_Limits_Name: str | None = None
+    Hourly_Value: float
+
+    def add(self, idf: IDF):
+        """Add the schedule to the IDF object unless a schedule with its name exists.
+
+        Args:
+            idf (IDF): The IDF object to add the object to.
+
+        Returns:
+            idf (IDF): The updated IDF object.
+        """
+        if idf.getobject(self.key, self.Name) is None:
+            idf = super().add(idf)
+        return idf
+
+
+class ThermostatSetpointDualSetpoint(BaseObj, extra="ignore"):
+    """ThermostatSetpointDualSetpoint object."""
+
+    key: ClassVar[str] = "THERMOSTATSETPOINT:DUALSETPOINT"
+    Name: str
+    Heating_Setpoint_Temperature_Schedule_Name: str
+    Cooling_Setpoint_Temperature_Schedule_Name: str
+
+
+class ThermostatSetpointSingleHeating(BaseObj, extra="ignore"):
+    """ThermostatSetpointSingleHeating object."""
+
+    key: ClassVar[str] = "THERMOSTATSETPOINT:SINGLEHEATING"
+    Name: str
+    Setpoint_Temperature_Schedule_Name: str
+
+
+class ThermostatSetpointSingleCooling(BaseObj, extra="ignore"):
+    """ThermostatSetpointSingleCooling object."""
+
+    key: ClassVar[str] = "THERMOSTATSETPOINT:SINGLECOOLING"
+    Name: str
+    Setpoint_Temperature_Schedule_Name: str
+
+
+ThermostatControlObjectType = Literal[
+    "ThermostatSetpoint:SingleHeating",
+    "ThermostatSetpoint:SingleCooling",
+    "ThermostatSetpoint:DualSetpoint",
+]
+
+
+class ZoneControlThermostat(BaseObj, extra="ignore"):
+    """ZoneControlThermostat object."""
+
+    key: ClassVar[str] = "ZONECONTROL:THERMOSTAT"
+    Name: str
+    Zone_or_ZoneList_Name: str
+    Control_Type_Schedule_Name: str
+    Control_1_Object_Type: ThermostatControlObjectType
+    Control_1_Name: str
+
+
+class DesignSpecificationOutdoorAir(BaseObj, extra="ignore"):
+    """DesignSpecificationOutdoorAir object."""
+
+    key: ClassVar[str] = "DESIGNSPECIFICATION:OUTDOORAIR"
+    Name: str
+    Outdoor_Air_Method: OutdoorAirMethodType
+    Outdoor_Air_Flow_per_Person: float
+    Outdoor_Air_Flow_per_Zone_Floor_Area: float
+    Outdoor_Air_Flow_per_Zone: float
+
+
+class SizingZone(BaseObj, extra="ignore"):
+    """SizingZone object."""
+
+    key: ClassVar[str] = "SIZING:ZONE"
+    Zone_or_ZoneList_Name: str
+    Zone_Cooling_Design_Supply_Air_Temperature_Input_Method: Literal[
+        "SupplyAirTemperature", "TemperatureDifference"
+    ] = "SupplyAirTemperature"
+    Zone_Cooling_Design_Supply_Air_Temperature: float
+    Zone_Heating_Design_Supply_Air_Temperature_Input_Method: Literal[
+        "SupplyAirTemperature", "TemperatureDifference"
+    ] = "SupplyAirTemperature"
+    Zone_Heating_Design_Supply_Air_Temperature: float
+    Zone_Cooling_Design_Supply_Air_Humidity_Ratio: float
+    Zone_Heating_Design_Supply_Air_Humidity_Ratio: float
+    Design_Specification_Outdoor_Air_Object_Name: str | None = None
+    Cooling_Design_Air_Flow_Method: Literal[
+        "Flow/Zone", "DesignDay", "DesignDayWithLimit"
+    ] = "DesignDay"
+    Cooling_Design_Air_Flow_Rate: float = 0
+    Cooling_Minimum_Air_Flow_Fraction: float = 0
+    Heating_Design_Air_Flow_Method: Literal[
+        "Flow/Zone", "DesignDay", "DesignDayWithLimit"
+    ] = "DesignDay"
+    Heating_Design_Air_Flow_Rate: float = 0
+    Heating_Maximum_Air_Flow_Fraction: float = 0
+
+
+class ZoneHVACIdealLoadsAirSystem(BaseObj, extra="ignore"):
+    """ZoneHVACIdealLoadsAirSystem object."""
+
+    key: ClassVar[str] = "ZONEHVAC:IDEALLOADSAIRSYSTEM"
+    Name: str
+    Availability_Schedule_Name: str | None = None
+    Zone_Supply_Air_Node_Name: str
+    Maximum_Heating_Supply_Air_Temperature: float = 30
+    Minimum_Cooling_Supply_Air_Temperature: float = 18
+    Maximum_Heating_Supply_Air_Humidity_Ratio: float = 0.0156
+    Minimum_Cooling_Supply_Air_Humidity_Ratio: float = 0.0077
+    Heating_Limit: IdealLoadsLimitType = "NoLimit"
+    Maximum_Heating_Air_Flow_Rate: float | None | Literal["autosize"] = None
+    Maximum_Sensible_Heating_Capacity: float | None | Literal["autosize"] = None
+    Cooling_Limit: IdealLoadsLimitType = "NoLimit"
+    Maximum_Cooling_Air_Flow_Rate: float | None | Literal["autosize"] = None
+    Maximum_Total_Cooling_Capacity: float | None | Literal["autosize"] = None
+    Heating_Availability_Schedule_Name: str | None = None
+    Cooling_Availability_Schedule_Name: str | None = None
+    Dehumidification_Control_Type: DehumidificationControlTypeType = "None"
+    Cooling_Sensible_Heat_Ratio: float = 0.7
+    Humidification_Control_Type: HumidificationControlTypeType = "None"
+    Design_Specification_Outdoor_Air_Object_Name: str | None = None
+    Outdoor_Air_Inlet_Node_Name: str | None = None
+    Demand_Controlled_Ventilation_Type: DemandControlledVentilationTypeType = "None"
+    Outdoor_Air_Economizer_Type: OutdoorAirEconomizerTypeType = "NoEconomizer"
+    Heat_Recovery_Type: HeatRecoveryTypeType = "None"
+    Sensible_Heat_Recovery_Effectiveness: float = 0.7
+    Latent_Heat_Recovery_Effectiveness: float = 0.65
+
+
+class ZoneHVACEquipmentList(BaseObj, extra="ignore"):
+    """ZoneHVACEquipmentList object with a single piece of equipment."""
+
+    key: ClassVar[str] = "ZONEHVAC:EQUIPMENTLIST"
+    Name: str
+    Load_Distribution_Scheme: Literal[
+        "SequentialLoad", "UniformLoad", "UniformPLR", "SequentialUniformPLR"
+    ] = "SequentialLoad"
+    Zone_Equipment_1_Object_Type: str
+    Zone_Equipment_1_Name: str
+    Zone_Equipment_1_Cooling_Sequence: int = 1
+    Zone_Equipment_1_Heating_or_NoLoad_Sequence: int = 1
+
+
+class ZoneHVACEquipmentConnections(BaseObj, extra="ignore"):
+    """ZoneHVACEquipmentConnections object."""
+
+    key: ClassVar[str] = "ZONEHVAC:EQUIPMENTCONNECTIONS"
+    Zone_Name: str
+    Zone_Conditioning_Equipment_List_Name: str
+    Zone_Air_Inlet_Node_or_NodeList_Name: str
+    Zone_Air_Node_Name: str
+    Zone_Return_Air_Node_or_NodeList_Name: str
+
+
 class HVACTemplateThermostat(BaseModel):
     """HVACTemplateThermostat object."""
 
@@ -584,6 +906,110 @@ class HVACTemplateThermostat(BaseModel):
         idf.newidfobject("HVACTEMPLATE:THERMOSTAT", **self.model_dump())
         return idf
 
+    @property
+    def control(self) -> tuple[ThermostatControlObjectType, str, int]:
+        """The setpoint object which ExpandObjects creates for the thermostat.
+
+        Returns:
+            object_type (ThermostatControlObjectType): The type of the setpoint object.
+            name (str): The name of the setpoint object.
+            control_type (int): The thermostat control type which selects the setpoint object.
+        """
+        has_heating = (
+            self.Heating_Setpoint_Schedule_Name is not None
+            or self.Constant_Heating_Setpoint is not None
+        )
+        has_cooling = (
+            self.Cooling_Setpoint_Schedule_Name is not None
+            or self.Constant_Cooling_Setpoint is not None
+        )
+        if has_heating and not has_cooling:
+            return "ThermostatSetpoint:SingleHeating", f"{self.Name} SP Control", 1
+        if has_cooling and not has_heating:
+            return "ThermostatSetpoint:SingleCooling", f"{self.Name} SP Control", 2
+        return "ThermostatSetpoint:DualSetpoint", f"{self.Name} Dual SP Control", 4
+
+    def add_native(self, idf: IDF):
+        """Add the setpoint objects ExpandObjects would create for the thermostat.
+
+        Constant setpoints become constant schedules, which are shared by
+        every thermostat with the same setpoint.
+
+        Args:
+            idf (IDF): The IDF object to add the objects to.
+
+        Returns:
+            idf (IDF): The updated IDF object
+
+        Raises:
+            ValueError: If the thermostat has neither a heating nor a cooling setpoint.
+        """
+        heating = _setpoint_schedule(
+            idf, self.Heating_Setpoint_Schedule_Name, self.Constant_Heating_Setpoint
+        )
+        cooling = _setpoint_schedule(
+            idf, self.Cooling_Setpoint_Schedule_Name, self.Constant_Cooling_Setpoint
+        )
+        _, name, _ = self.control
+        if heating is not None and cooling is not None:
+            return ThermostatSetpointDualSetpoint(
+                Name=name,
+                Heating_Setpoint_Temperature_Schedule_Name=heating,
+                Cooling_Setpoint_Temperature_Schedule_Name=cooling,
+            ).add(idf)
+        if heating is not None:
+            return ThermostatSetpointSingleHeating(
+                Name=name, Setpoint_Temperature_Schedule_Name=heating
+            ).add(idf)
+        if cooling is not None:
+            return ThermostatSetpointSingleCooling(
+                Name=name, Setpoint_Temperature_Schedule_Name=cooling
+            ).add(idf)
+        msg = f"Thermostat {self.Name} has no heating or cooling setpoint."
+        raise ValueError(msg)
+
+
+def _setpoint_schedule(
+    idf: IDF, schedule_name: str | None, constant_setpoint: float | None
+) -> str | None:
+    """The schedule for a setpoint, adding a constant schedule for a constant setpoint.
+
+    Args:
+        idf (IDF): The IDF object to add a constant schedule to.
+        schedule_name (str | None): The name of the setpoint schedule, if any.
+        constant_setpoint (float | None): The constant setpoint, if any.
+
+    Returns:
+        schedule_name (str | None): The name of the setpoint schedule, or None if there is no setpoint.
+    """
+    if schedule_name is not None:
+        return schedule_name
+    if constant_setpoint is None:
+        return None
+    return _always_schedule(idf, constant_setpoint)
+
+
+def _always_schedule(idf: IDF, value: float) -> str:
+    """Add the constant schedule ExpandObjects would create for a value, unless it exists.
+
+    Args:
+        idf (IDF): The IDF object to add the schedule to.
+        value (float): The value of the schedule.
+
+    Returns:
+        schedule_name (str): The name of the constant schedule.
+    """
+    type_limits = ScheduleTypeLimits(Name="HVACTemplate Any Number")
+    if idf.getobject(type_limits.key, type_limits.Name) is None:
+        idf = type_limits.add(idf)
+    schedule = ScheduleConstant(
+        Name=f"HVACTemplate-Always {value:g}",
+        Schedule_Type_Limits_Name=type_limits.Name,
+        Hourly_Value=value,
+    )
+    idf = schedule.add(idf)
+    return schedule.Name
+
 
 class HVACTemplateZoneIdealLoadsAirSystem(BaseModel):
     """HVACTemplateZoneIdealLoadsAirSystem object."""
@@ -631,6 +1057,125 @@ class HVACTemplateZoneIdealLoadsAirSystem(BaseModel):
         idf.newidfobject("HVACTEMPLATE:ZONE:IDEALLOADSAIRSYSTEM", **self.model_dump())
         return idf
 
+    @property
+    def is_autosized(self) -> bool:
+        """Whether any flow rate or capacity limit of the system is autosized."""
+        return "autosize" in (
+            self.Maximum_Heating_Air_Flow_Rate,
+            self.Maximum_Sensible_Heating_Capacity,
+            self.Maximum_Cooling_Air_Flow_Rate,
+            self.Maximum_Total_Cooling_Capacity,
+        )
+
+    def add_native(self, idf: IDF, thermostat: HVACTemplateThermostat):
+        """Add the native objects ExpandObjects would create for the template.
+
+        This writes the thermostat control, ideal loads air system, zone
+        equipment list and connections directly, with the names
+        ExpandObjects uses, so that EnergyPlus can skip the ExpandObjects
+        preprocessor.  The thermostat's setpoint objects are added by
+        `HVACTemplateThermostat.add_native`.
+
+        Zone sizing (and the outdoor air specification) is added when the
+        system is autosized or supplies outdoor air.  ExpandObjects adds it
+        to every zone as soon as any template in the file needs it, which
+        only changes the sizing reports of the other zones.
+
+        Args:
+            idf (IDF): The IDF object to add the objects to.
+            thermostat (HVACTemplateThermostat): The template thermostat of the zone.
+
+        Returns:
+            idf (IDF): The updated IDF object
+
+        Raises:
+            ValueError: If the thermostat is not the template's thermostat.
+            NotImplementedError: If humidistat controls are requested, which need a humidistat.
+        """
+        if thermostat.Name != self.Template_Thermostat_Name:
+            msg = f"Thermostat {thermostat.Name} is not the template thermostat {self.Template_Thermostat_Name}."
+            raise ValueError(msg)
+        if (
+            self.Dehumidification_Control_Type == "Humidistat"
+            or self.Humidification_Control_Type == "Humidistat"
+        ):
+            msg = "Humidistat controls are not implemented for native ideal loads."
+            raise NotImplementedError(msg)
+
+        zone = self.Zone_Name
+        control_object_type, control_name, control_type = thermostat.control
+        idf = ZoneControlThermostat(
+            Name=f"{zone} Thermostat",
+            Zone_or_ZoneList_Name=zone,
+            Control_Type_Schedule_Name=_always_schedule(idf, control_type),
+            Control_1_Object_Type=control_object_type,
+            Control_1_Name=control_name,
+        ).add(idf)
+
+        outdoor_air_name = None
+        if self.Outdoor_Air_Method != "None":
+            outdoor_air_name = f"SZ DSOA {zone}"
+            idf = DesignSpecificationOutdoorAir(
+                Name=outdoor_air_name,
+                Outdoor_Air_Method=self.Outdoor_Air_Method,
+                Outdoor_Air_Flow_per_Person=self.Outdoor_Air_Flow_Rate_per_Person,
+                Outdoor_Air_Flow_per_Zone_Floor_Area=self.Outdoor_Air_Flow_Rate_per_Zone_Floor_Area,
+                Outdoor_Air_Flow_per_Zone=self.Outdoor_Air_Flow_Rate_per_Zone,
+            ).add(idf)
+        if outdoor_air_name is not None or self.is_autosized:
+            idf = SizingZone(
+                Zone_or_ZoneList_Name=zone,
+                Zone_Cooling_Design_Supply_Air_Temperature=self.Minimum_Cooling_Supply_Air_Temperature,
+                Zone_Heating_Design_Supply_Air_Temperature=self.Maximum_Heating_Supply_Air_Temperature,
+                Zone_Cooling_Design_Supply_Air_Humidity_Ratio=self.Minimum_Cooling_Supply_Air_Humidity_Ratio,
+                Zone_Heating_Design_Supply_Air_Humidity_Ratio=self.Maximum_Heating_Supply_Air_Humidity_Ratio,
+                Design_Specification_Outdoor_Air_Object_Name=outdoor_air_name,
+            ).add(idf)
+
+        ideal_loads = ZoneHVACIdealLoadsAirSystem(
+            Name=f"{zone} Ideal Loads Air System",
+            Availability_Schedule_Name=self.System_Availability_Schedule_Name,
+            Zone_Supply_Air_Node_Name=f"{zone} Ideal Loads Supply Inlet",
+            Maximum_Heating_Supply_Air_Temperature=self.Maximum_Heating_Supply_Air_Temperature,
+            Minimum_Cooling_Supply_Air_Temperature=self.Minimum_Cooling_Supply_Air_Temperature,
+            Maximum_Heating_Supply_Air_Humidity_Ratio=self.Maximum_Heating_Supply_Air_Humidity_Ratio,
+            Minimum_Cooling_Supply_Air_Humidity_Ratio=self.Minimum_Cooling_Supply_Air_Humidity_Ratio,
+            Heating_Limit=self.Heating_Limit,
+            Maximum_Heating_Air_Flow_Rate=self.Maximum_Heating_Air_Flow_Rate,
+            Maximum_Sensible_Heating_Capacity=self.Maximum_Sensible_Heating_Capacity,
+            Cooling_Limit=self.Cooling_Limit,
+            Maximum_Cooling_Air_Flow_Rate=self.Maximum_Cooling_Air_Flow_Rate,
+            Maximum_Total_Cooling_Capacity=self.Maximum_Total_Cooling_Capacity,
+            Heating_Availability_Schedule_Name=self.Heating_Availability_Schedule_Name,
+            Cooling_Availability_Schedule_Name=self.Cooling_Availability_Schedule_Name,
+            Dehumidification_Control_Type=self.Dehumidification_Control_Type,
+            Cooling_Sensible_Heat_Ratio=self.Cooling_Sensible_Heat_Ratio,
+            Humidification_Control_Type=self.Humidification_Control_Type,
+            Design_Specification_Outdoor_Air_Object_Name=outdoor_air_name,
+            Outdoor_Air_Inlet_Node_Name=f"{zone} Ideal Loads Outdoor Air Inlet"
+            if outdoor_air_name is not None
+            else None,
+            Demand_Controlled_Ventilation_Type=self.Demand_Controlled_Ventilation_Type,
+            Outdoor_Air_Economizer_Type=self.Outdoor_Air_Economizer_Type,
+            Heat_Recovery_Type=self.Heat_Recovery_Type,
+            Sensible_Heat_Recovery_Effectiveness=self.Sensible_Heat_Recovery_Effectiveness,
+            Latent_Heat_Recovery_Effectiveness=self.Latent_Heat_Recovery_Effectiveness,
+        )
+        idf = ZoneHVACEquipmentConnections(
+            Zone_Name=zone,
+            Zone_Conditioning_Equipment_List_Name=f"{zone} Equipment",
+            Zone_Air_Inlet_Node_or_NodeList_Name=ideal_loads.Zone_Supply_Air_Node_Name,
+            Zone_Air_Node_Name=f"{zone} Zone Air Node",
+            Zone_Return_Air_Node_or_NodeList_Name=f"{zone} Return Outlet",
+        ).add(idf)
+        idf = ZoneHVACEquipmentList(
+            Name=f"{zone} Equipment",
+            Zone_Equipment_1_Object_Type="ZoneHVAC:IdealLoadsAirSystem",
+            Zone_Equipment_1_Name=ideal_loads.Name,
+        ).add(idf)
+        idf = ideal_loads.add(idf)
+        return idf
+
 
 DesignLevelCalculationMethodType = Literal["Watts/Area", "Watts/Person", "Watts"]
 
@@ -979,11 +1524,14 @@ class ZoneList(BaseModel, extra="ignore"):
         return idf
 
 
-def add_default_sim_controls(idf: IDF) -> IDF:
+def add_default_sim_controls(
+    idf: IDF, fidelity: SimulationFidelity | None = None
+) -> IDF:
     """Helper to add default simulation controls to the IDF model.
 
     Args:
         idf (IDF): The IDF model to add the simulation controls to.
+        fidelity (SimulationFidelity | None): The accuracy/runtime settings to use.  Defaults to the standard profile.
 
     Returns:
         IDF: The IDF model with the added simulation controls.
@@ -1015,11 +1563,10 @@ def add_default_sim_controls(idf: IDF) -> IDF:
     )
     run_period.add(idf)
 
-    # configure timestep
-    timestep = Timestep(
-        Number_of_Timesteps_per_Hour=6,
-    )
-    timestep.add(idf)
+    # configure timestep, shading, solar distribution and warmup
+    if fidelity is None:
+        fidelity = FIDELITY_PROFILES["standard"]
+    fidelity.add(idf)
 
     sizing = SizingParameters(
         Heating_Sizing_Factor=1.15,
@@ -1030,6 +1577,29 @@ def add_default_sim_controls(idf: IDF) -> IDF:
     return idf
 
 
+def set_sizing_only_sim_controls(idf: IDF) -> IDF:
+    """Helper to replace the simulation controls with a zone sizing run on the design days alone.
+
+    Args:
+        idf (IDF): The IDF model to configure.
+
+    Returns:
+        IDF: The IDF model which only runs the zone sizing calculation.
+    """
+    for obj in list(idf.idfobjects[SimulationControl.key]):
+        idf.removeidfobject(obj)
+    sim_control = SimulationControl(
+        Do_Zone_Sizing_Calculation="Yes",
+        Do_System_Sizing_Calculation="No",
+        Do_Plant_Sizing_Calculation="No",
+        Run_Simulation_for_Sizing_Periods="No",
+        Run_Simulation_for_Weather_File_Run_Periods="No",
+        Do_HVAC_Sizing_Simulation_for_Sizing_Periods="No",
+    )
+    sim_control.add(idf)
+    return idf
+
+
 def add_default_schedules(idf: IDF) -> tuple[IDF, dict[str, Schedule]]:
     """Helper to add default schedules to the IDF model.
 
@@ -0,0 +1,843 @@
+"""Batch execution of SBEM models over pools of worker processes."""
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+import traceback
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from archetypal.idfclass.sql import Sql
+from numpy.typing import NDArray
+
+from epinterface.analysis.outputs import OutputPlan
+from epinterface.analysis.overheating import (
+    OverheatingAnalysisConfig,
+    OverheatingAnalysisResults,
+)
+from epinterface.data import EnergyPlusArtifactDir
+from epinterface.executor import (
+    EnergyPlusRun,
+    EnergyPlusTimeoutError,
+    RunLimits,
+    SimulationTimeout,
+)
+from epinterface.interface import FIDELITY_PROFILES
+from epinterface.sbem.builder import (
+    Model,
+    SimulationPathConfig,
+    plan_outputs,
+    record_sizing,
+)
+from epinterface.sbem.cache import (
+    BuildCaches,
+    ResultCache,
+    SizingCache,
+    autosized_ideal_loads,
+)
+from epinterface.sbem.concurrency import ConcurrencyController
+from epinterface.sbem.cost import (
+    RecordedRun,
+    RunFeatures,
+    RuntimeCostModel,
+    RuntimeLog,
+    longest_first,
+)
+from epinterface.sbem.flat_model import FlatModel
+from epinterface.settings import energyplus_settings
+from epinterface.weather import BaseWeather
+
+logger = logging.getLogger(__name__)
+
+BatchModel = Model | FlatModel
+
+
+@dataclass
+class BatchRunResult:
+    """The result of a single model in a batch run.
+
+    Unlike `ModelRunResults`, the IDF and Sql handles are not included
+    since they cannot be sent back across process boundaries.  The runtime
+    features, stage timings and peak memory are only filled in by the
+    pipelined runner, whose stages run separately.  `timeout` describes
+    the EnergyPlus run of a model which failed by exceeding its limits.
+    """
+
+    index: int
+    energy_and_peak: pd.Series | None
+    err_text: str | None
+    overheating_results: OverheatingAnalysisResults | None
+    output_dir: Path | None
+    error: str | None
+    elapsed: float
+    features: RunFeatures | None = None
+    simulate_seconds: float | None = None
+    postprocess_seconds: float | None = None
+    peak_memory: int | None = None
+    timeout: SimulationTimeout | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the model ran to completion."""
+        return self.error is None
+
+
+@dataclass
+class _WorkerContext:
+    """The state owned by a single worker process."""
+
+    scratch_dir: Path
+    weather_dir: Path
+    keep_outputs: bool
+
+
+_worker_context: _WorkerContext | None = None
+
+
+def _init_worker(scratch_root: Path, weather_dir: Path, keep_outputs: bool) -> None:
+    """Set up the scratch directory and weather cache for a worker process.
+
+    Args:
+        scratch_root (Path): The directory under which each worker creates its own scratch directory.
+        weather_dir (Path): The shared weather cache directory.
+        keep_outputs (bool): Whether to keep the EnergyPlus outputs of each model.
+    """
+    global _worker_context
+    scratch_dir = scratch_root / f"worker-{os.getpid()}"
+    scratch_dir.mkdir(parents=True, exist_ok=True)
+    _worker_context = _WorkerContext(
+        scratch_dir=scratch_dir,
+        weather_dir=weather_dir,
+        keep_outputs=keep_outputs,
+    )
+
+
+def _weather_of(model: BatchModel) -> BaseWeather:
+    """Get the weather handle of a batch model."""
+    if isinstance(model, FlatModel):
+        return BaseWeather(Weather=model.EPWURI)
+    return model
+
+
+def estimate_features(model: BatchModel, output_plan: OutputPlan) -> RunFeatures:
+    """Estimate the runtime features of a batch model without building it.
+
+    Flat models are estimated from their fields, without building their zone.
+
+    Args:
+        model (BatchModel): The model to estimate.
+        output_plan (OutputPlan): The outputs the model will write.
+
+    Returns:
+        features (RunFeatures): The estimated features of the model.
+    """
+    return RunFeatures.Estimate(
+        model.geometry, FIDELITY_PROFILES[model.Fidelity], output_plan
+    )
+
+
+def submission_order(
+    models: list[BatchModel],
+    cost_model: RuntimeCostModel | None,
+    output_plan: OutputPlan,
+) -> list[int]:
+    """The order in which to submit the models of a batch.
+
+    Args:
+        models (list[BatchModel]): The models of the batch.
+        cost_model (RuntimeCostModel | None): The cost model to schedule the longest runs first with.  Keeps the given order if None.
+        output_plan (OutputPlan): The outputs the models will write.
+
+    Returns:
+        order (list[int]): The positions of the models, in the order to submit them.
+    """
+    if cost_model is None:
+        return list(range(len(models)))
+    costs = [
+        cost_model.predict(estimate_features(model, output_plan)) for model in models
+    ]
+    weather_keys = [str(_weather_of(model).Weather) for model in models]
+    return longest_first(costs, weather_keys)
+
+
+def prefetch_weather(models: Iterable[BatchModel], weather_dir: Path) -> None:
+    """Fetch each distinct weather file once so that workers only read the cache.
+
+    Failures are logged rather than raised; the affected models will fail
+    individually when they attempt to fetch the weather file themselves.
+
+    Args:
+        models (Iterable[BatchModel]): The models whose weather files should be fetched.
+        weather_dir (Path): The weather cache directory.
+    """
+    seen: set[str] = set()
+    for model in models:
+        weather = _weather_of(model)
+        key = str(weather.Weather)
+        if key in seen:
+            continue
+        seen.add(key)
+        try:
+            weather.fetch_weather(weather_dir)
+        except Exception:
+            logger.exception(f"Failed to prefetch weather file {key}")
+
+
+def run_model_in_worker(
+    index: int,
+    model: BatchModel,
+    overheating_config: OverheatingAnalysisConfig | None = None,
+    result_cache: ResultCache | None = None,
+    build_caches: BuildCaches | None = None,
+    limits: RunLimits | None = None,
+) -> BatchRunResult:
+    """Run a single model inside a worker process, capturing any failure.
+
+    Args:
+        index (int): The position of the model in the batch.
+        model (BatchModel): The model to run.
+        overheating_config (OverheatingAnalysisConfig | None): Configuration for overheating analysis. Skips if None.
+        result_cache (ResultCache | None): The cache to look up and store results in.  Skips if None.
+        build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+        limits (RunLimits | None): The wall-clock and CPU-time limits of the EnergyPlus run.  Unlimited if None.
+
+    Returns:
+        result (BatchRunResult): The result of the model run.
+    """
+    if _worker_context is None:
+        _init_worker(
+            Path(tempfile.mkdtemp(prefix="epinterface-batch-")),
+            EnergyPlusArtifactDir / "cache" / "weather",
+            keep_outputs=False,
+        )
+    ctx = _worker_context
+    if ctx is None:
+        msg = "Worker context was not initialized."
+        raise RuntimeError(msg)
+
+    start = time.perf_counter()
+    run_dir = ctx.scratch_dir / f"model-{index:06d}"
+    try:
+        if isinstance(model, FlatModel):
+            sbem_model, post_geometry_callback = model.to_model()
+            cache_salt = model.post_geometry_cache_salt
+        else:
+            sbem_model, post_geometry_callback = model, None
+            cache_salt = None
+        r = sbem_model.run(
+            weather_dir=ctx.weather_dir,
+            post_geometry_callback=post_geometry_callback,
+            eplus_parent_dir=run_dir,
+            overheating_config=overheating_config,
+            result_cache=result_cache,
+            cache_salt=cache_salt,
+            build_caches=build_caches,
+            limits=limits,
+        )
+    except Exception as e:
+        logger.exception(f"Model {index} failed.")
+        if not ctx.keep_outputs:
+            shutil.rmtree(run_dir, ignore_errors=True)
+        return BatchRunResult(
+            index=index,
+            energy_and_peak=None,
+            err_text=e.stderr if isinstance(e, EnergyPlusTimeoutError) else None,
+            overheating_results=None,
+            output_dir=run_dir if ctx.keep_outputs else None,
+            error=traceback.format_exc(),
+            elapsed=time.perf_counter() - start,
+            timeout=e.timeout if isinstance(e, EnergyPlusTimeoutError) else None,
+        )
+
+    if not ctx.keep_outputs:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    return BatchRunResult(
+        index=index,
+        energy_and_peak=r.energy_and_peak,
+        err_text=r.err_text,
+        overheating_results=r.overheating_results,
+        output_dir=r.output_dir if ctx.keep_outputs else None,
+        error=None,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def run_many(
+    models: Iterable[BatchModel],
+    max_workers: int | None = None,
+    weather_dir: Path | None = None,
+    scratch_dir: Path | None = None,
+    overheating_config: OverheatingAnalysisConfig | None = None,
+    keep_outputs: bool = False,
+    result_cache: ResultCache | None = None,
+    build_caches: BuildCaches | None = None,
+    cost_model: RuntimeCostModel | None = None,
+    limits: RunLimits | None = None,
+) -> Iterator[BatchRunResult]:
+    """Run many models over a process pool, yielding results as they complete.
+
+    Each worker process gets its own scratch directory under `scratch_dir` and
+    shares the weather cache in `weather_dir`, which is populated up front so
+    that workers never download the same weather file concurrently.  A model
+    which fails produces a result with `error` set instead of stopping the
+    batch.  A worker which dies breaks its pool, so the models it
+    interrupted are resubmitted to a new pool, and only the model which
+    crashed the worker is reported as failed.
+
+    If a cost model is provided, the models are submitted longest first, so
+    that no worker is left with a long run once the others have finished.
+
+    Args:
+        models (Iterable[BatchModel]): The models to run; `FlatModel`s are converted inside the worker.
+        max_workers (int | None): The number of worker processes.  Defaults to the number of CPUs.
+        weather_dir (Path | None): The weather cache directory.  Defaults to the shared artifact cache.
+        scratch_dir (Path | None): The parent of the per-worker scratch directories.  If None, a temporary directory is used.
+        overheating_config (OverheatingAnalysisConfig | None): Configuration for overheating analysis. Skips if None.
+        keep_outputs (bool): Whether to keep the EnergyPlus outputs of each model in the scratch directory.  Requires a `scratch_dir`.
+        result_cache (ResultCache | None): A result cache shared by the workers.  Skips if None.
+        build_caches (BuildCaches | None): Build caches shared by the workers.  Skips if None.
+        cost_model (RuntimeCostModel | None): The cost model to order the submissions with.  Submits the models in order if None.
+        limits (RunLimits | None): The wall-clock and CPU-time limits of each EnergyPlus run, with an optional retry fidelity.  Unlimited if None.
+
+    Yields:
+        result (BatchRunResult): The result of each model, in completion order.
+
+    Raises:
+        ValueError: If outputs are kept without a scratch directory to keep them in.
+    """
+    if keep_outputs and scratch_dir is None:
+        msg = "keep_outputs requires a scratch_dir, since the temporary scratch directory is removed when the batch finishes."
+        raise ValueError(msg)
+    models = list(models)
+    weather_dir = weather_dir or EnergyPlusArtifactDir / "cache" / "weather"
+    prefetch_weather(models, weather_dir)
+    order = submission_order(
+        models,
+        cost_model,
+        plan_outputs(
+            energyplus_settings.archetypal_energyplus_version.major,
+            overheating=overheating_config is not None,
+        ),
+    )
+
+    with tempfile.TemporaryDirectory(prefix="epinterface-batch-") as temp_dir:
+        scratch_root = scratch_dir or Path(temp_dir)
+        scratch_root.mkdir(parents=True, exist_ok=True)
+
+        def run_pool(
+            indices: list[int], workers: int | None
+        ) -> Iterator[tuple[int, Future[BatchRunResult]]]:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(scratch_root, weather_dir, keep_outputs),
+            )
+            try:
+                futures: dict[Future[BatchRunResult], int] = {
+                    executor.submit(
+                        run_model_in_worker,
+                        i,
+                        models[i],
+                        overheating_config,
+                        result_cache,
+                        build_caches,
+                        limits,
+                    ): i
+                    for i in indices
+                }
+                for future in as_completed(futures):
+                    yield futures[future], future
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        # a worker which dies breaks the whole pool and every model still
+        # queued on it, so the interrupted models are resubmitted to a new
+        # pool; if that pool breaks too, the remaining models run one per
+        # pool, so that a crash only fails the model which caused it
+        pending = order
+        for attempt in range(3):
+            isolated = attempt == 2
+            crashed: set[int] = set()
+            workers = 1 if isolated else max_workers
+            for indices in [[i] for i in pending] if isolated else [pending]:
+                for index, future in run_pool(indices, workers):
+                    if not isolated and isinstance(
+                        future.exception(), BrokenProcessPool
+                    ):
+                        crashed.add(index)
+                    else:
+                        yield _result_from_future(future, index)
+            if not crashed:
+                break
+            pending = [i for i in pending if i in crashed]
+            logger.warning(
+                f"A worker process crashed; resubmitting {len(pending)} models."
+            )
+
+
+def _result_from_future(future: Future[BatchRunResult], index: int) -> BatchRunResult:
+    """Unwrap a future, converting pool-level failures into a failed result.
+
+    Args:
+        future (Future[BatchRunResult]): The completed future.
+        index (int): The position of the model in the batch.
+
+    Returns:
+        result (BatchRunResult): The result of the model run.
+    """
+    try:
+        return future.result()
+    except Exception as e:
+        logger.exception(f"Worker for model {index} failed.")
+        return BatchRunResult(
+            index=index,
+            energy_and_peak=None,
+            err_text=None,
+            overheating_results=None,
+            output_dir=None,
+            error=f"{type(e).__name__}: {e}",
+            elapsed=0.0,
+        )
+
+
+@dataclass
+class BuiltModel:
+    """A model which has been built and staged for EnergyPlus, but not yet simulated."""
+
+    index: int
+    model: Model
+    run: EnergyPlusRun
+    zone_weights: NDArray[np.float64]
+    zone_names: list[str]
+    ep_version_major: int
+    sizing_entry: tuple[SizingCache, str] | None = None
+    autosized: frozenset[tuple[str, str]] = frozenset()
+    features: RunFeatures | None = None
+    simulate_seconds: float | None = None
+
+
+def build_model_for_pipeline(
+    index: int,
+    model: BatchModel,
+    weather_dir: Path,
+    model_dir: Path,
+    build_caches: BuildCaches | None = None,
+    output_plan: OutputPlan | None = None,
+    energyplus_threads: int | None = None,
+) -> BuiltModel:
+    """Build a model and stage it for EnergyPlus (the first pipeline stage).
+
+    Everything the later stages need from the IDF is extracted here, so
+    that the IDF itself never has to leave the build worker.
+
+    Args:
+        index (int): The position of the model in the batch.
+        model (BatchModel): The model to build.
+        weather_dir (Path): The weather cache directory.
+        model_dir (Path): The working directory for this model.
+        build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+        output_plan (OutputPlan | None): The outputs for EnergyPlus to write.  Defaults to the outputs read by every analysis.
+        energyplus_threads (int | None): The number of OpenMP threads EnergyPlus may use.  Defaults to the configured number of threads.
+
+    Returns:
+        built (BuiltModel): The staged model.
+    """
+    if isinstance(model, FlatModel):
+        sbem_model, post_geometry_callback = model.to_model()
+        cache_salt = model.post_geometry_cache_salt
+    else:
+        sbem_model, post_geometry_callback = model, None
+        cache_salt = None
+    config = SimulationPathConfig(
+        output_dir=model_dir / "eplus_simulation",
+        weather_dir=weather_dir,
+    )
+    idf, sized_from_cache = sbem_model.build_sized(
+        config,
+        post_geometry_callback,
+        build_caches=build_caches,
+        cache_salt=cache_salt,
+        output_plan=output_plan,
+    )
+    if not idf.as_version:
+        msg = f"EnergyPlus version not found in IDF file: {idf.idfobjects['VERSION']}"
+        raise ValueError(msg)
+    zone_weights, zone_names = sbem_model.get_zone_weights_and_names(idf)
+    return BuiltModel(
+        index=index,
+        model=sbem_model,
+        run=EnergyPlusRun.Prepare(idf, threads=energyplus_threads),
+        zone_weights=zone_weights,
+        zone_names=zone_names,
+        ep_version_major=idf.as_version.major,
+        sizing_entry=None
+        if sized_from_cache
+        else sbem_model.sizing_cache_entry(
+            weather_dir, build_caches, post_geometry_callback, cache_salt
+        ),
+        autosized=autosized_ideal_loads(idf),
+        features=RunFeatures.FromIDF(idf),
+    )
+
+
+def simulate_built_model(
+    built: BuiltModel, limits: RunLimits | None = None
+) -> BuiltModel:
+    """Run EnergyPlus for a staged model (the second pipeline stage).
+
+    Args:
+        built (BuiltModel): The staged model.
+        limits (RunLimits | None): The wall-clock and CPU-time limits of the run.  Unlimited if None.
+
+    Returns:
+        built (BuiltModel): The same model, now with results in its simulation directory.
+
+    Raises:
+        EnergyPlusTimeoutError: If EnergyPlus exceeded its limits.
+    """
+    start = time.perf_counter()
+    built.run.run(limits)
+    built.simulate_seconds = time.perf_counter() - start
+    return built
+
+
+def postprocess_built_model(
+    built: BuiltModel,
+    overheating_config: OverheatingAnalysisConfig | None = None,
+) -> BatchRunResult:
+    """Postprocess a simulated model (the third pipeline stage).
+
+    Args:
+        built (BuiltModel): The simulated model.
+        overheating_config (OverheatingAnalysisConfig | None): Configuration for overheating analysis. Skips if None.
+
+    Returns:
+        result (BatchRunResult): The result of the model run.
+    """
+    start = time.perf_counter()
+    sql = Sql(built.run.sql_path.as_posix())
+    record_sizing(sql, built.sizing_entry, built.autosized)
+    results, overheating_results = built.model.postprocess_sql(
+        sql,
+        zone_weights=built.zone_weights,
+        zone_names=built.zone_names,
+        ep_version_major=built.ep_version_major,
+        overheating_config=overheating_config,
+    )
+    err_text = "\n".join([
+        f.read_text() for f in sorted(built.run.simulation_dir.glob("*.err"))
+    ])
+    return BatchRunResult(
+        index=built.index,
+        energy_and_peak=results,
+        err_text=err_text,
+        overheating_results=overheating_results,
+        output_dir=built.run.simulation_dir.parent,
+        error=None,
+        elapsed=0.0,
+        features=built.features,
+        simulate_seconds=built.simulate_seconds,
+        postprocess_seconds=time.perf_counter() - start,
+        peak_memory=built.run.peak_memory,
+    )
+
+
+def record_runtime(runtime_log: RuntimeLog, result: BatchRunResult) -> None:
+    """Record the runtime of a batch run, if it succeeded and its stages were timed.
+
+    Args:
+        runtime_log (RuntimeLog): The log to record the run in.
+        result (BatchRunResult): The result of the run.
+    """
+    if (
+        not result.succeeded
+        or result.features is None
+        or result.simulate_seconds is None
+        or result.postprocess_seconds is None
+    ):
+        return
+    runtime_log.append([
+        RecordedRun(
+            features=result.features,
+            simulate_seconds=result.simulate_seconds,
+            postprocess_seconds=result.postprocess_seconds,
+        )
+    ])
+
+
+def run_pipelined(  # noqa: C901
+    models: Iterable[BatchModel],
+    build_workers: int = 1,
+    simulate_workers: int | None = None,
+    postprocess_workers: int = 1,
+    queue_size: int | None = None,
+    weather_dir: Path | None = None,
+    scratch_dir: Path | None = None,
+    overheating_config: OverheatingAnalysisConfig | None = None,
+    keep_outputs: bool = False,
+    build_caches: BuildCaches | None = None,
+    cost_model: RuntimeCostModel | None = None,
+    runtime_log: RuntimeLog | None = None,
+    concurrency: ConcurrencyController | None = None,
+    limits: RunLimits | None = None,
+) -> Iterator[BatchRunResult]:
+    """Run many models through separate build, simulate and postprocess stages.
+
+    Building (Python-bound) and postprocessing (pandas-bound) run in their
+    own process pools, while EnergyPlus runs are launched from a thread pool,
+    so that building model N+1 and postprocessing model N-1 overlap with
+    EnergyPlus running model N.  The hand-offs between stages are bounded
+    queues: builds stop being scheduled once `queue_size` staged models are
+    waiting for EnergyPlus, and simulations stop being scheduled once
+    `queue_size` results are waiting for postprocessing.
+
+    A model which fails produces a result with `error` set instead of
+    stopping the batch.  A build or postprocess worker which dies breaks its
+    pool, so the pool is restarted and the models it interrupted are
+    resubmitted, each running alone in its stage, so that only the model
+    which crashed the worker is reported as failed.
+
+    If a cost model is provided, the models are built longest first.  If a
+    runtime log is provided, the features and stage timings of every
+    successful run are appended to it, to calibrate cost models from.
+
+    If a concurrency controller is provided, it replaces `simulate_workers`:
+    the number of concurrent EnergyPlus runs follows the controller's limit,
+    which it adapts to the CPU utilization, the available memory and the
+    peak memory of the finished runs, and each run is limited to the
+    controller's number of EnergyPlus threads.
+
+    Args:
+        models (Iterable[BatchModel]): The models to run; `FlatModel`s are converted inside the build workers.
+        build_workers (int): The number of build processes.
+        simulate_workers (int | None): The number of concurrent EnergyPlus processes.  Defaults to the number of CPUs.
+        postprocess_workers (int): The number of postprocessing processes.
+        queue_size (int | None): The capacity of each inter-stage queue.  Defaults to `simulate_workers`.
+        weather_dir (Path | None): The weather cache directory.  Defaults to the shared artifact cache.
+        scratch_dir (Path | None): The parent of the per-model working directories.  If None, a temporary directory is used.
+        overheating_config (OverheatingAnalysisConfig | None): Configuration for overheating analysis. Skips if None.
+        keep_outputs (bool): Whether to keep the EnergyPlus outputs of each model in the scratch directory.  Requires a `scratch_dir`.
+        build_caches (BuildCaches | None): Build caches shared by the build workers.  Skips if None.
+        cost_model (RuntimeCostModel | None): The cost model to order the builds with.  Builds the models in order if None.
+        runtime_log (RuntimeLog | None): The log to record the runtimes of successful runs in.  Skips if None.
+        concurrency (ConcurrencyController | None): The controller which sets the number of concurrent EnergyPlus runs.  Uses `simulate_workers` if None.
+        limits (RunLimits | None): The wall-clock and CPU-time limits of each EnergyPlus run.  Unlimited if None.  Timed out models are not retried.
+
+    Yields:
+        result (BatchRunResult): The result of each model, in completion order.
+
+    Raises:
+        ValueError: If outputs are kept without a scratch directory to keep them in.
+    """
+    if keep_outputs and scratch_dir is None:
+        msg = "keep_outputs requires a scratch_dir, since the temporary scratch directory is removed when the batch finishes."
+        raise ValueError(msg)
+    if concurrency is not None:
+        simulate_workers = concurrency.max_workers
+    simulate_workers = simulate_workers or os.cpu_count() or 1
+    energyplus_threads = concurrency.energyplus_threads if concurrency else None
+    queue_size = queue_size or simulate_workers
+    output_plan = plan_outputs(
+        energyplus_settings.archetypal_energyplus_version.major,
+        overheating=overheating_config is not None,
+    )
+    models = list(models)
+    weather_dir = weather_dir or EnergyPlusArtifactDir / "cache" / "weather"
+    prefetch_weather(models, weather_dir)
+
+    pending = deque(
+        (i, models[i]) for i in submission_order(models, cost_model, output_plan)
+    )
+    to_simulate: deque[BuiltModel] = deque()
+    to_postprocess: deque[BuiltModel] = deque()
+    started: dict[int, float] = {}
+    stage_of: dict[Future, tuple[str, int]] = {}
+    # the model behind each process pool future, to resubmit it after a crash
+    submitted: dict[
+        Future, tuple[ProcessPoolExecutor, BatchModel | BuiltModel]
+    ] = {}
+    # models interrupted by a crashed worker, which are rerun alone in their stage
+    suspects: set[int] = set()
+    pool_workers = {"build": build_workers, "postprocess": postprocess_workers}
+    pools = {
+        stage: ProcessPoolExecutor(max_workers=workers)
+        for stage, workers in pool_workers.items()
+    }
+
+    with (
+        tempfile.TemporaryDirectory(prefix="epinterface-batch-") as temp_dir,
+        ThreadPoolExecutor(max_workers=simulate_workers) as simulate_pool,
+    ):
+        scratch_root = scratch_dir or Path(temp_dir)
+        scratch_root.mkdir(parents=True, exist_ok=True)
+
+        def model_dir(index: int) -> Path:
+            return scratch_root / f"model-{index:06d}"
+
+        def finish(result: BatchRunResult) -> BatchRunResult:
+            if not keep_outputs:
+                shutil.rmtree(model_dir(result.index), ignore_errors=True)
+            if runtime_log is not None:
+                record_runtime(runtime_log, result)
+            return replace(
+                result,
+                output_dir=result.output_dir if keep_outputs else None,
+                elapsed=time.perf_counter() - started.pop(result.index),
+            )
+
+        def in_flight(stage: str) -> int:
+            return sum(1 for s, _ in stage_of.values() if s == stage)
+
+        def can_submit(stage: str, index: int) -> bool:
+            # a suspect runs alone, so that a crash can only be its own
+            if any(s == stage and i in suspects for s, i in stage_of.values()):
+                return False
+            return index not in suspects or in_flight(stage) == 0
+
+        def restart(stage: str, broken: ProcessPoolExecutor) -> None:
+            if pools[stage] is broken:
+                logger.warning(f"A {stage} worker crashed; restarting its pool.")
+                broken.shutdown(wait=False, cancel_futures=True)
+                pools[stage] = ProcessPoolExecutor(max_workers=pool_workers[stage])
+
+        def submit(
+            stage: str,
+            index: int,
+            item: BatchModel | BuiltModel,
+            fn: Callable[..., object],
+            *args: object,
+        ) -> None:
+            pool = pools[stage]
+            try:
+                future = pool.submit(fn, *args)
+            except BrokenProcessPool:
+                # the futures of the broken pool are resubmitted when collected
+                restart(stage, pool)
+                pool = pools[stage]
+                future = pool.submit(fn, *args)
+            stage_of[future] = (stage, index)
+            submitted[future] = (pool, item)
+
+        try:
+            while pending or to_simulate or to_postprocess or stage_of:
+                while (
+                    pending
+                    and in_flight("build") < build_workers
+                    and in_flight("build") + len(to_simulate) < queue_size
+                    and can_submit("build", pending[0][0])
+                ):
+                    index, model = pending.popleft()
+                    started.setdefault(index, time.perf_counter())
+                    submit(
+                        "build",
+                        index,
+                        model,
+                        build_model_for_pipeline,
+                        index,
+                        model,
+                        weather_dir,
+                        model_dir(index),
+                        build_caches,
+                        output_plan,
+                        energyplus_threads,
+                    )
+                simulate_limit = (
+                    concurrency.update(in_flight("simulate"))
+                    if concurrency is not None
+                    else simulate_workers
+                )
+                while (
+                    to_simulate
+                    and in_flight("simulate") < simulate_limit
+                    and in_flight("simulate") + len(to_postprocess) < queue_size
+                ):
+                    built = to_simulate.popleft()
+                    future = simulate_pool.submit(simulate_built_model, built, limits)
+                    stage_of[future] = ("simulate", built.index)
+                while (
+                    to_postprocess
+                    and in_flight("postprocess") < postprocess_workers
+                    and can_submit("postprocess", to_postprocess[0].index)
+                ):
+                    built = to_postprocess.popleft()
+                    submit(
+                        "postprocess",
+                        built.index,
+                        built,
+                        postprocess_built_model,
+                        built,
+                        overheating_config,
+                    )
+
+                # with a controller, wake up to resample even if no stage finishes
+                done, _ = wait(
+                    list(stage_of),
+                    timeout=concurrency.interval if concurrency is not None else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    stage, index = stage_of.pop(future)
+                    pool, item = submitted.pop(future, (None, None))
+                    exc = future.exception()
+                    if isinstance(exc, BrokenProcessPool) and pool is not None:
+                        restart(stage, pool)
+                        if index not in suspects:
+                            # a worker died, perhaps running another model
+                            logger.warning(
+                                f"Model {index} was interrupted during {stage} by a "
+                                "crashed worker; resubmitting it."
+                            )
+                            suspects.add(index)
+                            if isinstance(item, BuiltModel):
+                                to_postprocess.appendleft(item)
+                            else:
+                                pending.appendleft((index, models[index]))
+                            continue
+                    if exc is not None:
+                        suspects.discard(index)
+                        logger.error(f"Model {index} failed during {stage}: {exc}")
+                        yield finish(
+                            BatchRunResult(
+                                index=index,
+                                energy_and_peak=None,
+                                err_text=getattr(exc, "stderr", None),
+                                overheating_results=None,
+                                output_dir=model_dir(index),
+                                error="".join(traceback.format_exception(exc)),
+                                elapsed=0.0,
+                                timeout=exc.timeout
+                                if isinstance(exc, EnergyPlusTimeoutError)
+                                else None,
+                            )
+                        )
+                        continue
+                    suspects.discard(index)
+                    if stage == "build":
+                        to_simulate.append(future.result())
+                    elif stage == "simulate":
+                        built = future.result()
+                        if concurrency is not None:
+                            concurrency.record_run(built.run.peak_memory)
+                        to_postprocess.append(built)
+                    else:
+                        yield finish(future.result())
+        finally:
+            for future in stage_of:
+                future.cancel()
+            for pool in pools.values():
+                pool.shutdown(wait=True, cancel_futures=True)
@@ -1,5 +1,6 @@
 """A module for building the energy model using the SBEM template library approach."""
 
+import asyncio
 import gc
 import io
 import logging
@@ -8,10 +9,10 @@ import shutil
 import sys
 import tempfile
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Literal, cast, get_args
+from typing import Any, Literal, cast, get_args
 from uuid import uuid4
 
 import numpy as np
@@ -23,25 +24,59 @@ from ladybug.epw import EPW
 from numpy.typing import NDArray
 from pydantic import BaseModel, Field, field_validator, model_validator
 
-from epinterface.analysis.energy_and_peak import DESIRED_METERS_FOR_VERSION
+from epinterface.analysis.design_loads import DesignLoads, design_loads_postprocess
+from epinterface.analysis.design_loads import (
+    required_outputs as design_loads_outputs,
+)
+from epinterface.analysis.energy_and_peak import (
+    required_outputs as energy_and_peak_outputs,
+)
 from epinterface.analysis.energy_and_peak import (
     standard_results_postprocess as energy_and_peak_postprocess,
 )
+from epinterface.analysis.outputs import OutputPlan
 from epinterface.analysis.overheating import (
     OverheatingAnalysisConfig,
     OverheatingAnalysisResults,
     overheating_results_postprocess,
 )
+from epinterface.analysis.overheating import (
+    required_outputs as overheating_outputs,
+)
+from epinterface.analysis.representative_days import (
+    RepresentativeDays,
+    RepresentativeDaysConfig,
+)
+from epinterface.cache import canonical_hash, epinterface_version, file_hash
 from epinterface.constants import assumed_constants, physical_constants
 from epinterface.data import EnergyPlusArtifactDir
 from epinterface.ddy_injector_bayes import DDYSizingSpec
+from epinterface.executor import (
+    EnergyPlusTimeoutError,
+    EnergyPlusWorkerPool,
+    RunLimits,
+    SimulationTimeout,
+    asimulate_idf,
+    simulate_idf,
+)
 from epinterface.geometry import ShoeboxGeometry, get_zone_floor_area
 from epinterface.interface import (
+    FIDELITY_PROFILES,
+    FidelityProfile,
     InternalMass,
     SiteGroundTemperature,
     ZoneList,
     add_default_schedules,
     add_default_sim_controls,
+    set_sizing_only_sim_controls,
+)
+from epinterface.sbem.cache import (
+    BuildCaches,
+    CachedRunResults,
+    IdealLoadsSizing,
+    ResultCache,
+    SizingCache,
+    autosized_ideal_loads,
 )
 from epinterface.sbem.components.composer import (
     construct_composer_model,
@@ -61,15 +96,23 @@ from epinterface.weather import BaseWeather
 
 logger = logging.getLogger(__name__)
 
-# TODO: add the meters for HVAC systems
-AvailableHourlyVariables = Literal[
-    "Zone Mean Air Temperature",
-    "Zone Air Relative Humidity",
-    "Site Outdoor Air Drybulb Temperature",
-    "Zone Mean Radiant Temperature",
-]
-
-AVAILABLE_HOURLY_VARIABLES = get_args(AvailableHourlyVariables)
+_POSTPROCESSING_ONLY_SYSTEM_FIELDS = {"Name", "Fuel", "SystemCOP", "DistributionCOP"}
+
+# the model fields which only affect postprocessing, and so never the sizing
+SIZING_INDEPENDENT_FIELDS: dict[str, Any] = {
+    "Weather": True,
+    "Zone": {
+        "Operations": {
+            "HVAC": {
+                "ConditioningSystems": {
+                    "Heating": _POSTPROCESSING_ONLY_SYSTEM_FIELDS,
+                    "Cooling": _POSTPROCESSING_ONLY_SYSTEM_FIELDS,
+                }
+            },
+            "DHW": {"FuelType", "SystemCOP", "DistributionCOP"},
+        }
+    },
+}
 
 
 class SimulationPathConfig(BaseModel):
@@ -568,6 +611,10 @@ class Model(BaseWeather, validate_assignment=True):
     Basement: BasementAssumptions
     # TODO: should we have another field for whether or not the attic is ventilated, i.e. high infiltration?
     Zone: ZoneComponent
+    Fidelity: FidelityProfile = Field(
+        default="standard",
+        description="The named accuracy/runtime trade-off for the simulation settings.",
+    )
 
     @field_validator("geometry", mode="after")
     @classmethod
@@ -590,6 +637,10 @@ class Model(BaseWeather, validate_assignment=True):
     def total_conditioned_area(self) -> float:
         """The total conditioned area of the model.
 
+        This is the area of the whole building, including any stories which
+        are represented by the middle storey's zone multiplier, which matches
+        the (multiplied) meters that results are normalized from.
+
         Returns:
             area (float): The total conditioned area of the model.
         """
@@ -726,7 +777,7 @@ class Model(BaseWeather, validate_assignment=True):
         # safety check for zone counts
         # attic never gets partitioned so it only ever contributes 1
         # to the conditioned storey count
-        conditioned_storey_count = self.geometry.num_stories + (
+        conditioned_storey_count = self.geometry.modeled_stories + (
             1 if self.Basement.Conditioned else 0
         )
         zones_per_storey = self.geometry.zones_per_storey
@@ -822,71 +873,216 @@ class Model(BaseWeather, validate_assignment=True):
 
         return idf
 
-    def build(  # noqa: C901
+    def build(
         self,
         config: SimulationPathConfig,
         post_geometry_callback: Callable[[IDF], IDF] | None = None,
+        build_caches: BuildCaches | None = None,
+        cache_salt: str | None = None,
+        output_plan: OutputPlan | None = None,
     ) -> IDF:
         """Build the energy model using the Climate Studio API.
 
+        If a built IDF cache is provided, the serialized IDF is looked up by
+        the model fingerprint and rehydrated on a hit, skipping the build
+        entirely.  As with the result cache, builds with a post-geometry
+        callback are only cached when a `cache_salt` describing it is provided.
+
+        If a sizing cache is provided and holds the sizes recorded by an
+        earlier run of a model which sizes identically, the ideal loads are
+        hard-sized from it and the sizing periods are disabled.
+
         Args:
             config (SimulationConfig): The configuration for the simulation.
             post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            cache_salt (str | None): Extra text to include in the cache keys, e.g. a description of the post-geometry callback.
+            output_plan (OutputPlan | None): The outputs for EnergyPlus to write.  Defaults to the outputs read by every analysis.
 
         Returns:
             idf (IDF): The built energy model.
         """
+        idf, _ = self.build_sized(
+            config,
+            post_geometry_callback,
+            build_caches=build_caches,
+            cache_salt=cache_salt,
+            output_plan=output_plan,
+        )
+        return idf
+
+    def build_sized(
+        self,
+        config: SimulationPathConfig,
+        post_geometry_callback: Callable[[IDF], IDF] | None = None,
+        build_caches: BuildCaches | None = None,
+        cache_salt: str | None = None,
+        output_plan: OutputPlan | None = None,
+    ) -> tuple[IDF, bool]:
+        """Build the energy model, reporting whether it was hard-sized from the sizing cache.
+
+        Runs which were hard-sized did not autosize anything, so their sizes
+        must not be recorded, even if the entry they were sized from has
+        since been evicted.  An entry which does not size every autosized
+        field of the model is discarded, and the model is autosized instead.
+
+        Args:
+            config (SimulationConfig): The configuration for the simulation.
+            post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            cache_salt (str | None): Extra text to include in the cache keys, e.g. a description of the post-geometry callback.
+            output_plan (OutputPlan | None): The outputs for EnergyPlus to write.  Defaults to the outputs read by every analysis.
+
+        Returns:
+            idf (IDF): The built energy model.
+            sized_from_cache (bool): Whether the ideal loads were hard-sized from the sizing cache.
+        """
+        if output_plan is None:
+            output_plan = default_output_plan()
+        idf = self._build_cached(
+            config, post_geometry_callback, build_caches, cache_salt, output_plan
+        )
+        sizing_entry = self.sizing_cache_entry(
+            config.weather_dir, build_caches, post_geometry_callback, cache_salt
+        )
+        if sizing_entry is not None:
+            sizing_cache, sizing_key = sizing_entry
+            sizing = sizing_cache.get(sizing_key)
+            if sizing is not None and sizing.covers(autosized_ideal_loads(idf)):
+                logger.info(f"Sizing cache hit: {sizing_key}")
+                return sizing.apply(idf), True
+            if sizing is not None:
+                logger.warning(
+                    f"Discarding sizing cache entry {sizing_key}, which does not "
+                    "size every autosized ideal loads field."
+                )
+                sizing_cache.path_for(sizing_key).unlink(missing_ok=True)
+        return idf, False
+
+    def _build_cached(
+        self,
+        config: SimulationPathConfig,
+        post_geometry_callback: Callable[[IDF], IDF] | None,
+        build_caches: BuildCaches | None,
+        cache_salt: str | None,
+        output_plan: OutputPlan,
+    ) -> IDF:
+        """Build the energy model, or rehydrate it from the built IDF cache.
+
+        Args:
+            config (SimulationConfig): The configuration for the simulation.
+            post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            cache_salt (str | None): Extra text to include in the cache keys, e.g. a description of the post-geometry callback.
+            output_plan (OutputPlan): The outputs for EnergyPlus to write.
+
+        Returns:
+            idf (IDF): The built energy model.
+        """
+        idf_cache = build_caches.idf if build_caches is not None else None
+        if idf_cache is None:
+            return self._build(
+                config, post_geometry_callback, build_caches, output_plan
+            )
+        if post_geometry_callback is not None and cache_salt is None:
+            logger.warning(
+                "Skipping the built IDF cache: a post-geometry callback was "
+                "provided without a cache salt describing it."
+            )
+            return self._build(
+                config, post_geometry_callback, build_caches, output_plan
+            )
+
+        cache_key = self.build_cache_key(
+            config.weather_dir, cache_salt=cache_salt, output_plan=output_plan
+        )
+        serialized = idf_cache.get(cache_key)
+        if serialized is not None:
+            logger.info(f"Built IDF cache hit: {cache_key}")
+            config.output_dir.mkdir(parents=True, exist_ok=True)
+            epw_path, _ = self.fetch_weather(config.weather_dir)
+            return serialized.to_idf(epw_path, config.output_dir)
+
+        idf = self._build(config, post_geometry_callback, build_caches, output_plan)
+        idf_cache.put(cache_key, idf)
+        return idf
+
+    def prototype(
+        self,
+        config: SimulationPathConfig,
+        build_caches: BuildCaches | None = None,
+        output_plan: OutputPlan | None = None,
+    ) -> IDF:
+        """Create the base IDF which every model sharing a weather file starts from.
+
+        The prototype holds the parsed `Minimal.idf`, the output requests, the
+        design days from the DDY file, the simulation controls and the default
+        schedules.  If a prototype cache is provided, the prototype is looked
+        up by the weather files, EnergyPlus version, output plan and fidelity, and a
+        fresh copy is rehydrated from it instead of being rebuilt.
+
+        Args:
+            config (SimulationConfig): The configuration for the simulation.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            output_plan (OutputPlan | None): The outputs for EnergyPlus to write.  Defaults to the outputs read by every analysis.
+
+        Returns:
+            idf (IDF): A new prototype IDF, owned by the caller.
+        """
+        if output_plan is None:
+            output_plan = default_output_plan()
         config.output_dir.mkdir(parents=True, exist_ok=True)
+        prototype_cache = build_caches.prototype if build_caches is not None else None
+        if prototype_cache is None:
+            return self._build_prototype(config, output_plan)
+
+        epw_path, ddy_path = self.fetch_weather(config.weather_dir)
+        cache_key = canonical_hash({
+            "artifact": "prototype",
+            "energyplus_version": energyplus_settings.energyplus_version,
+            "epinterface_version": epinterface_version(),
+            "epw": file_hash(epw_path),
+            "ddy": file_hash(ddy_path),
+            "outputs": output_plan.model_dump(mode="json"),
+            "fidelity": FIDELITY_PROFILES[self.Fidelity].model_dump(mode="json"),
+        })
+        serialized = prototype_cache.get(cache_key)
+        if serialized is not None:
+            return serialized.to_idf(epw_path, config.output_dir)
+
+        idf = self._build_prototype(config, output_plan)
+        prototype_cache.put(cache_key, idf)
+        return idf
+
+    def _build_prototype(
+        self, config: SimulationPathConfig, output_plan: OutputPlan
+    ) -> IDF:
+        """Build the prototype IDF from the base files.
+
+        archetypal's own output preparation is skipped, since it adds dozens of
+        meters and variables that nothing reads; the output plan is applied instead.
+
+        Args:
+            config (SimulationConfig): The configuration for the simulation.
+            output_plan (OutputPlan): The outputs for EnergyPlus to write.
+
+        Returns:
+            idf (IDF): The prototype IDF.
+        """
         base_filepath = EnergyPlusArtifactDir / "Minimal.idf"
         target_base_filepath = config.output_dir / "Minimal.idf"
         shutil.copy(base_filepath, target_base_filepath)
         epw_path, ddy_path = self.fetch_weather(config.weather_dir)
         ep_version = energyplus_settings.archetypal_energyplus_version
-        desired_meters = DESIRED_METERS_FOR_VERSION[ep_version.major]
-        output_meters = (
-            [
-                {
-                    "key": "OUTPUT:METER",
-                    "Key_Name": meter,
-                    "Reporting_Frequency": "Monthly",
-                }
-                for meter in desired_meters
-            ]
-            + [
-                {
-                    "key": "OUTPUT:METER",
-                    "Key_Name": meter,
-                    "Reporting_Frequency": "Hourly",
-                }
-                for meter in desired_meters
-            ]
-            + [
-                {
-                    "key": "OUTPUT:VARIABLE",
-                    "Key_Value": "*",
-                    "Variable_Name": variable,
-                    "Reporting_Frequency": "Hourly",
-                }
-                for variable in AVAILABLE_HOURLY_VARIABLES
-            ]
-        )
         idf = IDF(
             target_base_filepath.as_posix(),
             as_version=ep_version.dot,
             file_version=ep_version.dot,
-            prep_outputs=output_meters,  # pyright: ignore [reportArgumentType]
+            prep_outputs=False,
             epw=epw_path.as_posix(),
             output_directory=config.output_dir.as_posix(),
         )
-
-        # Remove undesired outputs from the IDF file.
-        # TODO: test the perfrmance benefits, if any
-        for output in idf.idfobjects["OUTPUT:METER"]:
-            if output.Key_Name not in desired_meters:
-                idf.removeidfobject(output)
-        for output in idf.idfobjects["OUTPUT:VARIABLE"]:
-            if output.Variable_Name not in AVAILABLE_HOURLY_VARIABLES:
-                idf.removeidfobject(output)
+        idf = output_plan.apply(idf)
 
         ddy = IDF(
             ddy_path.as_posix(),
@@ -899,10 +1095,34 @@ class Model(BaseWeather, validate_assignment=True):
         )
         ddy_spec.inject_ddy(idf, ddy)
 
-        idf = add_default_sim_controls(idf)
+        idf = add_default_sim_controls(idf, FIDELITY_PROFILES[self.Fidelity])
         idf, _scheds = add_default_schedules(idf)
+        return idf
 
-        idf = self.geometry.add(idf)
+    def _build(  # noqa: C901
+        self,
+        config: SimulationPathConfig,
+        post_geometry_callback: Callable[[IDF], IDF] | None = None,
+        build_caches: BuildCaches | None = None,
+        output_plan: OutputPlan | None = None,
+    ) -> IDF:
+        """Build the energy model from its prototype.
+
+        Args:
+            config (SimulationConfig): The configuration for the simulation.
+            post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            output_plan (OutputPlan | None): The outputs for EnergyPlus to write.  Defaults to the outputs read by every analysis.
+
+        Returns:
+            idf (IDF): The built energy model.
+        """
+        idf = self.prototype(config, build_caches=build_caches, output_plan=output_plan)
+        epw_path, _ = self.fetch_weather(config.weather_dir)
+
+        idf = self.geometry.add(
+            idf, cache=build_caches.geometry if build_caches is not None else None
+        )
         if post_geometry_callback is not None:
             idf = post_geometry_callback(idf)
 
@@ -1049,20 +1269,60 @@ class Model(BaseWeather, validate_assignment=True):
         self,
         config: SimulationPathConfig,
         post_geometry_callback: Callable[[IDF], IDF] | None = None,
+        build_caches: BuildCaches | None = None,
+        cache_salt: str | None = None,
+        output_plan: OutputPlan | None = None,
+        representative_days: RepresentativeDays | None = None,
+        limits: RunLimits | None = None,
+        worker_pool: EnergyPlusWorkerPool | None = None,
     ) -> tuple[IDF, Sql]:
         """Build and simualte the idf model.
 
         Args:
             config (SimulationConfig): The configuration for the simulation.
             post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            cache_salt (str | None): Extra text to include in the cache keys, e.g. a description of the post-geometry callback.
+            output_plan (OutputPlan | None): The outputs for EnergyPlus to write.  Defaults to the outputs read by every analysis.
+            representative_days (RepresentativeDays | None): The days to simulate instead of the whole year.  Simulates the whole year if None.
+            limits (RunLimits | None): The wall-clock and CPU-time limits of the EnergyPlus run.  Unlimited if None.
+            worker_pool (EnergyPlusWorkerPool | None): The in-process workers to run EnergyPlus on.  Uses the configured executor if None.
 
         Returns:
             idf (IDF): The built energy model.
             sql (Sql): The sql results file with simulation data.
+
+        Raises:
+            EnergyPlusTimeoutError: If EnergyPlus exceeds its limits.
         """
-        idf = self.build(config, post_geometry_callback)
-        idf.simulate()
-        sql = Sql(idf.sql_file)
+        if output_plan is None:
+            output_plan = default_output_plan()
+        idf, sized_from_cache = self.build_sized(
+            config,
+            post_geometry_callback,
+            build_caches=build_caches,
+            cache_salt=cache_salt,
+            output_plan=output_plan,
+        )
+        if representative_days is not None:
+            idf = representative_days.apply(idf)
+        # ReadVarsESO converts the .eso file to csv, which is only written when all files are kept
+        sql_path = simulate_idf(
+            idf,
+            readvars=output_plan.keep_all_files,
+            limits=limits,
+            worker_pool=worker_pool,
+        )
+        sql = Sql(sql_path.as_posix())
+        record_sizing(
+            sql,
+            None
+            if sized_from_cache
+            else self.sizing_cache_entry(
+                config.weather_dir, build_caches, post_geometry_callback, cache_salt
+            ),
+            autosized_ideal_loads(idf),
+        )
         return idf, sql
 
     def get_warnings(self, idf: IDF) -> str:
@@ -1082,7 +1342,11 @@ class Model(BaseWeather, validate_assignment=True):
         return err_text
 
     def standard_results_postprocess(
-        self, sql: Sql, ep_version_major: int
+        self,
+        sql: Sql,
+        ep_version_major: int,
+        representative_days: RepresentativeDays | None = None,
+        meters: dict[str, str] | None = None,
     ) -> pd.Series:
         """Postprocess the sql file to get the standard results.
 
@@ -1090,9 +1354,14 @@ class Model(BaseWeather, validate_assignment=True):
         - Aggregation: "Raw", "End Uses", "Utilities"
         - Meter: ["Electricity", "Cooling", "Heating", "Domestic Hot Water"], ["Electricity", "Propane", ...]
 
+        The tabular cross-check only covers the facility meters, so it is
+        skipped when other meters are read.
+
         Args:
             sql (Sql): The sql file to postprocess.
             ep_version_major (int): The major version of EnergyPlus.
+            representative_days (RepresentativeDays | None): The representative days which were simulated instead of the whole year, if any.
+            meters (dict[str, str] | None): The meters to read, mapped to the standard column names.  Defaults to the facility meters.
 
         Returns:
             series (pd.Series): The postprocessed results.
@@ -1121,6 +1390,10 @@ class Model(BaseWeather, validate_assignment=True):
             dhw_fuel=dhw_fuel,
             all_fuel_names=all_fuel_names,
             ep_version_major=ep_version_major,
+            tabular_cross_check=energyplus_settings.tabular_cross_check
+            and meters is None,
+            representative_days=representative_days,
+            meters=meters,
         )
 
     def run(
@@ -1129,18 +1402,57 @@ class Model(BaseWeather, validate_assignment=True):
         post_geometry_callback: Callable[[IDF], IDF] | None = None,
         eplus_parent_dir: Path | None = None,
         overheating_config: OverheatingAnalysisConfig | None = None,
+        result_cache: ResultCache | None = None,
+        cache_salt: str | None = None,
+        build_caches: BuildCaches | None = None,
+        representative_days: RepresentativeDaysConfig | None = None,
+        limits: RunLimits | None = None,
+        worker_pool: EnergyPlusWorkerPool | None = None,
     ) -> "ModelRunResults":
         """Build and simualte the idf model.
 
+        If a result cache is provided, the results are looked up by a hash of
+        the model, the EnergyPlus version, the weather file contents and the
+        overheating configuration, and EnergyPlus is skipped entirely on a hit
+        (in which case the returned `idf` and `sql` are None).  Since a
+        post-geometry callback cannot be hashed, runs with a callback are only
+        cached when a `cache_salt` describing the callback is provided.
+
+        If representative days are requested, the days of the weather file
+        are clustered and only one day per cluster is simulated, as its own
+        run period.  The annual energy and peaks are then reconstructed by
+        weighting each day by the size of its cluster, which trades some
+        accuracy (mostly in the peaks) for a much shorter simulation.
+
+        If limits are provided, EnergyPlus is killed once it exceeds them and
+        an `EnergyPlusTimeoutError` describing the timeout (with the partial
+        error file) is raised.  If the limits name a retry fidelity, the model
+        is first retried once at that fidelity, with the limits scaled by their
+        `retry_scale`, and the timeout of the first attempt is returned in
+        `retried_after`.
+
         Args:
             weather_dir (Path): The directory to store the weather files.
             post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
             eplus_parent_dir (Path | None): The parent directory to store the eplus working directory.  If None, a temporary directory will be used.
             overheating_config (OverheatingAnalysisConfig | None): Configuration for overheating analysis. Skips if None.
+            result_cache (ResultCache | None): The cache to look up and store results in.  Skips if None.
+            cache_salt (str | None): Extra text to include in the cache keys, e.g. a description of the post-geometry callback.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            representative_days (RepresentativeDaysConfig | None): How to select representative days to simulate instead of the whole year.  Simulates the whole year if None.
+            limits (RunLimits | None): The wall-clock and CPU-time limits of the EnergyPlus run.  Unlimited if None.
+            worker_pool (EnergyPlusWorkerPool | None): The in-process workers to run EnergyPlus on.  Uses the configured executor if None.
 
         Returns:
             ModelRunResults: The results of the model run.
+
+        Raises:
+            ValueError: If representative days are combined with the overheating analysis, which needs the full hourly timeseries.
+            EnergyPlusTimeoutError: If EnergyPlus exceeds its limits (at the retry fidelity, if any).
         """
+        if representative_days is not None and overheating_config is not None:
+            msg = "The overheating analysis cannot be run on representative days."
+            raise ValueError(msg)
         with tempfile.TemporaryDirectory() as output_dir_name:
             output_dir = (
                 Path(output_dir_name)
@@ -1157,48 +1469,497 @@ class Model(BaseWeather, validate_assignment=True):
                 else SimulationPathConfig(output_dir=output_dir)
             )
 
-            idf, sql = self.simulate(
+            cache_key = None
+            if result_cache is not None:
+                if post_geometry_callback is not None and cache_salt is None:
+                    logger.warning(
+                        "Skipping the result cache: a post-geometry callback was "
+                        "provided without a cache salt describing it."
+                    )
+                else:
+                    cache_key = self.result_cache_key(
+                        config.weather_dir,
+                        overheating_config=overheating_config,
+                        cache_salt=cache_salt,
+                        representative_days=representative_days,
+                    )
+                    cached = result_cache.get(cache_key)
+                    if cached is not None:
+                        logger.info(f"Result cache hit: {cache_key}")
+                        return ModelRunResults(
+                            idf=None,
+                            sql=None,
+                            energy_and_peak=cached.energy_and_peak,
+                            err_text=cached.err_text,
+                            output_dir=None,
+                            overheating_results=cached.overheating_results,
+                        )
+
+            days = (
+                representative_days.select(self.fetch_weather(config.weather_dir)[0])
+                if representative_days is not None
+                else None
+            )
+            try:
+                idf, sql = self.simulate(
+                    config,
+                    post_geometry_callback=post_geometry_callback,
+                    build_caches=build_caches,
+                    cache_salt=cache_salt,
+                    output_plan=plan_outputs(
+                        energyplus_settings.archetypal_energyplus_version.major,
+                        overheating=overheating_config is not None,
+                    ),
+                    representative_days=days,
+                    limits=limits,
+                    worker_pool=worker_pool,
+                )
+            except EnergyPlusTimeoutError as e:
+                if limits is None or limits.retry_fidelity in (None, self.Fidelity):
+                    raise
+                logger.warning(
+                    f"Retrying at {limits.retry_fidelity} fidelity after a timeout: {e}"
+                )
+                retried = self.model_copy(
+                    update={"Fidelity": limits.retry_fidelity}
+                ).run(
+                    weather_dir=weather_dir,
+                    post_geometry_callback=post_geometry_callback,
+                    eplus_parent_dir=eplus_parent_dir,
+                    overheating_config=overheating_config,
+                    result_cache=result_cache,
+                    cache_salt=cache_salt,
+                    build_caches=build_caches,
+                    representative_days=representative_days,
+                    limits=limits.for_retry(),
+                    worker_pool=worker_pool,
+                )
+                return replace(retried, retried_after=e.timeout)
+            # if eplus_parent_dir is not None, we return the path to the output directory
+            results = self.postprocess_run(
+                idf,
+                sql,
+                output_dir=output_dir if eplus_parent_dir is not None else None,
+                overheating_config=overheating_config,
+                representative_days=days,
+            )
+            if result_cache is not None and cache_key is not None:
+                result_cache.put(
+                    cache_key,
+                    CachedRunResults(
+                        energy_and_peak=results.energy_and_peak,
+                        err_text=results.err_text,
+                        overheating_results=results.overheating_results,
+                    ),
+                )
+            return results
+
+    def size(
+        self,
+        weather_dir: Path | None = None,
+        post_geometry_callback: Callable[[IDF], IDF] | None = None,
+        eplus_parent_dir: Path | None = None,
+        build_caches: BuildCaches | None = None,
+        cache_salt: str | None = None,
+    ) -> DesignLoads:
+        """Build the idf model and run only its zone sizing to get the design loads.
+
+        No weather file run period is simulated, so this takes a fraction of
+        the time of `run`.  The sizing cache is never used, since hard-sized
+        models do not run the zone sizing calculation.
+
+        Args:
+            weather_dir (Path): The directory to store the weather files.
+            post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
+            eplus_parent_dir (Path | None): The parent directory to store the eplus working directory.  If None, a temporary directory will be used.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            cache_salt (str | None): Extra text to include in the cache keys, e.g. a description of the post-geometry callback.
+
+        Returns:
+            DesignLoads: The zone and building design loads.
+        """
+        with tempfile.TemporaryDirectory() as output_dir_name:
+            output_dir = (
+                Path(output_dir_name)
+                if eplus_parent_dir is None
+                else eplus_parent_dir / "eplus_simulation"
+            )
+            output_dir.mkdir(parents=True, exist_ok=True)
+            config = (
+                SimulationPathConfig(
+                    output_dir=output_dir,
+                    weather_dir=weather_dir,
+                )
+                if weather_dir is not None
+                else SimulationPathConfig(output_dir=output_dir)
+            )
+            output_plan = design_loads_outputs() | OutputPlan(
+                keep_all_files=energyplus_settings.keep_all_output_files
+            )
+            idf = self.build(
                 config,
-                post_geometry_callback=post_geometry_callback,
+                post_geometry_callback,
+                build_caches=build_caches.model_copy(update={"sizing": None})
+                if build_caches is not None
+                else None,
+                cache_salt=cache_salt,
+                output_plan=output_plan,
             )
-            if not idf.as_version:
-                msg = f"EnergyPlus version not found in IDF file: {idf.idfobjects['VERSION']}"
-                raise ValueError(msg)
-            results = self.standard_results_postprocess(
-                sql, ep_version_major=idf.as_version.major
+            idf = set_sizing_only_sim_controls(idf)
+            sql_path = simulate_idf(idf, readvars=output_plan.keep_all_files)
+            return design_loads_postprocess(
+                Sql(sql_path.as_posix()),
+                normalizing_floor_area=self.total_conditioned_area,
+                err_text=self.get_warnings(idf),
             )
-            zone_weights, zone_names = self.get_zone_weights_and_names(idf)
-
-            overheating_results = (
-                overheating_results_postprocess(
-                    sql,
-                    zone_weights=zone_weights,
-                    zone_names=zone_names,
-                    config=overheating_config,
+
+    def result_cache_key(
+        self,
+        weather_dir: Path,
+        overheating_config: OverheatingAnalysisConfig | None = None,
+        cache_salt: str | None = None,
+        representative_days: RepresentativeDaysConfig | None = None,
+    ) -> str:
+        """Compute the result cache key for the model.
+
+        The key covers everything which determines the results: the model
+        fingerprint, the overheating configuration and, for runs of
+        representative days, how the days are selected.
+
+        Args:
+            weather_dir (Path): The directory to store the weather files.
+            overheating_config (OverheatingAnalysisConfig | None): Configuration for overheating analysis.
+            cache_salt (str | None): Extra text to include in the key.
+            representative_days (RepresentativeDaysConfig | None): How representative days are selected, if only they are simulated.
+
+        Returns:
+            key (str): The cache key.
+        """
+        return canonical_hash({
+            **self.fingerprint(weather_dir, cache_salt=cache_salt),
+            "overheating_config": overheating_config.model_dump(mode="json")
+            if overheating_config is not None
+            else None,
+            # full-year runs keep the keys they had before representative days existed
+            **(
+                {"representative_days": representative_days.model_dump(mode="json")}
+                if representative_days is not None
+                else {}
+            ),
+        })
+
+    def build_cache_key(
+        self,
+        weather_dir: Path,
+        cache_salt: str | None = None,
+        output_plan: OutputPlan | None = None,
+    ) -> str:
+        """Compute the built IDF cache key for the model.
+
+        The built model also depends on the configured ideal loads backend.
+
+        Args:
+            weather_dir (Path): The directory to store the weather files.
+            cache_salt (str | None): Extra text to include in the key.
+            output_plan (OutputPlan | None): The outputs written by the built model.
+
+        Returns:
+            key (str): The cache key.
+        """
+        return canonical_hash({
+            **self.fingerprint(weather_dir, cache_salt=cache_salt),
+            "artifact": "idf",
+            "outputs": output_plan.model_dump(mode="json")
+            if output_plan is not None
+            else None,
+            "ideal_loads_backend": energyplus_settings.ideal_loads_backend,
+        })
+
+    def sizing_cache_key(self, weather_dir: Path, cache_salt: str | None = None) -> str:
+        """Compute the sizing cache key for the model.
+
+        This is the model fingerprint without the fields which are only used
+        when postprocessing (system efficiencies and fuels), so that sweeps
+        over them share the sizes recorded by the first run.
+
+        Args:
+            weather_dir (Path): The directory to store the weather files.
+            cache_salt (str | None): Extra text to include in the key.
+
+        Returns:
+            key (str): The cache key.
+        """
+        return canonical_hash({
+            **self.fingerprint(weather_dir, cache_salt=cache_salt),
+            "model": self.model_dump(mode="json", exclude=SIZING_INDEPENDENT_FIELDS),
+            "artifact": "sizing",
+        })
+
+    def sizing_cache_entry(
+        self,
+        weather_dir: Path,
+        build_caches: BuildCaches | None,
+        post_geometry_callback: Callable[[IDF], IDF] | None = None,
+        cache_salt: str | None = None,
+    ) -> tuple[SizingCache, str] | None:
+        """The sizing cache and key to record or reuse the model's sizes with.
+
+        As with the other caches, models with a post-geometry callback are
+        only cached when a `cache_salt` describing it is provided.
+
+        Args:
+            weather_dir (Path): The directory to store the weather files.
+            build_caches (BuildCaches | None): The caches to consult while building.
+            post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
+            cache_salt (str | None): Extra text to include in the key.
+
+        Returns:
+            entry (tuple[SizingCache, str] | None): The sizing cache and key, or None if sizes are not cached.
+        """
+        sizing_cache = build_caches.sizing if build_caches is not None else None
+        if sizing_cache is None:
+            return None
+        if post_geometry_callback is not None and cache_salt is None:
+            return None
+        return sizing_cache, self.sizing_cache_key(weather_dir, cache_salt=cache_salt)
+
+    def fingerprint(
+        self, weather_dir: Path, cache_salt: str | None = None
+    ) -> dict[str, Any]:
+        """Describe everything which determines the built model.
+
+        This covers the model definition (excluding the weather location,
+        which is replaced by the weather file contents) and the EnergyPlus and
+        epinterface versions.
+
+        Args:
+            weather_dir (Path): The directory to store the weather files.
+            cache_salt (str | None): Extra text to include in the fingerprint.
+
+        Returns:
+            fingerprint (dict[str, Any]): A JSON-serializable description of the model.
+        """
+        epw_path, ddy_path = self.fetch_weather(weather_dir)
+        return {
+            "model": self.model_dump(mode="json", exclude={"Weather"}),
+            "energyplus_version": energyplus_settings.energyplus_version,
+            "epinterface_version": epinterface_version(),
+            "epw": file_hash(epw_path),
+            "ddy": file_hash(ddy_path),
+            "salt": cache_salt,
+        }
+
+    async def asimulate(
+        self,
+        config: SimulationPathConfig,
+        post_geometry_callback: Callable[[IDF], IDF] | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+        build_caches: BuildCaches | None = None,
+        cache_salt: str | None = None,
+        output_plan: OutputPlan | None = None,
+    ) -> tuple[IDF, Sql]:
+        """Build and simulate the idf model without blocking the event loop.
+
+        The model is built in a worker thread and EnergyPlus is launched as
+        an asyncio subprocess.  If a semaphore is provided, it is held only
+        while EnergyPlus is running, which bounds the number of concurrent
+        simulations without limiting concurrent builds.
+
+        Args:
+            config (SimulationConfig): The configuration for the simulation.
+            post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
+            semaphore (asyncio.Semaphore | None): A semaphore bounding concurrent EnergyPlus processes.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            cache_salt (str | None): Extra text to include in the cache keys, e.g. a description of the post-geometry callback.
+            output_plan (OutputPlan | None): The outputs for EnergyPlus to write.  Defaults to the outputs read by every analysis.
+
+        Returns:
+            idf (IDF): The built energy model.
+            sql (Sql): The sql results file with simulation data.
+        """
+        idf, sized_from_cache = await asyncio.to_thread(
+            self.build_sized,
+            config,
+            post_geometry_callback,
+            build_caches=build_caches,
+            cache_salt=cache_salt,
+            output_plan=output_plan,
+        )
+        if semaphore is None:
+            await asimulate_idf(idf)
+        else:
+            async with semaphore:
+                await asimulate_idf(idf)
+        sql = Sql(idf.sql_file)
+        record_sizing(
+            sql,
+            None
+            if sized_from_cache
+            else self.sizing_cache_entry(
+                config.weather_dir, build_caches, post_geometry_callback, cache_salt
+            ),
+            autosized_ideal_loads(idf),
+        )
+        return idf, sql
+
+    async def arun(
+        self,
+        weather_dir: Path | None = None,
+        post_geometry_callback: Callable[[IDF], IDF] | None = None,
+        eplus_parent_dir: Path | None = None,
+        overheating_config: OverheatingAnalysisConfig | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+        build_caches: BuildCaches | None = None,
+        cache_salt: str | None = None,
+    ) -> "ModelRunResults":
+        """Build and simulate the idf model as a coroutine.
+
+        This mirrors `run`, but EnergyPlus is awaited as an asyncio subprocess
+        and the build and postprocessing steps run in worker threads, so that
+        one event loop can drive many simulations at once.
+
+        Args:
+            weather_dir (Path): The directory to store the weather files.
+            post_geometry_callback (Callable[[IDF],IDF] | None): A callback to run after the geometry is added.
+            eplus_parent_dir (Path | None): The parent directory to store the eplus working directory.  If None, a temporary directory will be used.
+            overheating_config (OverheatingAnalysisConfig | None): Configuration for overheating analysis. Skips if None.
+            semaphore (asyncio.Semaphore | None): A semaphore bounding concurrent EnergyPlus processes.
+            build_caches (BuildCaches | None): The caches to consult while building.  Skips if None.
+            cache_salt (str | None): Extra text to include in the cache keys, e.g. a description of the post-geometry callback.
+
+        Returns:
+            ModelRunResults: The results of the model run.
+        """
+        with tempfile.TemporaryDirectory() as output_dir_name:
+            output_dir = (
+                Path(output_dir_name)
+                if eplus_parent_dir is None
+                else eplus_parent_dir / "eplus_simulation"
+            )
+            output_dir.mkdir(parents=True, exist_ok=True)
+            config = (
+                SimulationPathConfig(
+                    output_dir=output_dir,
+                    weather_dir=weather_dir,
                 )
-                if overheating_config is not None
-                else None
+                if weather_dir is not None
+                else SimulationPathConfig(output_dir=output_dir)
             )
 
-            err_text = self.get_warnings(idf)
+            idf, sql = await self.asimulate(
+                config,
+                post_geometry_callback=post_geometry_callback,
+                semaphore=semaphore,
+                build_caches=build_caches,
+                cache_salt=cache_salt,
+                output_plan=plan_outputs(
+                    energyplus_settings.archetypal_energyplus_version.major,
+                    overheating=overheating_config is not None,
+                ),
+            )
+            return await asyncio.to_thread(
+                self.postprocess_run,
+                idf,
+                sql,
+                output_dir=output_dir if eplus_parent_dir is not None else None,
+                overheating_config=overheating_config,
+            )
 
-            gc.collect()
-            # if eplus_parent_dir is not None, we return the path to the output directory
-            output_dir_result = output_dir if eplus_parent_dir is not None else None
-
-            return ModelRunResults(
-                idf=idf,
-                sql=sql,
-                energy_and_peak=results,
-                err_text=err_text,
-                output_dir=output_dir_result,
-                overheating_results=overheating_results,
+    def postprocess_run(
+        self,
+        idf: IDF,
+        sql: Sql,
+        output_dir: Path | None,
+        overheating_config: OverheatingAnalysisConfig | None = None,
+        representative_days: RepresentativeDays | None = None,
+    ) -> "ModelRunResults":
+        """Postprocess a simulated idf model into the run results.
+
+        Args:
+            idf (IDF): The simulated IDF model.
+            sql (Sql): The sql results file with simulation data.
+            output_dir (Path | None): The output directory to report in the results.
+            overheating_config (OverheatingAnalysisConfig | None): Configuration for overheating analysis. Skips if None.
+            representative_days (RepresentativeDays | None): The representative days which were simulated instead of the whole year, if any.
+
+        Returns:
+            ModelRunResults: The results of the model run.
+        """
+        if not idf.as_version:
+            msg = (
+                f"EnergyPlus version not found in IDF file: {idf.idfobjects['VERSION']}"
+            )
+            raise ValueError(msg)
+        zone_weights, zone_names = self.get_zone_weights_and_names(idf)
+        results, overheating_results = self.postprocess_sql(
+            sql,
+            zone_weights=zone_weights,
+            zone_names=zone_names,
+            ep_version_major=idf.as_version.major,
+            overheating_config=overheating_config,
+            representative_days=representative_days,
+        )
+
+        err_text = self.get_warnings(idf)
+
+        gc.collect()
+
+        return ModelRunResults(
+            idf=idf,
+            sql=sql,
+            energy_and_peak=results,
+            err_text=err_text,
+            output_dir=output_dir,
+            overheating_results=overheating_results,
+        )
+
+    def postprocess_sql(
+        self,
+        sql: Sql,
+        zone_weights: NDArray[np.float64],
+        zone_names: list[str],
+        ep_version_major: int,
+        overheating_config: OverheatingAnalysisConfig | None = None,
+        representative_days: RepresentativeDays | None = None,
+    ) -> tuple[pd.Series, OverheatingAnalysisResults | None]:
+        """Postprocess the sql file without needing the IDF model.
+
+        Args:
+            sql (Sql): The sql results file with simulation data.
+            zone_weights (NDArray[np.float64]): The weights of the zones.
+            zone_names (list[str]): The names of the zones.
+            ep_version_major (int): The major version of EnergyPlus.
+            overheating_config (OverheatingAnalysisConfig | None): Configuration for overheating analysis. Skips if None.
+            representative_days (RepresentativeDays | None): The representative days which were simulated instead of the whole year, if any.
+
+        Returns:
+            energy_and_peak (pd.Series): The postprocessed energy and peak results.
+            overheating_results (OverheatingAnalysisResults | None): The overheating results, if requested.
+        """
+        results = self.standard_results_postprocess(
+            sql,
+            ep_version_major=ep_version_major,
+            representative_days=representative_days,
+        )
+        overheating_results = (
+            overheating_results_postprocess(
+                sql,
+                zone_weights=zone_weights,
+                zone_names=zone_names,
+                config=overheating_config,
             )
+            if overheating_config is not None
+            else None
+        )
+        return results, overheating_results
 
     @staticmethod
     def get_zone_weights_and_names(idf: IDF) -> tuple[NDArray[np.float64], list[str]]:
         """Get the zone weights and names from the idf model.
 
+        Each zone is weighted by its floor area times its zone multiplier, so
+        that a representative storey counts once for every storey it stands in for.
+
         Args:
             idf (IDF): The idf model to get the zone weights and names from.
 
@@ -1210,7 +1971,8 @@ class Model(BaseWeather, validate_assignment=True):
         zone_names: list[str] = []
         for zone in idf.idfobjects["ZONE"]:
             floor_area = get_zone_floor_area(idf, zone.Name)
-            zone_weights_.append(floor_area)
+            multiplier = float(zone.Multiplier or 1)
+            zone_weights_.append(floor_area * multiplier)
             zone_names.append(zone.Name)
         zone_weights: NDArray[np.float64] = np.array(zone_weights_)
         return zone_weights, zone_names
@@ -1288,16 +2050,84 @@ def construct_zone_def(
     return zone
 
 
+# TODO: add the meters for HVAC systems
+def plan_outputs(ep_version_major: int, overheating: bool) -> OutputPlan:
+    """The outputs read by the analyses which will postprocess a run.
+
+    Args:
+        ep_version_major (int): The major version of EnergyPlus.
+        overheating (bool): Whether the overheating analysis will run.
+
+    Returns:
+        plan (OutputPlan): The outputs for EnergyPlus to write.
+    """
+    plan = energy_and_peak_outputs(
+        ep_version_major, tabular_cross_check=energyplus_settings.tabular_cross_check
+    )
+    if overheating:
+        plan = plan | overheating_outputs()
+    return plan.model_copy(
+        update={"keep_all_files": energyplus_settings.keep_all_output_files}
+    )
+
+
+def record_sizing(
+    sql: Sql,
+    sizing_entry: tuple[SizingCache, str] | None,
+    autosized: frozenset[tuple[str, str]],
+) -> None:
+    """Record the autosized ideal loads of a simulation.
+
+    A run which was hard-sized from the cache did not autosize anything, so
+    callers pass no entry for it.  Sizes which do not cover every autosized
+    field of the model are never stored, since every later build with the
+    key would fail to apply them.
+
+    Args:
+        sql (Sql): The sql results file of the simulation.
+        sizing_entry (tuple[SizingCache, str] | None): The sizing cache and key to record with.  Skips if None.
+        autosized (frozenset[tuple[str, str]]): The autosized fields of the simulated model, from `autosized_ideal_loads`.
+    """
+    if sizing_entry is None:
+        return
+    sizing_cache, sizing_key = sizing_entry
+    sizing = IdealLoadsSizing.FromSql(sql)
+    if not sizing.covers(autosized):
+        logger.warning(
+            f"Not recording the sizes for {sizing_key}: the simulation did not "
+            "size every autosized ideal loads field."
+        )
+        return
+    sizing_cache.put(sizing_key, sizing)
+
+
+def default_output_plan() -> OutputPlan:
+    """The outputs read by every analysis, for builds which are not told which analyses will run.
+
+    Returns:
+        plan (OutputPlan): The outputs for EnergyPlus to write.
+    """
+    return plan_outputs(
+        energyplus_settings.archetypal_energyplus_version.major, overheating=True
+    )
+
+
 @dataclass
 class ModelRunResults:
-    """The results of a model run."""
+    """The results of a model run.
+
+    The `idf` and `sql` are None when the results were served from a result cache.
+    `retried_after` holds the timeout of the first attempt when the results
+    come from a retry at a cheaper fidelity.
+    """
 
-    idf: IDF
-    sql: Sql
+    idf: IDF | None
+    sql: Sql | None
     energy_and_peak: pd.Series
     err_text: str
     output_dir: Path | None
     overheating_results: OverheatingAnalysisResults | None = None
+    retried_after: SimulationTimeout | None = None
 
 
 if __name__ == "__main__":
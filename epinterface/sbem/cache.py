@@ -0,0 +1,400 @@
+"""Caches for avoiding repeated work when the same SBEM models are run many times."""
+
+import gzip
+import io
+import logging
+import pickle
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+import pandas as pd
+from archetypal.idfclass import IDF
+from archetypal.idfclass.sql import Sql
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
+
+from epinterface.analysis.overheating import OverheatingAnalysisResults
+from epinterface.cache import LRUDirectoryCache
+from epinterface.data import EnergyPlusArtifactDir
+from epinterface.geometry import GeometryCache
+from epinterface.settings import energyplus_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedRunResults:
+    """The parts of a model run which are kept in the result cache."""
+
+    energy_and_peak: pd.Series
+    err_text: str
+    overheating_results: OverheatingAnalysisResults | None = None
+
+
+class ResultCache(LRUDirectoryCache):
+    """A content-addressed cache of postprocessed model run results.
+
+    Entries are pickled, so the cache directory should only ever be shared
+    with trusted processes.
+    """
+
+    cache_dir: Path = Field(
+        default_factory=lambda: EnergyPlusArtifactDir / "cache" / "results",
+        description="The directory to store the cached results in.",
+    )
+
+    suffix: ClassVar[str] = ".pkl"
+
+    def get(self, key: str) -> CachedRunResults | None:
+        """Get the cached results for a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            results (CachedRunResults | None): The cached results, or None on a miss.
+        """
+        data = self.read_bytes(key)
+        if data is None:
+            return None
+        try:
+            results = pickle.loads(data)  # noqa: S301
+        except Exception:
+            logger.warning(f"Discarding unreadable result cache entry {key}")
+            self.path_for(key).unlink(missing_ok=True)
+            return None
+        if not isinstance(results, CachedRunResults):
+            self.path_for(key).unlink(missing_ok=True)
+            return None
+        return results
+
+    def put(self, key: str, results: CachedRunResults) -> None:
+        """Store the results for a key.
+
+        Args:
+            key (str): The cache key.
+            results (CachedRunResults): The results to store.
+        """
+        self.write_bytes(key, pickle.dumps(results))
+
+
+# archetypal's IDF constructor strips or rewrites these objects when outputs
+# are not being prepped, so they are carried alongside the serialized text.
+ARCHETYPAL_MANAGED_OUTPUT_KEYS = ("OUTPUT:SQLITE", "OUTPUTCONTROL:TABLE:STYLE")
+
+
+@dataclass
+class SerializedIDF:
+    """The text of an IDF model, along with the objects needed to faithfully reload it."""
+
+    name: str
+    text: str
+    managed_outputs: list[tuple[str, dict[str, Any]]]
+
+    @classmethod
+    def FromIDF(cls, idf: IDF) -> "SerializedIDF":
+        """Serialize an IDF model.
+
+        Args:
+            idf (IDF): The IDF model to serialize.
+
+        Returns:
+            serialized (SerializedIDF): The serialized model.
+        """
+        managed_outputs = [
+            (
+                key,
+                {field: obj[field] for field in obj.fieldnames[1:] if obj[field] != ""},
+            )
+            for key in ARCHETYPAL_MANAGED_OUTPUT_KEYS
+            for obj in idf.idfobjects[key]
+        ]
+        return cls(name=idf.name, text=idf.idfstr(), managed_outputs=managed_outputs)
+
+    def to_idf(self, epw_path: Path, output_dir: Path) -> IDF:
+        """Rehydrate the IDF model.
+
+        Args:
+            epw_path (Path): The weather file to attach to the model.
+            output_dir (Path): The output directory of the model.
+
+        Returns:
+            idf (IDF): The rehydrated model.
+        """
+        ep_version = energyplus_settings.archetypal_energyplus_version
+        idf = IDF(
+            io.StringIO(self.text),
+            as_version=ep_version.dot,
+            file_version=ep_version.dot,
+            prep_outputs=False,
+            epw=epw_path.as_posix(),
+            output_directory=output_dir.as_posix(),
+            name=self.name,
+        )
+        for key in ARCHETYPAL_MANAGED_OUTPUT_KEYS:
+            for obj in list(idf.idfobjects[key]):
+                idf.removeidfobject(obj)
+        for key, fields in self.managed_outputs:
+            idf.newidfobject(key, **fields)
+        return idf
+
+
+class BuiltIDFCache(LRUDirectoryCache):
+    """A cache of fully built IDF models, keyed by model fingerprint.
+
+    Entries are compressed pickles, so the cache directory should only ever
+    be shared with trusted processes.
+    """
+
+    cache_dir: Path = Field(
+        default_factory=lambda: EnergyPlusArtifactDir / "cache" / "idfs",
+        description="The directory to store the cached IDF models in.",
+    )
+
+    suffix: ClassVar[str] = ".idf.gz"
+
+    def get(self, key: str) -> SerializedIDF | None:
+        """Get the serialized IDF model for a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            serialized (SerializedIDF | None): The serialized model, or None on a miss.
+        """
+        data = self.read_bytes(key)
+        if data is None:
+            return None
+        try:
+            serialized = pickle.loads(gzip.decompress(data))  # noqa: S301
+        except Exception:
+            logger.warning(f"Discarding unreadable IDF cache entry {key}")
+            self.path_for(key).unlink(missing_ok=True)
+            return None
+        if not isinstance(serialized, SerializedIDF):
+            self.path_for(key).unlink(missing_ok=True)
+            return None
+        return serialized
+
+    def put(self, key: str, idf: IDF) -> None:
+        """Store a built IDF model for a key.
+
+        Args:
+            key (str): The cache key.
+            idf (IDF): The built model.
+        """
+        self.write_bytes(key, gzip.compress(pickle.dumps(SerializedIDF.FromIDF(idf))))
+
+
+class PrototypeIDFCache(BuiltIDFCache):
+    """A cache of the base IDF models shared by every model with the same weather file.
+
+    There are only ever a handful of prototypes, so they are also kept in
+    memory once loaded, and each model gets its own rehydrated copy.
+    """
+
+    cache_dir: Path = Field(
+        default_factory=lambda: EnergyPlusArtifactDir / "cache" / "prototypes",
+        description="The directory to store the cached prototype IDF models in.",
+    )
+
+    _loaded: dict[str, SerializedIDF] = PrivateAttr(default_factory=dict)
+
+    def get(self, key: str) -> SerializedIDF | None:
+        """Get the serialized prototype for a key, preferring the in-memory copy.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            serialized (SerializedIDF | None): The serialized prototype, or None on a miss.
+        """
+        if key not in self._loaded:
+            serialized = super().get(key)
+            if serialized is None:
+                return None
+            self._loaded[key] = serialized
+        return self._loaded[key]
+
+    def put(self, key: str, idf: IDF) -> None:
+        """Store a prototype IDF model for a key.
+
+        Args:
+            key (str): The cache key.
+            idf (IDF): The prototype model.
+        """
+        serialized = SerializedIDF.FromIDF(idf)
+        self._loaded[key] = serialized
+        self.write_bytes(key, gzip.compress(pickle.dumps(serialized)))
+
+
+# The autosized ideal loads fields, by the description EnergyPlus reports them with
+IDEAL_LOADS_SIZED_FIELDS = {
+    "Design Size Maximum Heating Air Flow Rate": "Maximum_Heating_Air_Flow_Rate",
+    "Design Size Maximum Sensible Heating Capacity": "Maximum_Sensible_Heating_Capacity",
+    "Design Size Maximum Cooling Air Flow Rate": "Maximum_Cooling_Air_Flow_Rate",
+    "Design Size Maximum Total Cooling Capacity": "Maximum_Total_Cooling_Capacity",
+}
+
+
+def _ideal_loads_systems(idf: IDF) -> list[tuple[str, Any]]:
+    """The ideal loads systems of a model, templates included, by the (upper case) name of the expanded system."""
+    return [
+        # the name ExpandObjects gives the ideal loads system of a template
+        (f"{template.Zone_Name} Ideal Loads Air System".upper(), template)
+        for template in idf.idfobjects["HVACTEMPLATE:ZONE:IDEALLOADSAIRSYSTEM"]
+    ] + [
+        (system.Name.upper(), system)
+        for system in idf.idfobjects["ZONEHVAC:IDEALLOADSAIRSYSTEM"]
+    ]
+
+
+def autosized_ideal_loads(idf: IDF) -> frozenset[tuple[str, str]]:
+    """The autosized fields of the ideal loads systems of a model.
+
+    Args:
+        idf (IDF): The model.
+
+    Returns:
+        autosized (frozenset[tuple[str, str]]): The (upper case) system names and fields which EnergyPlus will size.
+    """
+    return frozenset(
+        (name, field)
+        for name, system in _ideal_loads_systems(idf)
+        for field in IDEAL_LOADS_SIZED_FIELDS.values()
+        if str(system[field]).lower() == "autosize"
+    )
+
+
+class IdealLoadsSizing(BaseModel):
+    """The autosized capacities and airflows of the ideal loads systems in a model."""
+
+    systems: dict[str, dict[str, float]] = Field(
+        default_factory=dict,
+        description="The sized ideal loads field values (shared by the HVACTemplate and native objects), by (upper case) ideal loads system name.",
+    )
+
+    @classmethod
+    def FromSql(cls, sql: Sql) -> "IdealLoadsSizing":
+        """Read the autosized ideal loads values from a simulation's sql file.
+
+        Args:
+            sql (Sql): The sql file of a simulation which ran the sizing periods.
+
+        Returns:
+            sizing (IdealLoadsSizing): The sized values of each ideal loads system.
+        """
+        with closing(sqlite3.connect(sql.file_path)) as conn:
+            rows = conn.execute(
+                "SELECT CompName, Description, Value FROM ComponentSizes "
+                "WHERE CompType = 'ZoneHVAC:IdealLoadsAirSystem'"
+            ).fetchall()
+        systems: dict[str, dict[str, float]] = {}
+        for name, description, value in rows:
+            if description in IDEAL_LOADS_SIZED_FIELDS:
+                systems.setdefault(name.upper(), {})[
+                    IDEAL_LOADS_SIZED_FIELDS[description]
+                ] = value
+        return cls(systems=systems)
+
+    def covers(self, autosized: frozenset[tuple[str, str]]) -> bool:
+        """Whether there is a recorded size for every autosized field.
+
+        Args:
+            autosized (frozenset[tuple[str, str]]): The autosized fields of a model, from `autosized_ideal_loads`.
+
+        Returns:
+            covers (bool): True if the sizes can hard-size the model.
+        """
+        return all(field in self.systems.get(name, {}) for name, field in autosized)
+
+    def apply(self, idf: IDF) -> IDF:
+        """Hard-size the ideal loads systems of a model and disable its sizing periods.
+
+        Args:
+            idf (IDF): The model to hard-size, which must be the model the sizes were recorded from.
+
+        Returns:
+            idf (IDF): The hard-sized model.
+
+        Raises:
+            ValueError: If an autosized field has no recorded size.
+        """
+        for name, system in _ideal_loads_systems(idf):
+            sizes = self.systems.get(name, {})
+            for field in IDEAL_LOADS_SIZED_FIELDS.values():
+                if str(system[field]).lower() != "autosize":
+                    continue
+                if field not in sizes:
+                    msg = f"No recorded size for {field} of {name}."
+                    raise ValueError(msg)
+                system[field] = sizes[field]
+
+        for sim_control in idf.idfobjects["SIMULATIONCONTROL"]:
+            sim_control.Do_Zone_Sizing_Calculation = "No"
+            sim_control.Do_System_Sizing_Calculation = "No"
+            sim_control.Do_Plant_Sizing_Calculation = "No"
+            sim_control.Run_Simulation_for_Sizing_Periods = "No"
+            sim_control.Do_HVAC_Sizing_Simulation_for_Sizing_Periods = "No"
+        return idf
+
+
+class SizingCache(LRUDirectoryCache):
+    """A cache of the autosized ideal loads of models, keyed by everything which affects sizing."""
+
+    cache_dir: Path = Field(
+        default_factory=lambda: EnergyPlusArtifactDir / "cache" / "sizing",
+        description="The directory to store the cached sizes in.",
+    )
+
+    suffix: ClassVar[str] = ".json"
+
+    def get(self, key: str) -> IdealLoadsSizing | None:
+        """Get the recorded sizes for a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            sizing (IdealLoadsSizing | None): The recorded sizes, or None on a miss.
+        """
+        data = self.read_bytes(key)
+        if data is None:
+            return None
+        try:
+            return IdealLoadsSizing.model_validate_json(data)
+        except ValidationError:
+            logger.warning(f"Discarding unreadable sizing cache entry {key}")
+            self.path_for(key).unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, sizing: IdealLoadsSizing) -> None:
+        """Store the recorded sizes for a key.
+
+        Args:
+            key (str): The cache key.
+            sizing (IdealLoadsSizing): The recorded sizes.
+        """
+        self.write_bytes(key, sizing.model_dump_json().encode("utf-8"))
+
+
+class BuildCaches(BaseModel):
+    """The caches consulted while building a model."""
+
+    idf: BuiltIDFCache | None = Field(
+        default=None, description="A cache of fully built IDF models."
+    )
+    prototype: PrototypeIDFCache | None = Field(
+        default=None,
+        description="A cache of the base IDF models shared by every model with the same weather file.",
+    )
+    geometry: GeometryCache | None = Field(
+        default=None,
+        description="A cache of the zones and surfaces created for each distinct shoebox.",
+    )
+    sizing: SizingCache | None = Field(
+        default=None,
+        description="A cache of the autosized ideal loads, reused to skip the sizing periods.",
+    )
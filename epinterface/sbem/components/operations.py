@@ -17,6 +17,7 @@ from epinterface.interface import (
 from epinterface.sbem.common import MetadataMixin, NamedObject
 from epinterface.sbem.components.space_use import ZoneSpaceUseComponent
 from epinterface.sbem.components.systems import DHWComponent, ZoneHVACComponent
+from epinterface.settings import energyplus_settings
 
 logger = getLogger(__name__)
 
@@ -159,6 +160,10 @@ class ZoneOperationsComponent(
     ) -> HVACTemplateThermostat:
         """Add a thermostat to the zone.
 
+        The thermostat is written as an HVACTemplate object, or as the
+        setpoint objects ExpandObjects would create when the native ideal
+        loads backend is configured.
+
         Args:
             idf (IDF): The IDF object to add the thermostat to.
             target_zone_name (str): The name of the zone to add the thermostat to.
@@ -262,12 +267,20 @@ class ZoneOperationsComponent(
             else None,
         )
 
-        idf = thermostat.add(idf)
+        if energyplus_settings.ideal_loads_backend == "native":
+            idf = thermostat.add_native(idf)
+        else:
+            idf = thermostat.add(idf)
 
         return thermostat
 
     def add_conditioning_to_idf_zone(self, idf: IDF, target_zone_name: str) -> IDF:
-        """Add conditioning to an IDF zone."""
+        """Add conditioning to an IDF zone.
+
+        The ideal loads system is written as an HVACTemplate object, or as
+        the native objects ExpandObjects would create when the native ideal
+        loads backend is configured (`EPINTERFACE_IDEAL_LOADS_BACKEND=native`).
+        """
         thermostat = self.add_thermostat_to_idf_zone(idf, target_zone_name)
         if self.HVAC.Ventilation.DCV != "NoDCV":
             # check the design spec outdoor air for the DCV
@@ -306,7 +319,10 @@ class ZoneOperationsComponent(
             or self.HVAC.Ventilation.Provider == "Both"
             else "None",
         )
-        idf = hvac_template.add(idf)
+        if energyplus_settings.ideal_loads_backend == "native":
+            idf = hvac_template.add_native(idf, thermostat)
+        else:
+            idf = hvac_template.add(idf)
 
         if self.HVAC.Ventilation.Provider == "Natural":
             # total_window_area = calculate_window_area_for_zone(idf, target_zone_name)
@@ -0,0 +1,236 @@
+"""Adapt the number of concurrent EnergyPlus runs of a batch to the machine running it.
+
+A fixed number of workers either leaves cores idle on large machines or
+runs out of memory on small ones when several large models run at once.
+The controller samples the run queue and the available memory while a
+batch runs, tracks the peak memory of recent runs, and allows as many
+concurrent runs as fit in memory, backing off while more threads are
+runnable than there are cores and ramping up while cores are idle.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pandas as pd
+import psutil
+
+logger = logging.getLogger(__name__)
+
+MiB = 1024**2
+GiB = 1024**3
+
+
+@dataclass(frozen=True)
+class SystemSample:
+    """The state of the machine when the controller samples it."""
+
+    cpu_percent: float
+    runnable_tasks: float
+    available_memory: int
+
+
+def runnable_tasks() -> float:
+    """The number of threads running or waiting for a core, excluding the caller.
+
+    Reads the instantaneous run queue on Linux, and falls back to the one
+    minute load average elsewhere.
+
+    Returns:
+        runnable (float): The number of runnable threads.
+    """
+    try:
+        for line in Path("/proc/stat").read_text().splitlines():
+            if line.startswith("procs_running"):
+                return max(0.0, float(line.split()[1]) - 1)
+    except OSError:
+        pass
+    return psutil.getloadavg()[0]
+
+
+def sample_system() -> SystemSample:
+    """Sample the CPU utilization since the previous sample, the run queue and the available memory.
+
+    Returns:
+        sample (SystemSample): The state of the machine.
+    """
+    return SystemSample(
+        cpu_percent=psutil.cpu_percent(interval=None),
+        runnable_tasks=runnable_tasks(),
+        available_memory=psutil.virtual_memory().available,
+    )
+
+
+@dataclass(frozen=True)
+class ConcurrencyDecision:
+    """A concurrency limit chosen by the controller, with the measurements it was chosen from."""
+
+    time: float
+    running: int
+    limit: int
+    cpu_percent: float
+    runnable_tasks: float
+    available_memory: int
+    run_memory: int
+    reason: str
+
+
+class ConcurrencyController:
+    """Choose how many EnergyPlus runs of a batch may execute at once.
+
+    The limit is bounded by memory, so that the runs which would start fit
+    in the available memory (less a reserve) at the peak memory of recent
+    runs, and moves one run at a time with the run queue: down while more
+    than `max_load_per_cpu` threads per core are runnable (the CPU is
+    oversubscribed), up while every allowed run is busy and another run's
+    threads would still find idle cores.  A fully busy CPU is the goal, so
+    it alone never lowers the limit.  EnergyPlus is limited to
+    `energyplus_threads` OpenMP threads per run, so that concurrent runs do
+    not each spawn a thread per core for their shading calculations.
+
+    Every sample is recorded as a `ConcurrencyDecision`, and `metrics`
+    returns them as a table.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        min_workers: int = 1,
+        energyplus_threads: int = 1,
+        max_load_per_cpu: float = 1.25,
+        cpu_count: int | None = None,
+        memory_reserve: int = 1 * GiB,
+        default_run_memory: int = 512 * MiB,
+        run_memory_window: int = 20,
+        interval: float = 1.0,
+        sampler: Callable[[], SystemSample] = sample_system,
+    ):
+        """Initialize the controller.
+
+        Args:
+            max_workers (int | None): The most concurrent runs.  Defaults to the number of CPUs divided by the EnergyPlus threads.
+            min_workers (int): The fewest concurrent runs, even when memory or CPU is short.
+            energyplus_threads (int): The number of OpenMP threads each EnergyPlus run may use.
+            max_load_per_cpu (float): The runnable threads per CPU above which the CPU is oversubscribed and the limit is lowered.
+            cpu_count (int | None): The number of CPUs.  Defaults to the number of CPUs of the machine.
+            memory_reserve (int): The memory to leave free for the rest of the machine [bytes].
+            default_run_memory (int): The memory to assume for each run until runs have been observed [bytes].
+            run_memory_window (int): The number of recent runs whose peak memory sets the memory of a run.
+            interval (float): The minimum time between samples [s].
+            sampler (Callable[[], SystemSample]): The function which samples the machine.
+        """
+        if min_workers < 1:
+            msg = f"min_workers must be at least 1, got {min_workers}."
+            raise ValueError(msg)
+        if energyplus_threads < 1:
+            msg = f"energyplus_threads must be at least 1, got {energyplus_threads}."
+            raise ValueError(msg)
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.max_workers = max(
+            min_workers,
+            max_workers or self.cpu_count // energyplus_threads,
+        )
+        self.min_workers = min_workers
+        self.energyplus_threads = energyplus_threads
+        self.max_load_per_cpu = max_load_per_cpu
+        self.memory_reserve = memory_reserve
+        self.default_run_memory = default_run_memory
+        self.interval = interval
+        self.sampler = sampler
+        self.decisions: list[ConcurrencyDecision] = []
+        self._run_memory: deque[int] = deque(maxlen=run_memory_window)
+        self._limit = self.max_workers
+        self._last_sample: float | None = None
+        # the first CPU sample only primes the utilization counters
+        self.sampler()
+
+    @property
+    def limit(self) -> int:
+        """The current number of runs which may execute at once."""
+        return self._limit
+
+    @property
+    def run_memory(self) -> int:
+        """The memory to plan for each run: the peak of the recent runs [bytes]."""
+        return max(self._run_memory, default=self.default_run_memory)
+
+    def record_run(self, peak_memory: int | None) -> None:
+        """Record the peak memory of a finished run.
+
+        Args:
+            peak_memory (int | None): The peak resident memory of the run [bytes].  Ignored if None, e.g. for runs which were not launched as a subprocess.
+        """
+        if peak_memory:
+            self._run_memory.append(peak_memory)
+
+    def update(self, running: int) -> int:
+        """Sample the machine, if the interval has passed, and choose a new limit.
+
+        Args:
+            running (int): The number of runs currently executing.
+
+        Returns:
+            limit (int): The number of runs which may execute at once.
+        """
+        now = time.monotonic()
+        if self._last_sample is not None and now - self._last_sample < self.interval:
+            return self._limit
+        self._last_sample = now
+        sample = self.sampler()
+        run_memory = self.run_memory
+
+        # the running runs already hold their memory, so only the runs which
+        # would start need to fit in what is available
+        spare_memory = max(0, sample.available_memory - self.memory_reserve)
+        memory_limit = running + spare_memory // run_memory
+
+        limit, reason = self._limit, "steady"
+        if sample.runnable_tasks > self.max_load_per_cpu * self.cpu_count:
+            limit, reason = self._limit - 1, "cpu oversubscribed"
+        elif (
+            running >= self._limit
+            and sample.runnable_tasks + self.energyplus_threads <= self.cpu_count
+        ):
+            limit, reason = self._limit + 1, "cpu headroom"
+        if memory_limit < limit:
+            limit, reason = memory_limit, "memory"
+        limit = min(self.max_workers, max(self.min_workers, limit))
+
+        if limit != self._limit:
+            logger.debug(
+                f"Concurrency limit {self._limit} -> {limit} ({reason}): "
+                f"{sample.cpu_percent:.0f}% CPU, "
+                f"{sample.runnable_tasks:.1f} runnable threads, "
+                f"{sample.available_memory / GiB:.1f} GiB available, "
+                f"{run_memory / MiB:.0f} MiB per run."
+            )
+        self._limit = limit
+        self.decisions.append(
+            ConcurrencyDecision(
+                time=now,
+                running=running,
+                limit=limit,
+                cpu_percent=sample.cpu_percent,
+                runnable_tasks=sample.runnable_tasks,
+                available_memory=sample.available_memory,
+                run_memory=run_memory,
+                reason=reason,
+            )
+        )
+        return limit
+
+    def metrics(self) -> pd.DataFrame:
+        """The decisions of the controller, one row per sample.
+
+        Returns:
+            metrics (pd.DataFrame): The decisions, with the time since the first sample [s] as the index.
+        """
+        columns = list(ConcurrencyDecision.__dataclass_fields__)
+        df = pd.DataFrame([asdict(d) for d in self.decisions], columns=columns)
+        if not df.empty:
+            df["time"] = df["time"] - df["time"].iloc[0]
+        return df.set_index("time")
@@ -0,0 +1,323 @@
+"""Predict the runtime of model runs, so that batches can schedule the longest runs first.
+
+The runtime of EnergyPlus grows with the number of zones and surfaces whose
+heat balance is solved at every timestep, and with the number of values
+written to the outputs; postprocessing grows with the outputs it reads.
+Shading surfaces are not modeled: the models of a batch are shoeboxes
+without any, so a shading term could never be estimated before a run.
+The cost model is linear in those terms, and is calibrated from recorded
+runs on the machine which will run the batch.
+"""
+
+import json
+import logging
+import math
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+from archetypal.idfclass import IDF
+from pydantic import BaseModel, Field
+
+from epinterface.analysis.outputs import OutputPlan
+from epinterface.data import EnergyPlusArtifactDir
+from epinterface.geometry import ShoeboxGeometry
+from epinterface.interface import SimulationFidelity
+
+logger = logging.getLogger(__name__)
+
+HOURS_PER_YEAR = 8760
+
+# the number of values a single output series writes in a year, by
+# reporting frequency, with timestep outputs per hour of timesteps
+VALUES_PER_YEAR = {
+    "Hourly": HOURS_PER_YEAR,
+    "Daily": 365,
+    "Monthly": 12,
+    "RunPeriod": 1,
+    "Annual": 1,
+}
+
+# a shoebox zone has four walls, a floor and a ceiling, and the attic has
+# four roof surfaces over the ceilings of the top storey
+SURFACES_PER_ZONE = 6
+ATTIC_ROOF_SURFACES = 4
+# one window per facade and storey
+WINDOWS_PER_STOREY = 4
+
+
+class RunFeatures(BaseModel, frozen=True):
+    """The properties of a model which drive the runtime of its run."""
+
+    zones: int = Field(..., ge=0, description="The number of zones.")
+    surfaces: int = Field(
+        ..., ge=0, description="The number of heat transfer surfaces and windows."
+    )
+    timesteps_per_hour: int = Field(
+        ..., ge=1, description="The number of zone timesteps per hour."
+    )
+    output_values: int = Field(
+        ..., ge=0, description="The number of output values written in a year."
+    )
+
+    @classmethod
+    def FromIDF(cls, idf: IDF) -> "RunFeatures":
+        """Count the features of a built IDF model.
+
+        Args:
+            idf (IDF): The IDF model.
+
+        Returns:
+            features (RunFeatures): The features of the model.
+        """
+        timesteps = idf.idfobjects["TIMESTEP"]
+        # EnergyPlus defaults to 6 timesteps per hour
+        timesteps_per_hour = (
+            int(timesteps[0].Number_of_Timesteps_per_Hour) if timesteps else 6
+        )
+        zones = len(idf.idfobjects["ZONE"])
+        series = [
+            (meter.Reporting_Frequency, 1) for meter in idf.idfobjects["OUTPUT:METER"]
+        ] + [
+            (variable.Reporting_Frequency, zones if variable.Key_Value == "*" else 1)
+            for variable in idf.idfobjects["OUTPUT:VARIABLE"]
+        ]
+        return cls(
+            zones=zones,
+            surfaces=len(idf.getsurfaces()) + len(idf.getsubsurfaces()),
+            timesteps_per_hour=timesteps_per_hour,
+            output_values=sum(
+                output_values(frequency, timesteps_per_hour) * keys
+                for frequency, keys in series
+            ),
+        )
+
+    @classmethod
+    def Estimate(
+        cls,
+        geometry: ShoeboxGeometry,
+        fidelity: SimulationFidelity,
+        output_plan: OutputPlan,
+    ) -> "RunFeatures":
+        """Estimate the features of a model from its geometry, without building it.
+
+        The counts match the shoebox which the geometry adds to a model, so
+        estimates and counts from built models can be mixed freely.
+
+        Args:
+            geometry (ShoeboxGeometry): The geometry of the model.
+            fidelity (SimulationFidelity): The accuracy/runtime settings of the model.
+            output_plan (OutputPlan): The outputs the model will write.
+
+        Returns:
+            features (RunFeatures): The estimated features of the model.
+        """
+        zones_per_storey = geometry.zones_per_storey
+        storey_zones = zones_per_storey * (
+            geometry.modeled_stories + geometry.basement_storey_count
+        )
+        attic_zones = geometry.attic_storey_count
+        zones = storey_zones + attic_zones
+        surfaces = (
+            SURFACES_PER_ZONE * storey_zones
+            + attic_zones * (ATTIC_ROOF_SURFACES + zones_per_storey)
+            + (WINDOWS_PER_STOREY * geometry.modeled_stories if geometry.wwr > 0 else 0)
+        )
+        timesteps_per_hour = fidelity.timesteps_per_hour
+        series = [(meter.frequency, 1) for meter in output_plan.meters] + [
+            (variable.frequency, zones if variable.key == "*" else 1)
+            for variable in output_plan.variables
+        ]
+        return cls(
+            zones=zones,
+            surfaces=surfaces,
+            timesteps_per_hour=timesteps_per_hour,
+            output_values=sum(
+                output_values(frequency, timesteps_per_hour) * keys
+                for frequency, keys in series
+            ),
+        )
+
+    @property
+    def simulate_terms(self) -> list[float]:
+        """The terms the EnergyPlus runtime is linear in."""
+        return [
+            1.0,
+            self.zones * self.timesteps_per_hour,
+            self.surfaces * self.timesteps_per_hour,
+            self.output_values,
+        ]
+
+    @property
+    def postprocess_terms(self) -> list[float]:
+        """The terms the postprocessing runtime is linear in."""
+        return [1.0, self.output_values]
+
+
+def output_values(frequency: str, timesteps_per_hour: int) -> int:
+    """The number of values an output series writes in a year.
+
+    Args:
+        frequency (str): The reporting frequency of the series.
+        timesteps_per_hour (int): The number of zone timesteps per hour.
+
+    Returns:
+        values (int): The number of values written in a year.
+    """
+    if frequency.lower() in ("timestep", "detailed"):
+        return HOURS_PER_YEAR * timesteps_per_hour
+    return {k.lower(): v for k, v in VALUES_PER_YEAR.items()}[frequency.lower()]
+
+
+class RecordedRun(BaseModel, frozen=True):
+    """The features and measured runtimes of a model run."""
+
+    features: RunFeatures
+    simulate_seconds: float = Field(
+        ..., ge=0, description="The wall time EnergyPlus took [s]."
+    )
+    postprocess_seconds: float = Field(
+        ..., ge=0, description="The wall time the postprocessing took [s]."
+    )
+
+
+class RuntimeLog(BaseModel):
+    """A file of recorded runs, one JSON object per line, to calibrate the cost model from."""
+
+    path: Path = Field(
+        default_factory=lambda: EnergyPlusArtifactDir / "cache" / "runtimes.jsonl",
+        description="The file the runs are appended to.",
+    )
+
+    def append(self, runs: Sequence[RecordedRun]) -> None:
+        """Append recorded runs to the log.
+
+        Args:
+            runs (Sequence[RecordedRun]): The runs to record.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            for run in runs:
+                f.write(run.model_dump_json() + "\n")
+
+    def load(self) -> list[RecordedRun]:
+        """Read the recorded runs, skipping any line which cannot be parsed.
+
+        Returns:
+            runs (list[RecordedRun]): The recorded runs, oldest first.
+        """
+        if not self.path.exists():
+            return []
+        runs: list[RecordedRun] = []
+        for line in self.path.read_text().splitlines():
+            try:
+                runs.append(RecordedRun.model_validate(json.loads(line)))
+            except ValueError:
+                logger.warning(f"Skipping an unreadable line of {self.path}.")
+        return runs
+
+
+def _fit_non_negative(terms: np.ndarray, seconds: np.ndarray) -> list[float]:
+    """Least squares coefficients, dropping the terms which would get a negative coefficient.
+
+    Runtimes never decrease with model size, so a negative coefficient only
+    ever fits noise, and would predict nonsense outside of the recorded runs.
+    """
+    active = list(range(terms.shape[1]))
+    coefficients = np.zeros(terms.shape[1])
+    while active:
+        fitted, *_ = np.linalg.lstsq(terms[:, active], seconds, rcond=None)
+        if (fitted >= 0).all():
+            coefficients[active] = fitted
+            break
+        active.pop(int(np.argmin(fitted)))
+    return coefficients.tolist()
+
+
+class RuntimeCostModel(BaseModel, frozen=True):
+    """A linear model of the EnergyPlus and postprocessing runtimes of a run.
+
+    The defaults were measured on shoeboxes of 1 to 16 storeys with the
+    direct executor, and are only meant to rank runs until the model is
+    calibrated from runs recorded on the machine at hand.
+    """
+
+    simulate_coefficients: tuple[float, ...] = Field(
+        default=(1.2, 0.0068, 0.0014, 1.2e-7),
+        description="The coefficients of `RunFeatures.simulate_terms` [s].",
+    )
+    postprocess_coefficients: tuple[float, ...] = Field(
+        default=(0.15, 8.0e-7),
+        description="The coefficients of `RunFeatures.postprocess_terms` [s].",
+    )
+
+    @classmethod
+    def Calibrate(
+        cls, runs: Sequence[RecordedRun], min_runs: int = 10
+    ) -> "RuntimeCostModel":
+        """Fit the coefficients to recorded runs.
+
+        Args:
+            runs (Sequence[RecordedRun]): The recorded runs.
+            min_runs (int): The number of runs below which the default coefficients are kept.
+
+        Returns:
+            cost_model (RuntimeCostModel): The calibrated cost model.
+        """
+        if len(runs) < min_runs:
+            logger.info(
+                f"Only {len(runs)} recorded runs, keeping the default cost model."
+            )
+            return cls()
+        return cls(
+            simulate_coefficients=tuple(
+                _fit_non_negative(
+                    np.array([run.features.simulate_terms for run in runs]),
+                    np.array([run.simulate_seconds for run in runs]),
+                )
+            ),
+            postprocess_coefficients=tuple(
+                _fit_non_negative(
+                    np.array([run.features.postprocess_terms for run in runs]),
+                    np.array([run.postprocess_seconds for run in runs]),
+                )
+            ),
+        )
+
+    def predict_simulate(self, features: RunFeatures) -> float:
+        """Predict the EnergyPlus runtime of a run [s]."""
+        return float(np.dot(self.simulate_coefficients, features.simulate_terms))
+
+    def predict_postprocess(self, features: RunFeatures) -> float:
+        """Predict the postprocessing runtime of a run [s]."""
+        return float(np.dot(self.postprocess_coefficients, features.postprocess_terms))
+
+    def predict(self, features: RunFeatures) -> float:
+        """Predict the total runtime of a run [s]."""
+        return self.predict_simulate(features) + self.predict_postprocess(features)
+
+
+def longest_first(costs: Sequence[float], weather_keys: Sequence[str]) -> list[int]:
+    """Order runs longest first, grouping runs of a similar cost by weather file.
+
+    Scheduling the longest runs first keeps workers from idling while the
+    last long run finishes.  Runs are binned into bands which double in
+    cost, longest band first, and runs in the same band are grouped by
+    weather file, so that consecutive runs mostly read the same weather
+    file without giving up much of the longest-first order.
+
+    Args:
+        costs (Sequence[float]): The predicted cost of each run [s].
+        weather_keys (Sequence[str]): The weather file of each run.
+
+    Returns:
+        order (list[int]): The positions of the runs, in the order to submit them.
+    """
+
+    def band(cost: float) -> int:
+        return math.floor(math.log2(max(cost, 1e-3)))
+
+    return sorted(
+        range(len(costs)),
+        key=lambda i: (-band(costs[i]), weather_keys[i], -costs[i], i),
+    )
@@ -1,14 +1,20 @@
 """Flat model used for calibration."""
 
+import asyncio
 from collections.abc import Callable
 from pathlib import Path
 
 from archetypal import IDF
 from pydantic import BaseModel, Field
 
+from epinterface.analysis.design_loads import DesignLoads
 from epinterface.analysis.overheating import OverheatingAnalysisConfig
-from epinterface.geometry import ShoeboxGeometry
+from epinterface.analysis.representative_days import RepresentativeDaysConfig
+from epinterface.executor import EnergyPlusWorkerPool, RunLimits
+from epinterface.geometry import ShoeboxGeometry, ZoningChoice
+from epinterface.interface import FidelityProfile
 from epinterface.sbem.builder import AtticAssumptions, BasementAssumptions, Model
+from epinterface.sbem.cache import BuildCaches, ResultCache
 from epinterface.sbem.components.envelope import (
     ConstructionAssemblyComponent,
     ConstructionLayerComponent,
@@ -922,6 +928,9 @@ class FlatModel(BaseModel):
     WWR: float
     F2FHeight: float
     NFloors: int
+    FloorMultiplier: bool = False
+    Zoning: ZoningChoice = "auto"
+    Fidelity: FidelityProfile = "standard"
     Width: float
     Depth: float
     Rotation: float
@@ -2084,31 +2093,37 @@ class FlatModel(BaseModel):
 
         return zone
 
-    def to_model(self) -> tuple[Model, Callable[[IDF], IDF]]:
-        """Returns a tuple of a Model and a post-geometry callback."""
-        zone = self.to_zone()
-        # TODO: add in a shading mask
-        geometry = ShoeboxGeometry(
+    @property
+    def geometry(self) -> ShoeboxGeometry:
+        """The shoebox geometry of the model, without building its zone."""
+        return ShoeboxGeometry(
             x=0,
             y=0,
             w=self.Width,
             d=self.Depth,
             h=self.F2FHeight,
             num_stories=self.NFloors,
-            # TODO: should core/perim be dependent on width, depth > 9m?
-            zoning="core/perim",
+            # auto zoning falls back to a single zone per storey when the
+            # footprint is too shallow to fit a core
+            zoning=self.Zoning,
             roof_height=None,
             wwr=self.WWR,
             basement=False,
+            floor_multiplier=self.FloorMultiplier,
         )
 
+    def to_model(self) -> tuple[Model, Callable[[IDF], IDF]]:
+        """Returns a tuple of a Model and a post-geometry callback."""
+        zone = self.to_zone()
+        # TODO: add in a shading mask
+
         def post_geometry_callback(idf: IDF) -> IDF:
             idf.rotate(self.Rotation)
             return idf
 
         return (
             Model(
-                geometry=geometry,
+                geometry=self.geometry,
                 Zone=zone,
                 Attic=AtticAssumptions(
                     UseFraction=None,
@@ -2119,14 +2134,25 @@ class FlatModel(BaseModel):
                     Conditioned=False,
                 ),
                 Weather=self.EPWURI,
+                Fidelity=self.Fidelity,
             ),
             post_geometry_callback,
         )
 
+    @property
+    def post_geometry_cache_salt(self) -> str:
+        """A description of the post-geometry callback from `to_model`, for cache keys."""
+        return f"rotation={self.Rotation}"
+
     def simulate(
         self,
         overheating_config: OverheatingAnalysisConfig | None = None,
         eplus_parent_dir: Path | None = None,
+        result_cache: ResultCache | None = None,
+        build_caches: BuildCaches | None = None,
+        representative_days: RepresentativeDaysConfig | None = None,
+        limits: RunLimits | None = None,
+        worker_pool: EnergyPlusWorkerPool | None = None,
     ):
         """Simulate the model and return the IDF, result, and error."""
         model, cb = self.to_model()
@@ -2135,6 +2161,48 @@ class FlatModel(BaseModel):
             post_geometry_callback=cb,
             eplus_parent_dir=eplus_parent_dir,
             overheating_config=overheating_config,
+            result_cache=result_cache,
+            cache_salt=self.post_geometry_cache_salt,
+            build_caches=build_caches,
+            representative_days=representative_days,
+            limits=limits,
+            worker_pool=worker_pool,
+        )
+
+        return r
+
+    def size(
+        self,
+        eplus_parent_dir: Path | None = None,
+        build_caches: BuildCaches | None = None,
+    ) -> DesignLoads:
+        """Run only the zone sizing of the model and return its design loads."""
+        model, cb = self.to_model()
+
+        return model.size(
+            post_geometry_callback=cb,
+            eplus_parent_dir=eplus_parent_dir,
+            build_caches=build_caches,
+            cache_salt=self.post_geometry_cache_salt,
+        )
+
+    async def asimulate(
+        self,
+        overheating_config: OverheatingAnalysisConfig | None = None,
+        eplus_parent_dir: Path | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+        build_caches: BuildCaches | None = None,
+    ):
+        """Simulate the model as a coroutine and return the IDF, result, and error."""
+        model, cb = self.to_model()
+
+        r = await model.arun(
+            post_geometry_callback=cb,
+            eplus_parent_dir=eplus_parent_dir,
+            overheating_config=overheating_config,
+            semaphore=semaphore,
+            build_caches=build_caches,
+            cache_salt=self.post_geometry_cache_salt,
         )
 
         return r
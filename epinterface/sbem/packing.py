@@ -0,0 +1,474 @@
+"""Pack several models which share a weather file into a single EnergyPlus run.
+
+EnergyPlus pays a fixed cost for every run (process startup, reading the
+weather file, warmup and sizing on the design days), which dominates the
+runtime of small models.  Packing runs several buildings as one IDF, so
+that the fixed cost is paid once for all of them:
+
+- every object of building `k` is renamed with a `B{k} ` prefix, so that
+  zones, schedules and constructions of different buildings never collide,
+- the buildings are placed side by side along the x axis, far enough apart
+  that none of them can shade another, and each building is also its own
+  shading zone group, so that EnergyPlus skips the shading between them,
+- each building gets custom meters summing its own lights, equipment,
+  ideal loads and hot water, so that the results can be split back into
+  one set of standard results per building.
+"""
+
+import logging
+import math
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+
+from archetypal.idfclass import IDF
+from archetypal.idfclass.sql import Sql
+
+from epinterface.executor import simulate_idf
+from epinterface.interface import ZoneList
+from epinterface.sbem.builder import (
+    Model,
+    ModelRunResults,
+    SimulationPathConfig,
+    plan_outputs,
+)
+from epinterface.sbem.cache import BuildCaches
+from epinterface.sbem.flat_model import FlatModel
+from epinterface.settings import energyplus_settings
+
+logger = logging.getLogger(__name__)
+
+PackedModel = Model | FlatModel
+
+# objects which describe the site and the simulation rather than a building,
+# and which are therefore shared by every packed building
+SITE_LEVEL_KEY_PREFIXES = (
+    "OUTPUT:",
+    "OUTPUTCONTROL:",
+    "RUNPERIOD",
+    "SIZINGPERIOD:",
+    "SITE:",
+)
+
+# the ideal loads systems are not objects until ExpandObjects has run, so
+# they are looked up by the names which their zones give them
+IDEAL_LOADS = "IDEAL LOADS"
+
+# the output variables which each facility meter sums, by standard column:
+# (resource type, object key, output variable)
+PACKED_METER_SOURCES_23 = {
+    "Equipment": (
+        "Electricity",
+        "ELECTRICEQUIPMENT",
+        "Electric Equipment Electricity Energy",
+    ),
+    "Lighting": ("Electricity", "LIGHTS", "Lights Electricity Energy"),
+    "Heating": (
+        "DistrictHeatingWater",
+        IDEAL_LOADS,
+        "Zone Ideal Loads Supply Air Total Heating Fuel Energy",
+    ),
+    "Cooling": (
+        "DistrictCooling",
+        IDEAL_LOADS,
+        "Zone Ideal Loads Supply Air Total Cooling Fuel Energy",
+    ),
+    "Domestic Hot Water": (
+        "DistrictHeatingWater",
+        "WATERUSE:EQUIPMENT",
+        "Water Use Equipment Heating Energy",
+    ),
+}
+
+PACKED_METER_SOURCES_FOR_VERSION = {
+    23: PACKED_METER_SOURCES_23,
+    24: PACKED_METER_SOURCES_23,
+    25: PACKED_METER_SOURCES_23,
+}
+
+
+def building_prefix(index: int) -> str:
+    """The prefix given to the names of a packed building.
+
+    Args:
+        index (int): The position of the building in the pack.
+
+    Returns:
+        prefix (str): The prefix.
+    """
+    return f"B{index} "
+
+
+def is_site_level(obj) -> bool:
+    """Whether an IDF object describes the site or the simulation rather than a building.
+
+    Args:
+        obj (EpBunch): The IDF object.
+
+    Returns:
+        site_level (bool): True if the object is shared by every packed building.
+    """
+    return obj.key.upper().startswith(SITE_LEVEL_KEY_PREFIXES) or (
+        "unique-object" in obj.objidd[0]
+    )
+
+
+def _defines_name(obj, i: int) -> bool:
+    """Whether field `i` of an IDF object holds a name other objects refer to."""
+    field = obj.objidd[i] if i < len(obj.objidd) else {}
+    return "reference" in field or obj.fieldnames[i] == "Name"
+
+
+def namespace_idf(idf: IDF, prefix: str) -> IDF:
+    """Prefix every name of the building objects of an IDF model.
+
+    Names, and node names, are always prefixed.  Fields which refer to other
+    objects are only prefixed when the object they refer to is defined in
+    the model, so that references to objects created later (e.g. by
+    ExpandObjects) are left alone.  Site-level objects are not renamed.
+
+    Args:
+        idf (IDF): The IDF model to rename in place.
+        prefix (str): The prefix to add to every name.
+
+    Returns:
+        idf (IDF): The renamed IDF model.
+    """
+    objs = [
+        obj
+        for objs in idf.idfobjects.values()
+        for obj in objs
+        if not is_site_level(obj)
+    ]
+    defined = {
+        str(obj.obj[i]).upper()
+        for obj in objs
+        for i in range(1, len(obj.obj))
+        if _defines_name(obj, i) and obj.obj[i] != ""
+    }
+    for obj in objs:
+        for i in range(1, len(obj.obj)):
+            value = obj.obj[i]
+            if not isinstance(value, str) or value == "":
+                continue
+            field = obj.objidd[i] if i < len(obj.objidd) else {}
+            if "object-list" in field:
+                rename = value.upper() in defined
+            else:
+                rename = _defines_name(obj, i) or field.get("type") == ["node"]
+            if rename:
+                obj.obj[i] = f"{prefix}{value}"
+    return idf
+
+
+def site_level_objects(idf: IDF) -> list[str]:
+    """The site-level objects of an IDF model, for comparing models before packing them.
+
+    Args:
+        idf (IDF): The IDF model.
+
+    Returns:
+        objects (list[str]): The sorted text of each site-level object.
+    """
+    return sorted(
+        str(obj).strip()
+        for objs in idf.idfobjects.values()
+        for obj in objs
+        if is_site_level(obj)
+    )
+
+
+def _extent(idf: IDF) -> tuple[float, float, float]:
+    """The x range and the height of every surface of an IDF model."""
+    coords = [
+        vertex
+        for surface in [
+            *idf.getsurfaces(),
+            *idf.getsubsurfaces(),
+            *idf.getshadingsurfaces(),
+        ]
+        for vertex in surface.coords
+    ]
+    xs = [x for x, _, _ in coords]
+    return min(xs), max(xs), max(z for _, _, z in coords)
+
+
+def place_side_by_side(idfs: Sequence[IDF], min_solar_altitude: float) -> None:
+    """Translate IDF models along the x axis so that none of them can shade another.
+
+    A building of height `h` casts no shadow further than
+    `h / tan(min_solar_altitude)` while the sun is above `min_solar_altitude`,
+    so the buildings are separated by that distance for the tallest of them.
+
+    Args:
+        idfs (Sequence[IDF]): The IDF models to translate in place.
+        min_solar_altitude (float): The solar altitude [deg] below which shading between the buildings is neglected.
+    """
+    extents = [_extent(idf) for idf in idfs]
+    height = max(zmax for _, _, zmax in extents)
+    gap = height / math.tan(math.radians(min_solar_altitude))
+    offset = 0.0
+    for idf, (xmin, xmax, _) in zip(idfs, extents, strict=True):
+        idf.translate((offset - xmin, 0.0))
+        offset += xmax - xmin + gap
+
+
+def packed_meters(index: int, ep_version_major: int) -> dict[str, str]:
+    """The custom meters of a packed building, mapped to the standard column names.
+
+    Args:
+        index (int): The position of the building in the pack.
+        ep_version_major (int): The major version of EnergyPlus.
+
+    Returns:
+        meters (dict[str, str]): The names of the custom meters of the building, mapped to the standard column names.
+    """
+    prefix = building_prefix(index)
+    # EnergyPlus reports custom meters by their upper-cased names
+    return {
+        f"{prefix}{column}".upper(): column
+        for column in PACKED_METER_SOURCES_FOR_VERSION[ep_version_major]
+    }
+
+
+def _meter_keys(idf: IDF, object_key: str) -> list[str]:
+    """The key values of the objects whose output variables a meter sums."""
+    if object_key == IDEAL_LOADS:
+        return [
+            # the name ExpandObjects gives the ideal loads system of a template
+            f"{template.Zone_Name} Ideal Loads Air System"
+            for template in idf.idfobjects["HVACTEMPLATE:ZONE:IDEALLOADSAIRSYSTEM"]
+        ] + [system.Name for system in idf.idfobjects["ZONEHVAC:IDEALLOADSAIRSYSTEM"]]
+    return [obj.Name for obj in idf.idfobjects[object_key]]
+
+
+def add_packed_meters(idf: IDF, index: int, ep_version_major: int) -> list[str]:
+    """Add the custom meters of a packed building, before it is merged with the others.
+
+    Meters whose building has nothing to sum (e.g. no cooling) are skipped,
+    and their columns are then filled with zeros by the postprocessing.
+
+    Args:
+        idf (IDF): The namespaced IDF model of the building.
+        index (int): The position of the building in the pack.
+        ep_version_major (int): The major version of EnergyPlus.
+
+    Returns:
+        names (list[str]): The names of the added meters, which still need to be requested as outputs.
+    """
+    sources = PACKED_METER_SOURCES_FOR_VERSION[ep_version_major]
+    names: list[str] = []
+    for name, column in packed_meters(index, ep_version_major).items():
+        resource, object_key, variable = sources[column]
+        keys = _meter_keys(idf, object_key)
+        if not keys:
+            continue
+        meter = idf.newidfobject("METER:CUSTOM", Name=name, Resource_Type=resource)
+        # assigned one at a time, since eppy only extends the fields of an
+        # extensible object beyond its IDD when they are set individually
+        for i, key in enumerate(keys, start=1):
+            meter[f"Key_Name_{i}"] = key
+            meter[f"Output_Variable_or_Meter_Name_{i}"] = variable
+        names.append(name)
+    return names
+
+
+def merge_building_objects(packed: IDF, idf: IDF) -> IDF:
+    """Copy the building objects of an IDF model into another, leaving out its site-level objects.
+
+    Args:
+        packed (IDF): The IDF model to copy the objects into.
+        idf (IDF): The namespaced IDF model to copy the objects from.
+
+    Returns:
+        packed (IDF): The IDF model with the copied objects.
+    """
+    for objs in idf.idfobjects.values():
+        for obj in objs:
+            if not is_site_level(obj):
+                packed.copyidfobject(obj)
+    return packed
+
+
+def disable_shading_between_groups(idf: IDF, group_names: Sequence[str]) -> IDF:
+    """Make each zone list a shading zone group which does not shade the other zones.
+
+    Shading surfaces which are not part of a zone (e.g. `Shading:Building`)
+    are not affected, which is why packed buildings are also spaced apart.
+
+    Args:
+        idf (IDF): The IDF model to configure.
+        group_names (Sequence[str]): The names of the zone lists, one per group.
+
+    Returns:
+        idf (IDF): The configured IDF model.
+    """
+    shadow_calculations = idf.idfobjects["SHADOWCALCULATION"]
+    shadow_calculation = (
+        shadow_calculations[0]
+        if shadow_calculations
+        else idf.newidfobject("SHADOWCALCULATION")
+    )
+    shadow_calculation.Disable_SelfShading_From_Shading_Zone_Groups_to_Other_Zones = (
+        "Yes"
+    )
+    # assigned one at a time, so that eppy extends the groups beyond its IDD
+    for i, group_name in enumerate(group_names, start=1):
+        shadow_calculation[f"Shading_Zone_Group_{i}_ZoneList_Name"] = group_name
+    return idf
+
+
+def pack_idfs(
+    idfs: Sequence[IDF], ep_version_major: int, min_solar_altitude: float = 2.0
+) -> IDF:
+    """Merge the IDF models of several buildings into the first of them.
+
+    The models must share their site-level objects (weather, run periods,
+    design days, simulation controls and outputs), which are taken from the
+    first model.
+
+    Args:
+        idfs (Sequence[IDF]): The IDF models of the buildings, which are modified in place.
+        ep_version_major (int): The major version of EnergyPlus.
+        min_solar_altitude (float): The solar altitude [deg] below which shading between the buildings is neglected.
+
+    Returns:
+        idf (IDF): The first IDF model, now holding every building.
+
+    Raises:
+        ValueError: If the models do not share their site-level objects, or the EnergyPlus version has no packed meters.
+    """
+    if ep_version_major not in PACKED_METER_SOURCES_FOR_VERSION:
+        msg = f"Packing is not supported for EnergyPlus version {ep_version_major}."
+        raise ValueError(msg)
+    site = site_level_objects(idfs[0])
+    for index, idf in enumerate(idfs[1:], start=1):
+        if site_level_objects(idf) != site:
+            msg = (
+                f"Building {index} does not share the site-level objects of "
+                "building 0 (weather, run periods, simulation controls or "
+                "outputs), so they cannot be packed."
+            )
+            raise ValueError(msg)
+
+    place_side_by_side(idfs, min_solar_altitude)
+    meter_names: list[str] = []
+    group_names: list[str] = []
+    for index, idf in enumerate(idfs):
+        prefix = building_prefix(index)
+        namespace_idf(idf, prefix)
+        meter_names.extend(add_packed_meters(idf, index, ep_version_major))
+        group_name = f"{prefix}Shading Zone Group"
+        ZoneList(
+            Name=group_name, Names=[zone.Name for zone in idf.idfobjects["ZONE"]]
+        ).add(idf)
+        group_names.append(group_name)
+
+    packed = idfs[0]
+    for idf in idfs[1:]:
+        merge_building_objects(packed, idf)
+    for name in meter_names:
+        packed.newidfobject("OUTPUT:METER", Key_Name=name, Reporting_Frequency="Hourly")
+
+    disable_shading_between_groups(packed, group_names)
+    return packed
+
+
+def run_packed(
+    models: Sequence[PackedModel],
+    weather_dir: Path | None = None,
+    eplus_parent_dir: Path | None = None,
+    build_caches: BuildCaches | None = None,
+    min_solar_altitude: float = 2.0,
+) -> list[ModelRunResults]:
+    """Build several models, simulate them in a single EnergyPlus run and split the results.
+
+    Each returned result is normalized by the conditioned area of its own
+    building, as if the model had been run on its own.  The packed IDF,
+    the sql file and the warnings are shared by every result.  The tabular
+    cross-check only covers the whole pack, so it is skipped, and the
+    overheating analysis and representative days are not supported.
+
+    The sizing cache is neither read nor filled: hard-sizing a model turns
+    off the sizing calculations of its (shared) simulation control, so every
+    packed building is sized on the design days.
+
+    Args:
+        models (Sequence[PackedModel]): The models to simulate, which must share a weather file.
+        weather_dir (Path | None): The directory to store the weather files.
+        eplus_parent_dir (Path | None): The parent directory to store the eplus working directory.  If None, a temporary directory will be used.
+        build_caches (BuildCaches | None): The caches to consult while building, except for the sizing cache.  Skips if None.
+        min_solar_altitude (float): The solar altitude [deg] below which shading between the buildings is neglected.
+
+    Returns:
+        results (list[ModelRunResults]): The results of each model, in order.
+
+    Raises:
+        ValueError: If the models do not share a weather file or their site-level objects.
+    """
+    if not models:
+        return []
+    converted = [
+        model.to_model() if isinstance(model, FlatModel) else (model, None)
+        for model in models
+    ]
+    weathers = {str(sbem_model.Weather) for sbem_model, _ in converted}
+    if len(weathers) > 1:
+        msg = f"Packed models must share a weather file, got {sorted(weathers)}."
+        raise ValueError(msg)
+    salts = [
+        model.post_geometry_cache_salt if isinstance(model, FlatModel) else None
+        for model in models
+    ]
+    ep_version_major = energyplus_settings.archetypal_energyplus_version.major
+    output_plan = plan_outputs(ep_version_major, overheating=False)
+    if build_caches is not None:
+        build_caches = build_caches.model_copy(update={"sizing": None})
+
+    with tempfile.TemporaryDirectory() as output_dir_name:
+        output_dir = (
+            Path(output_dir_name)
+            if eplus_parent_dir is None
+            else eplus_parent_dir / "eplus_simulation"
+        )
+        idfs: list[IDF] = []
+        for index, (sbem_model, post_geometry_callback) in enumerate(converted):
+            building_dir = output_dir / f"building_{index}"
+            building_dir.mkdir(parents=True, exist_ok=True)
+            config = (
+                SimulationPathConfig(output_dir=building_dir, weather_dir=weather_dir)
+                if weather_dir is not None
+                else SimulationPathConfig(output_dir=building_dir)
+            )
+            idfs.append(
+                sbem_model.build(
+                    config,
+                    post_geometry_callback,
+                    build_caches=build_caches,
+                    cache_salt=salts[index],
+                    output_plan=output_plan,
+                )
+            )
+
+        idf = pack_idfs(idfs, ep_version_major, min_solar_altitude=min_solar_altitude)
+        logger.info(
+            f"Simulating {len(idfs)} packed buildings in {idf.output_directory}"
+        )
+        sql_path = simulate_idf(idf, readvars=output_plan.keep_all_files)
+        sql = Sql(sql_path.as_posix())
+        first_model = converted[0][0]
+        err_text = first_model.get_warnings(idf)
+        return [
+            ModelRunResults(
+                idf=idf,
+                sql=sql,
+                energy_and_peak=sbem_model.standard_results_postprocess(
+                    sql,
+                    ep_version_major=ep_version_major,
+                    meters=packed_meters(index, ep_version_major),
+                ),
+                err_text=err_text,
+                output_dir=output_dir if eplus_parent_dir is not None else None,
+            )
+            for index, (sbem_model, _) in enumerate(converted)
+        ]
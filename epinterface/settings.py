@@ -1,6 +1,6 @@
 """Configuration settings for epinterface, loaded from environment variables."""
 
-from typing import Any
+from typing import Any, Literal
 
 from archetypal import EnergyPlusVersion
 from archetypal.eplus_interface.exceptions import (
@@ -50,6 +50,27 @@ class EnergyPlusSettings(BaseSettings):
     energyplus_version: str | None = Field(
         default_factory=_get_latest_energyplus_version
     )
+    keep_all_output_files: bool = Field(
+        default=False,
+        description="Whether simulations should write every output file EnergyPlus supports, for debugging, rather than only the files which are postprocessed.",
+    )
+    tabular_cross_check: bool = Field(
+        default=False,
+        description="Whether simulations should write the annual tabular end uses and cross-check the meters against them.",
+    )
+    ideal_loads_backend: Literal["template", "native"] = Field(
+        default="template",
+        description="Whether ideal loads systems are written as HVACTemplate objects for ExpandObjects to expand, or as the native objects ExpandObjects would create, which lets EnergyPlus skip the preprocessor.",
+    )
+    executor: Literal["archetypal", "direct", "in_process"] = Field(
+        default="archetypal",
+        description="Whether models are simulated with archetypal's IDF.simulate, by launching EnergyPlus directly with the minimal command line flags, or through the EnergyPlus Python API in a long-lived worker process.",
+    )
+    energyplus_threads: int | None = Field(
+        default=None,
+        ge=1,
+        description="The number of OpenMP threads each EnergyPlus run launched by the direct or in-process executor may use for its shading and radiant exchange calculations.  If None, EnergyPlus uses every core, which oversubscribes the CPU when several runs execute concurrently.",
+    )
 
     @property
     def archetypal_energyplus_version(self) -> EnergyPlusVersion:
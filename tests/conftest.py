@@ -2,15 +2,18 @@
 
 import shutil
 import tempfile
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from pathlib import Path
 
 import pytest
 from archetypal.idfclass import IDF
+from prisma import Prisma
 
-from epinterface.data import EnergyPlusArtifactDir
-from epinterface.geometry import ShoeboxGeometry
-from epinterface.sbem.prisma.client import PrismaSettings
+from epinterface.data import DefaultEPWZipPath, EnergyPlusArtifactDir
+from epinterface.geometry import ShoeboxGeometry, ZoningChoice
+from epinterface.sbem.builder import AtticAssumptions, BasementAssumptions, Model
+from epinterface.sbem.components.zones import ZoneComponent
+from epinterface.sbem.prisma.client import PrismaSettings, deep_fetcher
 from epinterface.sbem.prisma.seed_fns import (
     create_dhw_systems,
     create_envelope,
@@ -46,6 +49,50 @@ def preseeded_readonly_db():
             yield settings.db
 
 
+@pytest.fixture(scope="package")
+def default_zone(preseeded_readonly_db: Prisma) -> ZoneComponent:
+    """The default zone of the preseeded database."""
+    _, zone = deep_fetcher.Zone.get_deep_object("default_zone", preseeded_readonly_db)
+    return zone
+
+
+@pytest.fixture(scope="package")
+def make_shoebox_model(default_zone: ZoneComponent) -> Callable[..., Model]:
+    """Make 10m x 10m shoebox models of the default zone, without a basement or attic."""
+
+    def make(
+        num_stories: int = 2,
+        zoning: ZoningChoice = "by_storey",
+        weather: Path = DefaultEPWZipPath,
+    ) -> Model:
+        return Model(
+            Weather=weather,
+            Zone=default_zone,
+            Basement=BasementAssumptions(
+                Conditioned=False,
+                UseFraction=None,
+            ),
+            Attic=AtticAssumptions(
+                Conditioned=False,
+                UseFraction=None,
+            ),
+            geometry=ShoeboxGeometry(
+                x=0,
+                y=0,
+                w=10,
+                d=10,
+                h=3,
+                wwr=0.2,
+                num_stories=num_stories,
+                basement=False,
+                zoning=zoning,
+                roof_height=None,
+            ),
+        )
+
+    return make
+
+
 @pytest.fixture(scope="function")
 def idf() -> Generator[IDF, None, None]:
     """Create a new IDF object."""
@@ -0,0 +1,43 @@
+"""Unit tests for the design loads postprocessing."""
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+from archetypal.idfclass.sql import Sql
+
+from epinterface.analysis.design_loads import design_loads_postprocess
+
+
+def test_design_loads_sum_zone_peaks(tmp_path: Path):
+    """The building design loads should be the sums of the zone design loads."""
+    sql_path = tmp_path / "eplusout.sql"
+    with closing(sqlite3.connect(sql_path)) as conn:
+        conn.execute(
+            "CREATE TABLE ZoneSizes (ZoneSizesIndex INTEGER PRIMARY KEY, ZoneName TEXT, "
+            "LoadType TEXT, CalcDesLoad REAL, UserDesLoad REAL, CalcDesFlow REAL, "
+            "UserDesFlow REAL, DesDayName TEXT, PeakHrMin TEXT, PeakTemp REAL, "
+            "PeakHumRat REAL, CalcOutsideAirFlow REAL, DOASHeatAddRate REAL)"
+        )
+        conn.executemany(
+            "INSERT INTO ZoneSizes (ZoneName, LoadType, CalcDesLoad, UserDesLoad, "
+            "UserDesFlow, DesDayName, PeakHrMin, PeakTemp) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                ("A", "Heating", 1000, 1150, 0.1, "WINTER", "1/21 07:30:00", -15),
+                ("A", "Cooling", 2000, 2300, 0.2, "SUMMER", "7/22 17:30:00", 31.4),
+                ("B", "Heating", 3000, 3450, 0.3, "WINTER", "1/21 07:40:00", -15),
+                ("B", "Cooling", 4000, 4600, 0.4, "SUMMER", "7/22 17:40:00", 31.3),
+            ],
+        )
+        conn.commit()
+
+    loads = design_loads_postprocess(
+        Sql(sql_path.as_posix()), normalizing_floor_area=50
+    )
+
+    assert loads.zones.loc[("B", "Cooling"), "Design Day"] == "SUMMER"
+    assert loads.zones.loc[("A", "Heating"), "Design Air Flow [m3/s]"] == 0.1
+    assert loads.building[("Heating", "Design Load [W]")] == pytest.approx(4600)
+    assert loads.building[("Cooling", "Calculated Load [W]")] == pytest.approx(6000)
+    assert loads.building[("Cooling", "Design Load [W/m2]")] == pytest.approx(138)
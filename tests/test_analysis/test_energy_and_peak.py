@@ -0,0 +1,54 @@
+"""Unit tests for the energy and peak postprocessing helpers."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from epinterface.analysis.energy_and_peak import (
+    check_tabular_cross_check_is_supported,
+    monthly_totals_and_peaks,
+)
+
+
+def test_monthly_totals_and_peaks_match_resampling():
+    """Monthly totals and peaks should match resampling the hourly data."""
+    rng = np.random.default_rng(42)
+    index = pd.date_range("2017-01-01", periods=8760, freq="h")
+    hourly = pd.DataFrame(
+        rng.random((len(index), 2)),
+        index=index,
+        columns=pd.Index(["Heating", "Cooling"], name="Meter"),
+    )
+
+    totals, peaks = monthly_totals_and_peaks(hourly)
+
+    expected_totals = hourly.resample("MS").sum()
+    expected_peaks = hourly.resample("MS").max()
+    expected_totals.index = pd.RangeIndex(1, 13, 1, name="Month")
+    expected_peaks.index = pd.RangeIndex(1, 13, 1, name="Month")
+    pd.testing.assert_frame_equal(totals, expected_totals)
+    pd.testing.assert_frame_equal(peaks, expected_peaks)
+
+
+def test_monthly_totals_and_peaks_fill_missing_months():
+    """Months without hourly data should be reported as zero."""
+    index = pd.date_range("2017-03-01", periods=24 * 31, freq="h")
+    hourly = pd.DataFrame({"Lighting": np.full(len(index), 2.0)}, index=index)
+
+    totals, peaks = monthly_totals_and_peaks(hourly)
+
+    assert totals.shape == (12, 1)
+    assert totals.loc[3, "Lighting"] == 2.0 * 24 * 31
+    assert peaks.loc[3, "Lighting"] == 2.0
+    assert totals.drop(index=3).to_numpy().sum() == 0
+    assert peaks.drop(index=3).to_numpy().sum() == 0
+
+
+def test_tabular_cross_check_needs_the_facility_meters():
+    """Custom meters are not broken down by the tabular end uses."""
+    meters = {"B0 LIGHTING": "Lighting"}
+
+    check_tabular_cross_check_is_supported(False, None, meters)
+    check_tabular_cross_check_is_supported(True, None, None)
+    with pytest.raises(ValueError, match="facility meters"):
+        check_tabular_cross_check_is_supported(True, None, meters)
@@ -0,0 +1,119 @@
+"""Tests for planning the outputs read by the analyses."""
+
+from pathlib import Path
+
+from archetypal.idfclass import IDF
+
+from epinterface.analysis.energy_and_peak import (
+    ANNUAL_SUMMARY_REPORT,
+    DESIRED_METERS_FOR_VERSION,
+)
+from epinterface.analysis.energy_and_peak import (
+    required_outputs as energy_and_peak_outputs,
+)
+from epinterface.analysis.outputs import OutputMeter, OutputPlan, OutputVariable
+from epinterface.analysis.overheating import OVERHEATING_HOURLY_VARIABLES
+from epinterface.analysis.overheating import (
+    required_outputs as overheating_outputs,
+)
+from epinterface.data import EnergyPlusArtifactDir
+from epinterface.settings import energyplus_settings
+
+
+def minimal_idf(tmp_path: Path) -> IDF:
+    """Load the minimal IDF without any of archetypal's output requests."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    return IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        prep_outputs=False,
+        output_directory=tmp_path.as_posix(),
+    )
+
+
+def test_combined_plans_deduplicate_requests():
+    """Requests shared by two plans should only appear once in their union."""
+    meter = OutputMeter(name="InteriorLights:Electricity", frequency="Hourly")
+    variable = OutputVariable(name="Zone Mean Air Temperature", frequency="Hourly")
+    first = OutputPlan(meters=(meter,), summary_reports=(ANNUAL_SUMMARY_REPORT,))
+    second = OutputPlan(
+        meters=(meter,),
+        variables=(variable,),
+        summary_reports=(ANNUAL_SUMMARY_REPORT,),
+    )
+
+    combined = first | second
+
+    assert combined.meters == (meter,)
+    assert combined.variables == (variable,)
+    assert combined.summary_reports == (ANNUAL_SUMMARY_REPORT,)
+
+
+def test_analysis_plans_cover_what_they_read():
+    """Each analysis should request exactly the outputs its postprocessing reads."""
+    for ep_version_major, desired_meters in DESIRED_METERS_FOR_VERSION.items():
+        plan = energy_and_peak_outputs(ep_version_major)
+        assert {(m.name, m.frequency) for m in plan.meters} == {
+            (meter, "Hourly") for meter in desired_meters
+        }
+        assert plan.variables == ()
+        assert plan.summary_reports == ()
+        checked = energy_and_peak_outputs(ep_version_major, tabular_cross_check=True)
+        assert checked.meters == plan.meters
+        assert checked.summary_reports == (ANNUAL_SUMMARY_REPORT,)
+
+    plan = overheating_outputs()
+    assert plan.meters == ()
+    assert tuple(v.name for v in plan.variables) == OVERHEATING_HOURLY_VARIABLES
+
+
+def test_apply_replaces_existing_outputs(tmp_path: Path):
+    """Applying a plan should leave exactly the planned outputs in the model."""
+    idf = minimal_idf(tmp_path)
+    idf.newidfobject(
+        "OUTPUT:METER", Key_Name="Electricity:Facility", Reporting_Frequency="Hourly"
+    )
+    plan = (
+        energy_and_peak_outputs(
+            energyplus_settings.archetypal_energyplus_version.major,
+            tabular_cross_check=True,
+        )
+        | overheating_outputs()
+    )
+
+    idf = plan.apply(idf)
+
+    assert sorted(
+        (o.Key_Name, o.Reporting_Frequency) for o in idf.idfobjects["OUTPUT:METER"]
+    ) == sorted((m.name, m.frequency) for m in plan.meters)
+    assert sorted(o.Variable_Name for o in idf.idfobjects["OUTPUT:VARIABLE"]) == sorted(
+        OVERHEATING_HOURLY_VARIABLES
+    )
+    (summary,) = idf.idfobjects["OUTPUT:TABLE:SUMMARYREPORTS"]
+    assert summary.Report_1_Name == ANNUAL_SUMMARY_REPORT
+    (sqlite,) = idf.idfobjects["OUTPUT:SQLITE"]
+    assert sqlite.Option_Type == "SimpleAndTabular"
+
+
+def test_apply_without_reports_skips_tabular_outputs(tmp_path: Path):
+    """A plan without summary reports should not ask for any tabular output."""
+    idf = OutputPlan().apply(minimal_idf(tmp_path))
+
+    assert len(idf.idfobjects["OUTPUT:TABLE:SUMMARYREPORTS"]) == 0
+    assert len(idf.idfobjects["OUTPUTCONTROL:TABLE:STYLE"]) == 0
+    (sqlite,) = idf.idfobjects["OUTPUT:SQLITE"]
+    assert sqlite.Option_Type == "Simple"
+
+
+def test_apply_turns_off_unread_output_files(tmp_path: Path):
+    """Only the SQL file should be written unless every file is kept for debugging."""
+    lean = OutputPlan().apply(minimal_idf(tmp_path))
+    (files,) = lean.idfobjects["OUTPUTCONTROL:FILES"]
+    assert [field for field in files.fieldnames[1:] if files[field] == "Yes"] == [
+        "Output_SQLite"
+    ]
+
+    debug = OutputPlan(keep_all_files=True).apply(lean)
+    assert len(debug.idfobjects["OUTPUTCONTROL:FILES"]) == 0
+    assert (OutputPlan() | OutputPlan(keep_all_files=True)).keep_all_files
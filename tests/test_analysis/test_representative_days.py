@@ -0,0 +1,112 @@
+"""Unit tests for the representative days selection and reconstruction."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from archetypal.idfclass import IDF
+
+from epinterface.analysis.representative_days import (
+    RepresentativeDays,
+    RepresentativeDaysConfig,
+)
+from epinterface.data import DefaultEPWPath, EnergyPlusArtifactDir
+from epinterface.interface import add_default_sim_controls
+from epinterface.settings import energyplus_settings
+
+
+@pytest.fixture(scope="module")
+def boston_days() -> RepresentativeDays:
+    """The representative days of the bundled Boston weather file."""
+    return RepresentativeDaysConfig(n_days=12).select(DefaultEPWPath)
+
+
+def test_every_day_is_represented_by_a_day_of_its_type(
+    boston_days: RepresentativeDays,
+):
+    """Weights should cover the year, and weekends should only represent weekends."""
+    assert len(boston_days.days) == 12
+    assert len(set(boston_days.days)) == 12
+    assert boston_days.weights.sum() == 365
+    assert (boston_days.weights > 0).all()
+
+    # the year starts on a Sunday
+    def is_weekend(day: int) -> bool:
+        return (day - 1) % 7 in (0, 6)
+
+    for day, position in enumerate(boston_days.assignment, start=1):
+        assert is_weekend(day) == is_weekend(boston_days.days[position])
+
+
+def test_extreme_days_only_represent_themselves(boston_days: RepresentativeDays):
+    """The hottest and coldest days should be simulated with a weight of one."""
+    weights = boston_days.weights
+    assert weights[0] == 1
+    assert weights[1] == 1
+
+
+def test_selection_is_deterministic(boston_days: RepresentativeDays):
+    """The same seed should select the same days."""
+    assert RepresentativeDaysConfig(n_days=12).select(DefaultEPWPath) == boston_days
+
+
+def test_expand_weights_totals_by_cluster_size():
+    """Reconstructed annual totals should weight each day by the days it represents."""
+    days = RepresentativeDays(days=(10, 200), assignment=(0,) * 100 + (1,) * 265)
+    index = pd.DatetimeIndex([
+        *pd.date_range("2018-01-10", periods=24, freq="h"),
+        *pd.date_range("2018-07-19", periods=24, freq="h"),
+    ])
+    hourly = pd.DataFrame({"Heating": [1.0] * 24 + [0.0] * 24}, index=index)
+    hourly["Cooling"] = 1 - hourly["Heating"]
+
+    annual = days.expand(hourly)
+
+    assert len(annual) == 8760
+    assert annual.index[0] == pd.Timestamp("2018-01-01")
+    assert annual["Heating"].sum() == pytest.approx(100 * 24)
+    assert annual["Cooling"].sum() == pytest.approx(265 * 24)
+    np.testing.assert_array_equal(annual.columns, hourly.columns)
+
+
+def test_expand_requires_full_days():
+    """A representative day missing from the results should raise an error."""
+    days = RepresentativeDays(days=(10, 200), assignment=(0,) * 365)
+    hourly = pd.DataFrame(
+        {"Heating": 1.0}, index=pd.date_range("2018-01-10", periods=24, freq="h")
+    )
+    with pytest.raises(ValueError, match="representative day 200"):
+        days.expand(hourly)
+
+
+def test_apply_replaces_the_annual_run_period(tmp_path: Path):
+    """Each representative day should run on its own day of the week."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        prep_outputs=False,
+        output_directory=tmp_path.as_posix(),
+    )
+    idf = add_default_sim_controls(idf)
+    days = RepresentativeDays(days=(1, 60, 365), assignment=(0,) * 365)
+
+    idf = days.apply(idf)
+
+    run_periods = idf.idfobjects["RUNPERIOD"]
+    assert [(rp.Begin_Month, rp.Begin_Day_of_Month) for rp in run_periods] == [
+        (1, 1),
+        (3, 1),
+        (12, 31),
+    ]
+    assert all(
+        (rp.End_Month, rp.End_Day_of_Month) == (rp.Begin_Month, rp.Begin_Day_of_Month)
+        for rp in run_periods
+    )
+    assert [rp.Day_of_Week_for_Start_Day for rp in run_periods] == [
+        "Sunday",
+        "Wednesday",
+        "Sunday",
+    ]
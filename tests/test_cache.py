@@ -0,0 +1,267 @@
+"""Tests for the on-disk caches."""
+
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from archetypal.idfclass import IDF
+from archetypal.idfclass.sql import Sql
+
+from epinterface.cache import LRUDirectoryCache, canonical_hash, file_hash
+from epinterface.data import EnergyPlusArtifactDir
+from epinterface.interface import (
+    HVACTemplateZoneIdealLoadsAirSystem,
+    add_default_sim_controls,
+)
+from epinterface.sbem.cache import (
+    BuiltIDFCache,
+    CachedRunResults,
+    IdealLoadsSizing,
+    PrototypeIDFCache,
+    ResultCache,
+    SizingCache,
+)
+from epinterface.settings import energyplus_settings
+
+
+def test_canonical_hash_ignores_key_order():
+    """Equivalent dictionaries should hash identically regardless of key order."""
+    assert canonical_hash({"a": 1, "b": [1, 2]}) == canonical_hash({
+        "b": [1, 2],
+        "a": 1,
+    })
+    assert canonical_hash({"a": 1}) != canonical_hash({"a": 2})
+
+
+def test_file_hash_tracks_contents(tmp_path: Path):
+    """The file hash should change when the file contents change."""
+    path = tmp_path / "weather.epw"
+    path.write_text("first")
+    first = file_hash(path)
+    path.write_text("second, longer")
+    assert file_hash(path) != first
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path: Path):
+    """The least recently used entries should be evicted first."""
+    unbounded = LRUDirectoryCache(cache_dir=tmp_path)
+    for i, key in enumerate(["a", "b", "c"]):
+        unbounded.write_bytes(key, b"x" * 100)
+        os.utime(unbounded.path_for(key), (i, i))
+
+    cache = LRUDirectoryCache(cache_dir=tmp_path, max_size_bytes=250)
+
+    # reading "a" makes it the most recently used entry
+    assert cache.read_bytes("a") == b"x" * 100
+    cache.write_bytes("d", b"x" * 100)
+
+    assert cache.read_bytes("b") is None
+    assert cache.read_bytes("c") is None
+    assert cache.read_bytes("a") is not None
+    assert cache.read_bytes("d") is not None
+    assert cache.size_bytes <= 250
+
+
+def test_lru_writes_rarely_rescan_the_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Filling a cache scans the directory only when eviction is due, and keeps it bounded."""
+    scans = 0
+    entries = LRUDirectoryCache.entries
+
+    def counting_entries(self: LRUDirectoryCache) -> list[Path]:
+        nonlocal scans
+        scans += 1
+        return entries(self)
+
+    monkeypatch.setattr(LRUDirectoryCache, "entries", counting_entries)
+    cache = LRUDirectoryCache(cache_dir=tmp_path, max_size_bytes=10_000)
+
+    for i in range(1000):
+        cache.write_bytes(f"{i:04d}", b"x" * 100)
+        os.utime(cache.path_for(f"{i:04d}"), (i, i))
+        assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 10_000
+
+    # one scan on the first write, then one per 2000 bytes written past the bound
+    assert scans <= 1 + (1000 * 100 - 10_000) // 2000 + 1
+    assert cache.read_bytes("0999") is not None
+    assert cache.read_bytes("0000") is None
+
+
+def test_result_cache_round_trip(tmp_path: Path):
+    """Results should come back out of the cache unchanged."""
+    cache = ResultCache(cache_dir=tmp_path)
+    series = pd.Series(
+        [1.0, 2.0],
+        index=pd.MultiIndex.from_tuples(
+            [("Energy", "Heating"), ("Energy", "Cooling")],
+            names=["Measurement", "Meter"],
+        ),
+    )
+
+    assert cache.get("missing") is None
+    cache.put("key", CachedRunResults(energy_and_peak=series, err_text="warnings"))
+    cached = cache.get("key")
+
+    assert cached is not None
+    pd.testing.assert_series_equal(cached.energy_and_peak, series)
+    assert cached.err_text == "warnings"
+    assert cached.overheating_results is None
+
+
+def test_result_cache_discards_corrupt_entries(tmp_path: Path):
+    """A corrupt entry should be treated as a miss and removed."""
+    cache = ResultCache(cache_dir=tmp_path)
+    cache.write_bytes("key", b"not a pickle")
+
+    assert cache.get("key") is None
+    assert not cache.path_for("key").exists()
+
+
+def test_built_idf_cache_round_trip(tmp_path: Path):
+    """A rehydrated IDF should keep its objects, including the archetypal-managed outputs."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        prep_outputs=True,
+        output_directory=(tmp_path / "original").as_posix(),
+    )
+    idf.newidfobject("ZONE", Name="Cached Zone")
+    cache = BuiltIDFCache(cache_dir=tmp_path / "idfs")
+
+    assert cache.get("key") is None
+    cache.put("key", idf)
+    serialized = cache.get("key")
+    assert serialized is not None
+
+    epw_path = tmp_path / "weather.epw"
+    epw_path.write_text("")
+    rehydrated = serialized.to_idf(epw_path, tmp_path / "rehydrated")
+
+    assert rehydrated.name == idf.name
+    assert [z.Name for z in rehydrated.idfobjects["ZONE"]] == ["Cached Zone"]
+    for key in ("OUTPUT:SQLITE", "OUTPUTCONTROL:TABLE:STYLE"):
+        assert [o.fieldvalues for o in rehydrated.idfobjects[key]] == [
+            o.fieldvalues for o in idf.idfobjects[key]
+        ]
+
+
+def test_prototype_cache_hands_out_independent_copies(tmp_path: Path):
+    """Each prototype clone should be a separate model, loaded from memory after the first read."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        prep_outputs=False,
+        output_directory=(tmp_path / "original").as_posix(),
+    )
+    cache = PrototypeIDFCache(cache_dir=tmp_path / "prototypes")
+    cache.put("key", idf)
+    cache.path_for("key").unlink()
+
+    epw_path = tmp_path / "weather.epw"
+    epw_path.write_text("")
+    serialized = cache.get("key")
+    assert serialized is not None
+    first = serialized.to_idf(epw_path, tmp_path / "first")
+    second = serialized.to_idf(epw_path, tmp_path / "second")
+    first.newidfobject("ZONE", Name="Only In First")
+
+    assert len(first.idfobjects["ZONE"]) == 1
+    assert len(second.idfobjects["ZONE"]) == 0
+
+
+def test_ideal_loads_sizing_read_from_sql(tmp_path: Path):
+    """The autosized ideal loads values should be read from the component sizes table."""
+    sql_path = tmp_path / "eplusout.sql"
+    with closing(sqlite3.connect(sql_path)) as conn:
+        conn.execute(
+            "CREATE TABLE ComponentSizes (ComponentSizesIndex INTEGER PRIMARY KEY, "
+            "CompType TEXT, CompName TEXT, Description TEXT, Value REAL, Units TEXT, "
+            "StrValue TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO ComponentSizes (CompType, CompName, Description, Value, Units) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    "ZoneHVAC:IdealLoadsAirSystem",
+                    "ZONE A IDEAL LOADS AIR SYSTEM",
+                    "Design Size Maximum Heating Air Flow Rate",
+                    0.3,
+                    "m3/s",
+                ),
+                (
+                    "ZoneHVAC:IdealLoadsAirSystem",
+                    "ZONE A IDEAL LOADS AIR SYSTEM",
+                    "Design Size Maximum Total Cooling Capacity",
+                    6000.0,
+                    "W",
+                ),
+                (
+                    "Fan:ConstantVolume",
+                    "FAN",
+                    "Design Size Maximum Flow Rate",
+                    1.0,
+                    "m3/s",
+                ),
+            ],
+        )
+        conn.commit()
+
+    sizing = IdealLoadsSizing.FromSql(Sql(sql_path.as_posix()))
+
+    assert sizing.systems == {
+        "ZONE A IDEAL LOADS AIR SYSTEM": {
+            "Maximum_Heating_Air_Flow_Rate": 0.3,
+            "Maximum_Total_Cooling_Capacity": 6000.0,
+        }
+    }
+
+
+def test_ideal_loads_sizing_hard_sizes_and_disables_sizing(tmp_path: Path):
+    """Cached sizes should replace the autosized fields and turn off the sizing periods."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        prep_outputs=False,
+        output_directory=tmp_path.as_posix(),
+    )
+    idf = add_default_sim_controls(idf)
+    HVACTemplateZoneIdealLoadsAirSystem(
+        Zone_Name="Zone A",
+        Template_Thermostat_Name="Thermostat",
+        Heating_Limit="LimitFlowRateAndCapacity",
+        Maximum_Heating_Air_Flow_Rate="autosize",
+        Maximum_Sensible_Heating_Capacity="autosize",
+        Cooling_Limit="LimitFlowRateAndCapacity",
+        Maximum_Cooling_Air_Flow_Rate="autosize",
+        Maximum_Total_Cooling_Capacity="autosize",
+    ).add(idf)
+    sizes = {
+        "Maximum_Heating_Air_Flow_Rate": 0.3,
+        "Maximum_Sensible_Heating_Capacity": 4800.0,
+        "Maximum_Cooling_Air_Flow_Rate": 0.8,
+        "Maximum_Total_Cooling_Capacity": 6000.0,
+    }
+    cache = SizingCache(cache_dir=tmp_path / "sizing")
+    cache.put("key", IdealLoadsSizing(systems={"ZONE A IDEAL LOADS AIR SYSTEM": sizes}))
+    sizing = cache.get("key")
+    assert sizing is not None
+
+    idf = sizing.apply(idf)
+
+    (template,) = idf.idfobjects["HVACTEMPLATE:ZONE:IDEALLOADSAIRSYSTEM"]
+    assert {field: template[field] for field in sizes} == sizes
+    (sim_control,) = idf.idfobjects["SIMULATIONCONTROL"]
+    assert sim_control.Do_Zone_Sizing_Calculation == "No"
+    assert sim_control.Run_Simulation_for_Sizing_Periods == "No"
+    assert sim_control.Run_Simulation_for_Weather_File_Run_Periods == "Yes"
@@ -0,0 +1,198 @@
+"""Test the batch runner."""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from epinterface.executor import RunLimits
+from epinterface.sbem.batch import (
+    estimate_features,
+    run_many,
+    run_pipelined,
+    submission_order,
+)
+from epinterface.sbem.builder import Model, plan_outputs
+from epinterface.sbem.cost import RuntimeCostModel, RuntimeLog
+from epinterface.settings import energyplus_settings
+
+
+class CrashingModel(Model):
+    """A model whose build or run kills the worker process running it."""
+
+    def build(self, *args, **kwargs):
+        """Exit the process without cleaning up, as a segfault would."""
+        os._exit(1)
+
+    def run(self, *args, **kwargs):
+        """Exit the process without cleaning up, as a crash in EnergyPlus would."""
+        os._exit(1)
+
+
+def test_run_many_isolates_failures(
+    make_shoebox_model: Callable[..., Model], tmp_path: Path
+):
+    """A failing model should not prevent the rest of the batch from completing."""
+    models = [
+        make_shoebox_model(num_stories=1),
+        make_shoebox_model(num_stories=1, weather=tmp_path / "does-not-exist.zip"),
+        make_shoebox_model(num_stories=2),
+    ]
+
+    results = sorted(
+        run_many(models, max_workers=2, weather_dir=tmp_path / "weather"),
+        key=lambda r: r.index,
+    )
+
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0].succeeded
+    assert not results[1].succeeded
+    assert results[2].succeeded
+    assert results[1].error is not None
+    assert "does-not-exist.zip" in results[1].error
+    assert results[0].energy_and_peak is not None
+    assert results[2].energy_and_peak is not None
+
+
+def test_run_many_resubmits_models_after_a_worker_crash(
+    make_shoebox_model: Callable[..., Model], tmp_path: Path
+):
+    """Only the model which crashed its worker fails; the models it interrupted are rerun."""
+    models = [
+        make_shoebox_model(num_stories=1),
+        CrashingModel(**dict(make_shoebox_model(num_stories=1))),
+        make_shoebox_model(num_stories=2),
+        make_shoebox_model(num_stories=1, zoning="core/perim"),
+    ]
+
+    results = sorted(
+        run_many(models, max_workers=2, weather_dir=tmp_path / "weather"),
+        key=lambda r: r.index,
+    )
+
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert [r.succeeded for r in results] == [True, False, True, True]
+    assert results[1].error is not None
+    assert "BrokenProcessPool" in results[1].error
+
+
+def test_run_pipelined_resubmits_models_after_a_build_worker_crash(
+    make_shoebox_model: Callable[..., Model], tmp_path: Path
+):
+    """A crashed build worker only fails its own model; the rest of the batch completes."""
+    models = [
+        make_shoebox_model(num_stories=1),
+        CrashingModel(**dict(make_shoebox_model(num_stories=1))),
+        make_shoebox_model(num_stories=2),
+        make_shoebox_model(num_stories=1, zoning="core/perim"),
+    ]
+
+    results = sorted(
+        run_pipelined(
+            models,
+            build_workers=2,
+            simulate_workers=2,
+            weather_dir=tmp_path / "weather",
+        ),
+        key=lambda r: r.index,
+    )
+
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert [r.succeeded for r in results] == [True, False, True, True]
+    assert results[1].error is not None
+    assert "BrokenProcessPool" in results[1].error
+
+
+def test_batches_require_a_scratch_dir_to_keep_outputs(
+    make_shoebox_model: Callable[..., Model],
+):
+    """Outputs kept in a temporary scratch directory would be deleted with it."""
+    models = [make_shoebox_model(num_stories=1)]
+
+    with pytest.raises(ValueError, match="scratch_dir"):
+        list(run_many(models, keep_outputs=True))
+    with pytest.raises(ValueError, match="scratch_dir"):
+        list(run_pipelined(models, keep_outputs=True))
+
+
+def test_run_many_returns_timeouts(
+    make_shoebox_model: Callable[..., Model], tmp_path: Path
+):
+    """A model which exceeds its limits is reported as a failed run with the timeout."""
+    models = [make_shoebox_model(num_stories=1)]
+
+    (result,) = run_many(
+        models,
+        max_workers=1,
+        weather_dir=tmp_path / "weather",
+        limits=RunLimits(wall_seconds=0.01, poll_interval=0.01),
+    )
+
+    assert not result.succeeded
+    assert result.timeout is not None
+    assert result.timeout.limit == "wall"
+    assert result.err_text == result.timeout.err_text
+    assert result.energy_and_peak is None
+
+
+def test_run_pipelined_matches_run(
+    make_shoebox_model: Callable[..., Model], tmp_path: Path
+):
+    """The staged pipeline should produce the same results as running each model directly."""
+    models = [make_shoebox_model(num_stories=n) for n in (1, 2, 3)]
+    models.append(
+        make_shoebox_model(num_stories=1, weather=tmp_path / "does-not-exist.zip")
+    )
+
+    results = sorted(
+        run_pipelined(
+            models,
+            build_workers=2,
+            simulate_workers=2,
+            postprocess_workers=1,
+            queue_size=1,
+            weather_dir=tmp_path / "weather",
+        ),
+        key=lambda r: r.index,
+    )
+
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert not results[3].succeeded
+    for model, result in zip(models[:3], results[:3], strict=True):
+        assert result.succeeded
+        assert result.energy_and_peak is not None
+        expected = model.run(weather_dir=tmp_path / "weather")
+        pd.testing.assert_series_equal(result.energy_and_peak, expected.energy_and_peak)
+
+
+def test_run_pipelined_records_runtimes(
+    make_shoebox_model: Callable[..., Model], tmp_path: Path
+):
+    """Runs are built longest first and their stage timings are recorded."""
+    models = [make_shoebox_model(num_stories=n) for n in (1, 4, 2)]
+    cost_model = RuntimeCostModel()
+    output_plan = plan_outputs(
+        energyplus_settings.archetypal_energyplus_version.major, overheating=False
+    )
+    assert submission_order(models, cost_model, output_plan) == [1, 2, 0]
+
+    runtime_log = RuntimeLog(path=tmp_path / "runtimes.jsonl")
+    results = list(
+        run_pipelined(
+            models,
+            simulate_workers=1,
+            weather_dir=tmp_path / "weather",
+            cost_model=cost_model,
+            runtime_log=runtime_log,
+        )
+    )
+
+    assert all(r.succeeded for r in results)
+    runs = runtime_log.load()
+    assert len(runs) == 3
+    assert sorted(run.features.zones for run in runs) == [1, 2, 3]
+    assert all(run.simulate_seconds > 0 for run in runs)
+    for result in results:
+        assert result.features == estimate_features(models[result.index], output_plan)
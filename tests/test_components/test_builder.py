@@ -1,44 +1,381 @@
 """Test the builder."""
 
-from prisma import Prisma
+import asyncio
+from collections.abc import Callable
+from pathlib import Path
 
-from epinterface.data import DefaultEPWZipPath
-from epinterface.geometry import ShoeboxGeometry
-from epinterface.sbem.builder import AtticAssumptions, BasementAssumptions, Model
-from epinterface.sbem.prisma.client import deep_fetcher
+import pandas as pd
+import pytest
 
+from epinterface.analysis.design_loads import design_loads_postprocess
+from epinterface.analysis.overheating import (
+    OVERHEATING_HOURLY_VARIABLES,
+    OverheatingAnalysisConfig,
+)
+from epinterface.analysis.representative_days import RepresentativeDaysConfig
+from epinterface.executor import EnergyPlusTimeoutError, RunLimits
+from epinterface.geometry import GeometryCache
+from epinterface.interface import FIDELITY_PROFILES
+from epinterface.sbem.builder import Model
+from epinterface.sbem.cache import (
+    BuildCaches,
+    BuiltIDFCache,
+    PrototypeIDFCache,
+    IdealLoadsSizing,
+    ResultCache,
+    SizingCache,
+)
+from epinterface.settings import energyplus_settings
 
-def test_builder(preseeded_readonly_db: Prisma):
+
+def test_builder(make_shoebox_model: Callable[..., Model]):
     """Test the builder."""
-    _, zone = deep_fetcher.Zone.get_deep_object("default_zone", preseeded_readonly_db)
-
-    model = Model(
-        Weather=DefaultEPWZipPath,
-        Zone=zone,
-        Basement=BasementAssumptions(
-            Conditioned=False,
-            UseFraction=None,
-        ),
-        Attic=AtticAssumptions(
-            Conditioned=False,
-            UseFraction=None,
-        ),
-        geometry=ShoeboxGeometry(
-            x=0,
-            y=0,
-            w=10,
-            d=10,
-            h=3,
-            wwr=0.2,
-            num_stories=2,
-            basement=False,
-            zoning="by_storey",
-            roof_height=None,
-        ),
-    )
+    model = make_shoebox_model(num_stories=2)
 
     _r = model.run()
 
 
+@pytest.mark.asyncio
+async def test_builder_arun(make_shoebox_model: Callable[..., Model]):
+    """Test that concurrent async runs match the blocking run."""
+    model = make_shoebox_model(num_stories=2)
+
+    semaphore = asyncio.Semaphore(2)
+    results = await asyncio.gather(*[model.arun(semaphore=semaphore) for _ in range(3)])
+    sync_result = model.run()
+
+    for r in results:
+        pd.testing.assert_series_equal(r.energy_and_peak, sync_result.energy_and_peak)
+
+
+def test_builder_result_cache(make_shoebox_model: Callable[..., Model], tmp_path: Path):
+    """Test that a second identical run is served from the result cache."""
+    model = make_shoebox_model(num_stories=2)
+    cache = ResultCache(cache_dir=tmp_path / "results")
+
+    first = model.run(result_cache=cache)
+    second = model.run(result_cache=cache)
+
+    assert first.idf is not None
+    assert second.idf is None
+    assert second.sql is None
+    assert len(cache.entries()) == 1
+    pd.testing.assert_series_equal(first.energy_and_peak, second.energy_and_peak)
+    assert first.err_text == second.err_text
+
+    changed = model.model_copy(
+        update={"geometry": model.geometry.model_copy(update={"wwr": 0.3})}
+    )
+    third = changed.run(result_cache=cache)
+    assert third.idf is not None
+    assert len(cache.entries()) == 2
+
+
+def test_builder_idf_cache(make_shoebox_model: Callable[..., Model], tmp_path: Path):
+    """Test that a model rebuilt from the IDF cache simulates identically."""
+    model = make_shoebox_model(num_stories=2)
+    caches = BuildCaches(idf=BuiltIDFCache(cache_dir=tmp_path / "idfs"))
+
+    first = model.run(build_caches=caches)
+    assert caches.idf is not None
+    assert len(caches.idf.entries()) == 1
+    second = model.run(build_caches=caches)
+
+    assert len(caches.idf.entries()) == 1
+    assert second.idf is not None
+    assert len(second.idf.idfobjects["OUTPUT:SQLITE"]) == 1
+    pd.testing.assert_series_equal(first.energy_and_peak, second.energy_and_peak)
+
+
+def test_builder_prototype_cache(
+    make_shoebox_model: Callable[..., Model], tmp_path: Path
+):
+    """Test that models built from a cached prototype and geometry match models built from scratch."""
+    caches = BuildCaches(
+        prototype=PrototypeIDFCache(cache_dir=tmp_path / "protos"),
+        geometry=GeometryCache(cache_dir=tmp_path / "geometry"),
+    )
+    for num_stories in (1, 2):
+        model = make_shoebox_model(num_stories=num_stories)
+        expected = model.run()
+        cached = model.run(build_caches=caches)
+        pd.testing.assert_series_equal(expected.energy_and_peak, cached.energy_and_peak)
+
+    assert caches.prototype is not None
+    assert len(caches.prototype.entries()) == 1
+    assert caches.geometry is not None
+    assert len(caches.geometry.entries()) == 2
+
+
+def test_builder_floor_multiplier(make_shoebox_model: Callable[..., Model]):
+    """Test that a floor-multiplied model weights its zones by area and approximates the full model."""
+    model = make_shoebox_model(num_stories=6)
+    multiplied = model.model_copy(
+        update={
+            "geometry": model.geometry.model_copy(update={"floor_multiplier": True})
+        }
+    )
+
+    expected = model.run()
+    result = multiplied.run()
+
+    assert result.idf is not None
+    assert len(result.idf.idfobjects["ZONE"]) == 3
+    zone_weights, _ = Model.get_zone_weights_and_names(result.idf)
+    assert zone_weights.sum() == pytest.approx(multiplied.total_conditioned_area)
+    assert multiplied.total_conditioned_area == model.total_conditioned_area
+    assert result.energy_and_peak["Energy"].sum() == pytest.approx(
+        expected.energy_and_peak["Energy"].sum(), rel=0.02
+    )
+
+
+def test_builder_output_plan(make_shoebox_model: Callable[..., Model]):
+    """Test that a model only writes the outputs read by the requested analyses."""
+    model = make_shoebox_model(num_stories=1)
+
+    energy_only = model.run()
+    with_overheating = model.run(overheating_config=OverheatingAnalysisConfig())
+
+    assert energy_only.idf is not None
+    assert with_overheating.idf is not None
+    assert len(energy_only.idf.idfobjects["OUTPUT:VARIABLE"]) == 0
+    assert {
+        o.Variable_Name for o in with_overheating.idf.idfobjects["OUTPUT:VARIABLE"]
+    } == set(OVERHEATING_HOURLY_VARIABLES)
+    assert len(energy_only.idf.idfobjects["OUTPUT:METER"]) == len(
+        with_overheating.idf.idfobjects["OUTPUT:METER"]
+    )
+    assert with_overheating.overheating_results is not None
+    pd.testing.assert_series_equal(
+        energy_only.energy_and_peak, with_overheating.energy_and_peak
+    )
+
+
+def test_builder_tabular_cross_check(
+    make_shoebox_model: Callable[..., Model], monkeypatch: pytest.MonkeyPatch
+):
+    """Test that meter-only results match the results cross-checked against the tabular reports."""
+    model = make_shoebox_model(num_stories=1)
+
+    meters_only = model.run()
+    monkeypatch.setattr(energyplus_settings, "tabular_cross_check", True)
+    cross_checked = model.run()
+
+    assert meters_only.idf is not None
+    assert cross_checked.idf is not None
+    assert len(meters_only.idf.idfobjects["OUTPUT:TABLE:SUMMARYREPORTS"]) == 0
+    assert len(cross_checked.idf.idfobjects["OUTPUT:TABLE:SUMMARYREPORTS"]) == 1
+    pd.testing.assert_series_equal(
+        meters_only.energy_and_peak, cross_checked.energy_and_peak
+    )
+
+
+def test_builder_direct_executor(
+    make_shoebox_model: Callable[..., Model], monkeypatch: pytest.MonkeyPatch
+):
+    """Test that launching EnergyPlus directly gives the same results as `IDF.simulate`."""
+    model = make_shoebox_model(num_stories=1)
+
+    archetypal = model.run()
+    monkeypatch.setattr(energyplus_settings, "executor", "direct")
+    direct = model.run()
+
+    assert direct.idf is not None
+    assert direct.idf.sql_file is not None
+    pd.testing.assert_series_equal(archetypal.energy_and_peak, direct.energy_and_peak)
+
+
+def test_builder_native_ideal_loads_parity(
+    make_shoebox_model: Callable[..., Model], monkeypatch: pytest.MonkeyPatch
+):
+    """Test that the native ideal loads backend reproduces the template results without HVAC templates."""
+    model = make_shoebox_model(num_stories=2, zoning="core/perim")
+
+    template = model.run()
+    monkeypatch.setattr(energyplus_settings, "ideal_loads_backend", "native")
+    native = model.run()
+
+    assert template.idf is not None
+    assert native.idf is not None
+    assert len(template.idf.idfobjects["HVACTEMPLATE:ZONE:IDEALLOADSAIRSYSTEM"]) == 10
+    assert len(native.idf.idfobjects["HVACTEMPLATE:ZONE:IDEALLOADSAIRSYSTEM"]) == 0
+    assert len(native.idf.idfobjects["ZONEHVAC:IDEALLOADSAIRSYSTEM"]) == 10
+    pd.testing.assert_series_equal(
+        template.energy_and_peak, native.energy_and_peak, rtol=1e-6
+    )
+
+
 # TODO: add parameterized tests for different attic/basement configurations
 # and check almost all individual parameters in the returned idf model.
+
+
+def test_builder_fidelity(make_shoebox_model: Callable[..., Model], tmp_path: Path):
+    """Test that fidelity profiles configure the model and stay close to the detailed results."""
+    model = make_shoebox_model(num_stories=1)
+    caches = BuildCaches(prototype=PrototypeIDFCache(cache_dir=tmp_path / "protos"))
+
+    results = {
+        profile: model.model_copy(update={"Fidelity": profile}).run(build_caches=caches)
+        for profile in FIDELITY_PROFILES
+    }
+
+    for profile, result in results.items():
+        assert result.idf is not None
+        (timestep,) = result.idf.idfobjects["TIMESTEP"]
+        assert (
+            timestep.Number_of_Timesteps_per_Hour
+            == FIDELITY_PROFILES[profile].timesteps_per_hour
+        )
+        assert result.energy_and_peak["Energy"].sum() == pytest.approx(
+            results["detailed"].energy_and_peak["Energy"].sum(), rel=0.02
+        )
+    assert caches.prototype is not None
+    assert len(caches.prototype.entries()) == len(FIDELITY_PROFILES)
+
+
+def test_builder_sizing_cache(make_shoebox_model: Callable[..., Model], tmp_path: Path):
+    """Test that a run which only changes postprocessing inputs reuses the cached sizes."""
+    model = make_shoebox_model(num_stories=2)
+    zone = model.Zone
+    ops = zone.Operations
+    cheaper_dhw = model.model_copy(
+        update={
+            "Zone": zone.model_copy(
+                update={
+                    "Operations": ops.model_copy(
+                        update={
+                            "DHW": ops.DHW.model_copy(
+                                update={"SystemCOP": ops.DHW.SystemCOP * 2}
+                            )
+                        }
+                    )
+                }
+            )
+        }
+    )
+    caches = BuildCaches(sizing=SizingCache(cache_dir=tmp_path / "sizing"))
+
+    first = model.run(build_caches=caches)
+    second = cheaper_dhw.run(build_caches=caches)
+
+    assert caches.sizing is not None
+    assert len(caches.sizing.entries()) == 1
+    assert model.sizing_cache_key(tmp_path / "weather") == cheaper_dhw.sizing_cache_key(
+        tmp_path / "weather"
+    )
+    assert first.idf is not None
+    assert second.idf is not None
+    (first_control,) = first.idf.idfobjects["SIMULATIONCONTROL"]
+    (second_control,) = second.idf.idfobjects["SIMULATIONCONTROL"]
+    assert first_control.Run_Simulation_for_Sizing_Periods == "Yes"
+    assert second_control.Run_Simulation_for_Sizing_Periods == "No"
+    pd.testing.assert_series_equal(
+        first.energy_and_peak.xs("Raw", level="Aggregation"),
+        second.energy_and_peak.xs("Raw", level="Aggregation"),
+        rtol=1e-6,
+    )
+
+
+def test_builder_sizing_cache_never_records_empty_sizes(
+    make_shoebox_model: Callable[..., Model],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that a hard-sized run evicted mid-flight, or an empty entry, never poisons the cache."""
+    model = make_shoebox_model(num_stories=1)
+    sizing_cache = SizingCache(cache_dir=tmp_path / "sizing")
+    caches = BuildCaches(sizing=sizing_cache)
+    model.run(build_caches=caches)
+    (key,) = [path.stem for path in sizing_cache.entries()]
+
+    # another process clears the shared cache while the hard-sized run simulates
+    get = SizingCache.get
+
+    def get_then_clear(self: SizingCache, key: str) -> IdealLoadsSizing | None:
+        sizing = get(self, key)
+        self.clear()
+        return sizing
+
+    with monkeypatch.context() as m:
+        m.setattr(SizingCache, "get", get_then_clear)
+        hard_sized = model.run(build_caches=caches)
+
+    assert hard_sized.idf is not None
+    (sim_control,) = hard_sized.idf.idfobjects["SIMULATIONCONTROL"]
+    assert sim_control.Run_Simulation_for_Sizing_Periods == "No"
+    assert sizing_cache.entries() == []
+
+    # an entry which sizes nothing is discarded and replaced by an autosized run
+    sizing_cache.put(key, IdealLoadsSizing())
+    autosized = model.run(build_caches=caches)
+
+    assert autosized.idf is not None
+    (sim_control,) = autosized.idf.idfobjects["SIMULATIONCONTROL"]
+    assert sim_control.Run_Simulation_for_Sizing_Periods == "Yes"
+    recorded = sizing_cache.get(key)
+    assert recorded is not None
+    assert recorded.systems
+
+
+def test_builder_size(make_shoebox_model: Callable[..., Model], tmp_path: Path):
+    """Test that a sizing-only run finds the same design loads as an annual run."""
+    model = make_shoebox_model(num_stories=2)
+
+    design_loads = model.size()
+    annual = model.run(eplus_parent_dir=tmp_path)
+
+    assert annual.sql is not None
+    expected = design_loads_postprocess(
+        annual.sql, normalizing_floor_area=model.total_conditioned_area
+    )
+    pd.testing.assert_frame_equal(design_loads.zones, expected.zones)
+    pd.testing.assert_series_equal(design_loads.building, expected.building)
+    assert set(design_loads.zones.index.get_level_values("Load Type")) == {
+        "Heating",
+        "Cooling",
+    }
+
+
+def test_builder_representative_days(make_shoebox_model: Callable[..., Model]):
+    """Test that a run of representative days reconstructs the annual results."""
+    model = make_shoebox_model(num_stories=2)
+
+    annual = model.run()
+    reduced = model.run(representative_days=RepresentativeDaysConfig(n_days=24))
+
+    assert reduced.energy_and_peak.index.equals(annual.energy_and_peak.index)
+    assert reduced.energy_and_peak["Energy"].sum() == pytest.approx(
+        annual.energy_and_peak["Energy"].sum(), rel=0.15
+    )
+    with pytest.raises(ValueError, match="overheating"):
+        model.run(
+            representative_days=RepresentativeDaysConfig(),
+            overheating_config=OverheatingAnalysisConfig(),
+        )
+
+
+def test_builder_retries_timeouts_at_the_retry_fidelity(
+    make_shoebox_model: Callable[..., Model],
+):
+    """Test that a timed out run is retried once at the retry fidelity with the scaled limits."""
+    model = make_shoebox_model(num_stories=1)
+    limits = RunLimits(wall_seconds=0.01, poll_interval=0.01)
+
+    with pytest.raises(EnergyPlusTimeoutError):
+        model.run(limits=limits)
+
+    retried = model.run(
+        limits=limits.model_copy(
+            update={"retry_fidelity": "screening", "retry_scale": 100_000}
+        )
+    )
+
+    assert retried.retried_after is not None
+    assert retried.retried_after.limit == "wall"
+    assert retried.retried_after.limit_seconds == 0.01
+    assert retried.idf is not None
+    (timestep,) = retried.idf.idfobjects["TIMESTEP"]
+    assert (
+        timestep.Number_of_Timesteps_per_Hour
+        == FIDELITY_PROFILES["screening"].timesteps_per_hour
+    )
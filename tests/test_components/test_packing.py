@@ -0,0 +1,156 @@
+"""Test packing several models into a single EnergyPlus run."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from archetypal.idfclass import IDF
+
+from epinterface.data import EnergyPlusArtifactDir
+from epinterface.geometry import ShoeboxGeometry
+from epinterface.interface import add_default_schedules, add_default_sim_controls
+from epinterface.sbem.builder import Model
+from epinterface.sbem.cache import BuildCaches, SizingCache
+from epinterface.sbem.packing import namespace_idf, pack_idfs, run_packed
+from epinterface.settings import energyplus_settings
+
+
+def shoebox_idf(tmp_path: Path) -> IDF:
+    """Make a shoebox IDF model without any components."""
+    version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=version.dot,
+        file_version=version.dot,
+        prep_outputs=False,
+        output_directory=tmp_path.as_posix(),
+    )
+    idf = add_default_sim_controls(idf)
+    idf, _ = add_default_schedules(idf)
+    return ShoeboxGeometry(
+        x=0,
+        y=0,
+        w=10,
+        d=10,
+        h=3,
+        wwr=0.2,
+        num_stories=2,
+        basement=False,
+        zoning="by_storey",
+        roof_height=None,
+    ).add(idf)
+
+
+def test_namespace_idf_keeps_references(tmp_path: Path):
+    """Names and the references to them are prefixed, but site-level objects are not."""
+    idf = shoebox_idf(tmp_path)
+    building_name = idf.idfobjects["BUILDING"][0].Name
+    run_period_name = idf.idfobjects["RUNPERIOD"][0].Name
+
+    namespace_idf(idf, "B1 ")
+
+    zone_names = {zone.Name for zone in idf.idfobjects["ZONE"]}
+    construction_names = {c.Name for c in idf.idfobjects["CONSTRUCTION"]}
+    assert all(name.startswith("B1 ") for name in zone_names)
+    for surface in idf.idfobjects["BUILDINGSURFACE:DETAILED"]:
+        assert surface.Name.startswith("B1 ")
+        assert surface.Zone_Name in zone_names
+        assert surface.Construction_Name in construction_names
+        if surface.Outside_Boundary_Condition == "Surface":
+            assert surface.Outside_Boundary_Condition_Object.startswith("B1 ")
+    assert idf.idfobjects["BUILDING"][0].Name == building_name
+    assert idf.idfobjects["RUNPERIOD"][0].Name == run_period_name
+
+
+def test_pack_idfs_places_buildings_apart(tmp_path: Path):
+    """Packed buildings are merged, spaced apart and each made its own shading zone group."""
+    idfs = [shoebox_idf(tmp_path / f"building_{i}") for i in range(3)]
+    n_zones = len(idfs[0].idfobjects["ZONE"])
+
+    packed = pack_idfs(idfs, energyplus_settings.archetypal_energyplus_version.major)
+
+    assert len(packed.idfobjects["ZONE"]) == 3 * n_zones
+    assert len(packed.idfobjects["BUILDING"]) == 1
+    xs = {
+        prefix: [
+            x
+            for surface in packed.idfobjects["BUILDINGSURFACE:DETAILED"]
+            if surface.Name.startswith(prefix)
+            for x, _, _ in surface.coords
+        ]
+        for prefix in ("B0 ", "B1 ", "B2 ")
+    }
+    # 6m tall buildings cast shadows up to ~172m long at a solar altitude of 2 degrees
+    assert min(xs["B1 "]) - max(xs["B0 "]) > 170
+    assert min(xs["B2 "]) - max(xs["B1 "]) > 170
+    shadow_calculation = packed.idfobjects["SHADOWCALCULATION"][0]
+    assert (
+        shadow_calculation.Disable_SelfShading_From_Shading_Zone_Groups_to_Other_Zones
+        == "Yes"
+    )
+    assert shadow_calculation.Shading_Zone_Group_3_ZoneList_Name == (
+        "B2 Shading Zone Group"
+    )
+
+
+def test_pack_idfs_requires_shared_site(tmp_path: Path):
+    """Models with different simulation controls cannot be packed."""
+    idfs = [shoebox_idf(tmp_path / f"building_{i}") for i in range(2)]
+    idfs[1].idfobjects["TIMESTEP"][0].Number_of_Timesteps_per_Hour = 4
+
+    with pytest.raises(ValueError, match="site-level objects"):
+        pack_idfs(idfs, energyplus_settings.archetypal_energyplus_version.major)
+
+
+def test_run_packed_matches_separate_runs(make_shoebox_model: Callable[..., Model]):
+    """Each packed building gets the results it would get when run on its own."""
+    models = [
+        make_shoebox_model(num_stories=1),
+        make_shoebox_model(num_stories=2, zoning="core/perim"),
+    ]
+
+    packed = run_packed(models)
+
+    assert len(packed) == 2
+    assert packed[0].idf is packed[1].idf
+    for model, result in zip(models, packed, strict=True):
+        separate = model.run()
+        # the packed model warms up until every building has converged, so
+        # the results differ from the separate runs by a little more than rounding
+        pd.testing.assert_series_equal(
+            separate.energy_and_peak, result.energy_and_peak, rtol=1e-3
+        )
+
+
+def test_run_packed_mixes_sizing_cache_hits_and_misses(
+    make_shoebox_model: Callable[..., Model], tmp_path: Path
+):
+    """A model with cached sizes can be packed with one without, since packs are always sized."""
+    hit = make_shoebox_model(num_stories=1)
+    miss = make_shoebox_model(num_stories=2, zoning="core/perim")
+    caches = BuildCaches(sizing=SizingCache(cache_dir=tmp_path / "sizing"))
+    hit.run(build_caches=caches)
+    assert caches.sizing is not None
+    assert len(caches.sizing.entries()) == 1
+
+    packed = run_packed([hit, miss], build_caches=caches)
+
+    assert len(packed) == 2
+    assert packed[0].idf is not None
+    (sim_control,) = packed[0].idf.idfobjects["SIMULATIONCONTROL"]
+    assert sim_control.Run_Simulation_for_Sizing_Periods == "Yes"
+    assert len(caches.sizing.entries()) == 1
+
+
+def test_run_packed_requires_shared_weather(
+    make_shoebox_model: Callable[..., Model], tmp_path: Path
+):
+    """Models with different weather files cannot be packed."""
+    models = [
+        make_shoebox_model(num_stories=1),
+        make_shoebox_model(num_stories=1, weather=tmp_path / "other.zip"),
+    ]
+
+    with pytest.raises(ValueError, match="weather file"):
+        run_packed(models)
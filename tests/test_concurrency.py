@@ -0,0 +1,114 @@
+"""Test the resource-aware concurrency controller."""
+
+import pytest
+
+from epinterface.sbem.concurrency import (
+    GiB,
+    MiB,
+    ConcurrencyController,
+    SystemSample,
+)
+
+
+def sample(
+    runnable_tasks: float = 4.0, available_memory: int = 64 * GiB
+) -> SystemSample:
+    """Make a sample of an 8 CPU machine."""
+    return SystemSample(
+        cpu_percent=100 * min(1.0, runnable_tasks / 8),
+        runnable_tasks=runnable_tasks,
+        available_memory=available_memory,
+    )
+
+
+class FakeSystem:
+    """An 8 CPU machine whose run queue and available memory are set by the test."""
+
+    def __init__(self, runnable_tasks: float = 4.0, available_memory: int = 64 * GiB):
+        """Initialize the machine."""
+        self.sample = sample(runnable_tasks, available_memory)
+
+    def __call__(self) -> SystemSample:
+        """Sample the machine."""
+        return self.sample
+
+
+def make_controller(system: FakeSystem, **kwargs) -> ConcurrencyController:
+    """Make a controller which samples the fake machine on every update."""
+    return ConcurrencyController(
+        max_workers=8,
+        cpu_count=8,
+        memory_reserve=1 * GiB,
+        default_run_memory=1 * GiB,
+        interval=0.0,
+        sampler=system,
+        **kwargs,
+    )
+
+
+def test_a_fully_busy_cpu_keeps_the_limit():
+    """One runnable thread per core is the goal, not a sign of oversubscription."""
+    controller = make_controller(FakeSystem(runnable_tasks=8.0))
+
+    assert [controller.update(running=8) for _ in range(3)] == [8, 8, 8]
+
+
+def test_run_queue_feedback_moves_the_limit_one_run_at_a_time():
+    """The limit drops while the CPU is oversubscribed and recovers once cores are idle."""
+    system = FakeSystem(runnable_tasks=12.0)
+    controller = make_controller(system)
+
+    assert [controller.update(running=controller.limit) for _ in range(3)] == [7, 6, 5]
+
+    system.sample = sample(runnable_tasks=8.0)
+    assert controller.update(running=5) == 5
+    system.sample = sample(runnable_tasks=5.0)
+    # not every allowed run is busy, so there is no evidence more would help
+    assert controller.update(running=2) == 5
+    assert controller.update(running=5) == 6
+
+
+def test_memory_bounds_the_limit_by_the_peak_of_recent_runs():
+    """Only as many runs start as fit in the available memory less the reserve."""
+    system = FakeSystem(available_memory=5 * GiB)
+    controller = make_controller(system)
+
+    assert controller.update(running=0) == 4
+
+    controller.record_run(2 * GiB)
+    controller.record_run(None)
+    assert controller.run_memory == 2 * GiB
+    assert controller.update(running=1) == 3
+
+    system.sample = sample(available_memory=512 * MiB)
+    assert controller.update(running=3) == 3
+    system.sample = sample(available_memory=0)
+    assert controller.update(running=0) == 1
+
+
+def test_metrics_record_every_decision():
+    """Each sample is recorded with the measurements and the reason for the limit."""
+    system = FakeSystem(runnable_tasks=12.0)
+    controller = make_controller(system)
+    controller.update(running=8)
+    system.sample = sample(available_memory=2 * GiB)
+    controller.update(running=1)
+
+    metrics = controller.metrics()
+
+    assert metrics["limit"].tolist() == [7, 2]
+    assert metrics["reason"].tolist() == ["cpu oversubscribed", "memory"]
+    assert metrics.index[0] == 0.0
+
+
+def test_max_workers_defaults_to_the_cores_per_energyplus_threads(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Runs with several EnergyPlus threads share the cores between them."""
+    monkeypatch.setattr("os.cpu_count", lambda: 16)
+
+    controller = ConcurrencyController(energyplus_threads=4, sampler=FakeSystem())
+
+    assert controller.max_workers == 4
+    with pytest.raises(ValueError, match="energyplus_threads"):
+        ConcurrencyController(energyplus_threads=0, sampler=FakeSystem())
@@ -0,0 +1,152 @@
+"""Test the runtime cost model and the longest-first batch ordering."""
+
+from pathlib import Path
+
+import pytest
+from archetypal.idfclass import IDF
+
+from epinterface.analysis.energy_and_peak import required_outputs
+from epinterface.analysis.overheating import (
+    required_outputs as overheating_outputs,
+)
+from epinterface.data import EnergyPlusArtifactDir
+from epinterface.geometry import ShoeboxGeometry
+from epinterface.interface import FIDELITY_PROFILES
+from epinterface.sbem.cost import (
+    RecordedRun,
+    RunFeatures,
+    RuntimeCostModel,
+    RuntimeLog,
+    longest_first,
+)
+from epinterface.settings import energyplus_settings
+
+
+@pytest.mark.parametrize(
+    "geometry",
+    [
+        ShoeboxGeometry(
+            x=0,
+            y=0,
+            w=20,
+            d=20,
+            h=3,
+            wwr=0.3,
+            num_stories=1,
+            basement=False,
+            zoning="by_storey",
+            roof_height=None,
+        ),
+        ShoeboxGeometry(
+            x=0,
+            y=0,
+            w=20,
+            d=20,
+            h=3,
+            wwr=0.3,
+            num_stories=2,
+            basement=True,
+            zoning="core/perim",
+            roof_height=2.0,
+        ),
+        ShoeboxGeometry(
+            x=0,
+            y=0,
+            w=20,
+            d=20,
+            h=3,
+            wwr=0.0,
+            num_stories=6,
+            basement=False,
+            zoning="core/perim",
+            roof_height=2.0,
+            floor_multiplier=True,
+            engine="analytic",
+        ),
+    ],
+)
+def test_estimated_features_match_built_model(geometry: ShoeboxGeometry):
+    """The features estimated from a geometry match those counted in the built model."""
+    version = energyplus_settings.archetypal_energyplus_version
+    fidelity = FIDELITY_PROFILES["screening"]
+    output_plan = required_outputs(version.major) | overheating_outputs()
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=version.dot,
+        file_version=version.dot,
+        prep_outputs=False,
+    )
+    idf = output_plan.apply(idf)
+    idf = fidelity.add(idf)
+    idf = geometry.add(idf)
+
+    assert RunFeatures.Estimate(geometry, fidelity, output_plan) == (
+        RunFeatures.FromIDF(idf)
+    )
+
+
+def features(zones: int, timesteps_per_hour: int = 6) -> RunFeatures:
+    """Make the features of a model with six surfaces per zone."""
+    return RunFeatures(
+        zones=zones,
+        surfaces=6 * zones,
+        timesteps_per_hour=timesteps_per_hour,
+        output_values=5 * 8760,
+    )
+
+
+def test_calibrate_recovers_the_runtimes():
+    """Calibrating on runs which follow the cost model recovers its predictions."""
+    truth = RuntimeCostModel(
+        simulate_coefficients=(0.8, 0.01, 0.002, 2e-7),
+        postprocess_coefficients=(0.2, 1e-6),
+    )
+    runs = [
+        RecordedRun(
+            features=features(zones, timesteps_per_hour),
+            simulate_seconds=truth.predict_simulate(
+                features(zones, timesteps_per_hour)
+            ),
+            postprocess_seconds=truth.predict_postprocess(
+                features(zones, timesteps_per_hour)
+            ),
+        )
+        for zones in (1, 2, 5, 10, 20, 40)
+        for timesteps_per_hour in (4, 6)
+    ]
+
+    calibrated = RuntimeCostModel.Calibrate(runs)
+
+    for zones in (3, 30):
+        assert calibrated.predict(features(zones)) == pytest.approx(
+            truth.predict(features(zones)), rel=1e-6
+        )
+        assert all(c >= 0 for c in calibrated.simulate_coefficients)
+    assert RuntimeCostModel.Calibrate(runs[:3]) == RuntimeCostModel()
+
+
+def test_runtime_log_round_trips(tmp_path: Path):
+    """Recorded runs are appended to the log and read back, skipping broken lines."""
+    runtime_log = RuntimeLog(path=tmp_path / "runtimes.jsonl")
+    run = RecordedRun(
+        features=features(5), simulate_seconds=3.0, postprocess_seconds=0.5
+    )
+
+    assert runtime_log.load() == []
+    runtime_log.append([run])
+    with runtime_log.path.open("a") as f:
+        f.write("not json\n")
+    runtime_log.append([run])
+
+    assert runtime_log.load() == [run, run]
+
+
+def test_longest_first_groups_similar_runs_by_weather():
+    """Runs are ordered by cost band, then grouped by weather file within a band."""
+    costs = [2.1, 30.0, 2.5, 3.9, 31.0, 0.5]
+    weather_keys = ["b", "a", "a", "b", "b", "a"]
+
+    order = longest_first(costs, weather_keys)
+
+    # 16-32s: a then b; 2-4s: a then b (longest first within each); <1s last
+    assert order == [1, 4, 2, 3, 0, 5]
@@ -0,0 +1,171 @@
+"""Tests for launching EnergyPlus without `IDF.simulate`."""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from archetypal.idfclass import IDF
+from archetypal.idfclass.sql import Sql
+
+from epinterface.data import DefaultEPWPath, EnergyPlusArtifactDir
+from epinterface.executor import (
+    EnergyPlusRun,
+    EnergyPlusRunError,
+    EnergyPlusTimeoutError,
+    EnergyPlusWorkerPool,
+    RunLimits,
+    simulate_idf,
+    threads_env,
+)
+from epinterface.interface import add_default_sim_controls
+from epinterface.settings import energyplus_settings
+
+
+@pytest.fixture
+def minimal_idf(tmp_path: Path) -> IDF:
+    """The minimal IDF model with the default simulation controls."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        epw=DefaultEPWPath,
+        prep_outputs=False,
+        output_directory=tmp_path.as_posix(),
+    )
+    idf.newidfobject("OUTPUT:SQLITE", Option_Type="SimpleAndTabular")
+    return add_default_sim_controls(idf)
+
+
+def test_direct_executor_returns_the_sql_path(
+    minimal_idf: IDF, monkeypatch: pytest.MonkeyPatch
+):
+    """The direct executor should leave the results where `IDF.simulate` would."""
+    monkeypatch.setattr(energyplus_settings, "executor", "direct")
+
+    sql_path = simulate_idf(minimal_idf)
+
+    assert sql_path.exists()
+    assert sql_path == Path(minimal_idf.sql_file)
+    assert any(Path(f).suffix == ".err" for f in minimal_idf.simulation_files)
+
+
+def test_direct_executor_only_passes_the_flags_the_model_needs(minimal_idf: IDF):
+    """ExpandObjects and ReadVarsESO should only run when asked for."""
+    run = EnergyPlusRun.Prepare(minimal_idf)
+    assert "-x" not in run.cmd
+    assert "-r" not in run.cmd
+    assert run.cmd[-1] == run.idf_path.as_posix()
+
+    run = EnergyPlusRun.Prepare(minimal_idf, expand_objects=True, readvars=True)
+    assert "-x" in run.cmd
+    assert "-r" in run.cmd
+
+
+def test_direct_executor_reports_the_exit_code_and_error_file(minimal_idf: IDF):
+    """A failed run should raise with the exit code and the contents of the .err file."""
+    for building in list(minimal_idf.idfobjects["BUILDING"]):
+        minimal_idf.removeidfobject(building)
+    run = EnergyPlusRun.Prepare(minimal_idf)
+
+    with pytest.raises(EnergyPlusRunError) as excinfo:
+        run.run()
+
+    assert excinfo.value.returncode not in (None, 0)
+    assert "Severe" in excinfo.value.stderr
+    assert not run.run_dir.exists()
+
+
+def test_in_process_executor_matches_the_subprocess(minimal_idf: IDF):
+    """Consecutive in-process runs on one worker should match a fresh EnergyPlus process."""
+    run = EnergyPlusRun.Prepare(minimal_idf)
+    run.run()
+    expected = Sql(run.sql_path.as_posix()).tabular_data_by_name(
+        "AnnualBuildingUtilityPerformanceSummary", "Site and Source Energy"
+    )
+
+    with EnergyPlusWorkerPool(max_workers=1) as pool:
+        for _ in range(2):
+            run = EnergyPlusRun.Prepare(minimal_idf)
+            pool.run(run)
+            assert run.sql_path.exists()
+            pd.testing.assert_frame_equal(
+                Sql(run.sql_path.as_posix()).tabular_data_by_name(
+                    "AnnualBuildingUtilityPerformanceSummary", "Site and Source Energy"
+                ),
+                expected,
+            )
+
+
+def test_in_process_executor_reports_failures(minimal_idf: IDF):
+    """A failed in-process run should raise like a failed subprocess, and leave the worker usable."""
+    for building in list(minimal_idf.idfobjects["BUILDING"]):
+        minimal_idf.removeidfobject(building)
+
+    with EnergyPlusWorkerPool(max_workers=1) as pool:
+        for _ in range(2):
+            with pytest.raises(EnergyPlusRunError) as excinfo:
+                pool.run(EnergyPlusRun.Prepare(minimal_idf))
+            assert excinfo.value.returncode not in (None, 0)
+            assert "Severe" in excinfo.value.stderr
+
+
+def test_in_process_executor_recovers_from_a_crashed_worker(minimal_idf: IDF):
+    """A crashed worker fails its run, and the pool restarts for the next run."""
+    with EnergyPlusWorkerPool(max_workers=1) as pool:
+        # crash the worker as EnergyPlus would on std::bad_alloc
+        pool._pool.submit(os._exit, 1).exception()
+        with pytest.raises(EnergyPlusRunError, match="crashed"):
+            pool.run(EnergyPlusRun.Prepare(minimal_idf))
+
+        run = EnergyPlusRun.Prepare(minimal_idf)
+        pool.run(run)
+
+    assert run.sql_path.exists()
+
+
+def test_direct_executor_pins_threads_and_records_peak_memory(
+    minimal_idf: IDF, monkeypatch: pytest.MonkeyPatch
+):
+    """Runs should default to the configured thread count and record their peak memory."""
+    monkeypatch.setattr(energyplus_settings, "energyplus_threads", 2)
+    run = EnergyPlusRun.Prepare(minimal_idf)
+    assert run.threads == 2
+    assert threads_env(run.threads)["OMP_NUM_THREADS"] == "2"
+    assert EnergyPlusRun.Prepare(minimal_idf, threads=1).threads == 1
+
+    run.run()
+
+    assert run.peak_memory is not None
+    assert run.peak_memory > 0
+
+
+def test_run_limits_name_the_exceeded_limit():
+    """The wall-clock limit is checked before the CPU-time limit."""
+    limits = RunLimits(wall_seconds=10, cpu_seconds=5)
+
+    assert limits.exceeded(1.0, 1.0) is None
+    assert limits.exceeded(11.0, 6.0) == ("wall", 10)
+    assert limits.exceeded(1.0, 6.0) == ("cpu", 5)
+    assert RunLimits().exceeded(1e6, 1e6) is None
+
+    retry = RunLimits(
+        wall_seconds=10, retry_fidelity="screening", retry_scale=3
+    ).for_retry()
+    assert retry == RunLimits(wall_seconds=30, retry_scale=3)
+
+
+def test_direct_executor_kills_runs_which_exceed_their_limits(minimal_idf: IDF):
+    """A timed out run is killed, its staging directory removed, and the timeout described."""
+    run = EnergyPlusRun.Prepare(minimal_idf)
+
+    with pytest.raises(EnergyPlusTimeoutError) as excinfo:
+        run.run(RunLimits(wall_seconds=0.01, poll_interval=0.01))
+
+    timeout = excinfo.value.timeout
+    assert timeout.limit == "wall"
+    assert timeout.wall_seconds > 0.01
+    assert timeout.err_text == excinfo.value.stderr
+    assert not run.run_dir.exists()
+    assert not run.sql_path.exists()
@@ -8,7 +8,15 @@ from archetypal.idfclass import IDF
 from shapely import Polygon
 
 from epinterface.data import DefaultEPWPath, DefaultMinimalIDFPath
-from epinterface.geometry import ShoeboxGeometry, match_idf_to_building_and_neighbors
+from epinterface.geometry import (
+    GEOMETRY_OBJECT_KEYS,
+    ZONING_DEVIATION_BASE,
+    ZONING_DEVIATION_PER_WWR,
+    GeometryCache,
+    ShoeboxGeometry,
+    get_zone_floor_area,
+    match_idf_to_building_and_neighbors,
+)
 from epinterface.settings import energyplus_settings
 
 
@@ -638,3 +646,304 @@ def test_match_idf_to_geometry_neighbors(
         assert pytest.approx(new_y_min_expected, rel=1e-2) == y_min, (
             f"Expected y_min to be {new_y_min_expected}, found {y_min}"
         )
+
+
+@pytest.mark.parametrize(
+    "zoning, basement, roof_height",
+    [("core/perim", True, 3.5), ("by_storey", False, None)],
+)
+def test_geometry_cache_replays_identical_objects(
+    minimal_idf, tmp_path, zoning, basement, roof_height
+):
+    """Test that geometry replayed from the cache at a new position matches freshly built geometry."""
+    cache = GeometryCache(cache_dir=tmp_path)
+    geom = ShoeboxGeometry(
+        x=3,
+        y=4,
+        w=20,
+        d=15,
+        h=3,
+        num_stories=3,
+        zoning=zoning,
+        basement=basement,
+        wwr=0.3,
+        roof_height=roof_height,
+    )
+    geom.add(minimal_idf, cache=cache)
+    assert len(cache.entries()) == 1
+
+    moved = geom.model_copy(update={"x": -7.5, "y": 11})
+    assert moved.cache_key == geom.cache_key
+
+    def fresh_idf():
+        return IDF(
+            DefaultMinimalIDFPath.as_posix(),
+            epw=DefaultEPWPath.as_posix(),
+            as_version=energyplus_settings.energyplus_version,
+            file_version=energyplus_settings.energyplus_version,
+        )
+
+    # a new cache instance on the same directory exercises the on-disk entries
+    replayed = moved.add(fresh_idf(), cache=GeometryCache(cache_dir=tmp_path))
+    expected = moved.add(fresh_idf())
+
+    for key in GEOMETRY_OBJECT_KEYS:
+        replayed_objs = replayed.idfobjects[key]
+        expected_objs = expected.idfobjects[key]
+        assert len(replayed_objs) == len(expected_objs)
+        for replayed_obj, expected_obj in zip(
+            replayed_objs, expected_objs, strict=True
+        ):
+            for replayed_val, expected_val in zip(
+                replayed_obj.fieldvalues, expected_obj.fieldvalues, strict=True
+            ):
+                if isinstance(expected_val, float):
+                    assert replayed_val == pytest.approx(expected_val, abs=1e-9)
+                else:
+                    assert replayed_val == expected_val
+
+
+def _surface_summary(idf: IDF, key: str) -> dict[str, tuple]:
+    """Summarize the surfaces of an IDF model by name, ignoring the vertex start position."""
+    summary = {}
+    for srf in idf.idfobjects[key]:
+        vertices = frozenset(
+            tuple(round(float(c), 6) + 0.0 for c in vertex) for vertex in srf.coords
+        )
+        if key == "FENESTRATIONSURFACE:DETAILED":
+            summary[srf.Name] = (
+                srf.Building_Surface_Name,
+                srf.Construction_Name,
+                vertices,
+            )
+        else:
+            summary[srf.Name] = (
+                srf.Surface_Type.lower(),
+                srf.Zone_Name,
+                srf.Construction_Name,
+                srf.Outside_Boundary_Condition.lower(),
+                srf.Outside_Boundary_Condition_Object,
+                srf.Sun_Exposure,
+                srf.Wind_Exposure,
+                vertices,
+            )
+    return summary
+
+
+@pytest.mark.parametrize(
+    "zoning, basement, roof_height, num_stories, w, d, wwr",
+    [
+        ("core/perim", True, 3.5, 3, 20, 15, 0.3),
+        ("core/perim", False, None, 1, 12, 18, 0.15),
+        ("core/perim", True, None, 2, 10, 10, 0.05),
+        ("by_storey", True, 2.0, 2, 8, 12, 0.4),
+        ("by_storey", False, None, 4, 15, 9, 0.2),
+    ],
+)
+def test_analytic_engine_matches_geomeppy(
+    zoning, basement, roof_height, num_stories, w, d, wwr
+):
+    """Test that the analytic engine writes the same zones, surfaces, windows and constructions as geomeppy."""
+
+    def build(engine):
+        idf = IDF(
+            DefaultMinimalIDFPath.as_posix(),
+            epw=DefaultEPWPath.as_posix(),
+            as_version=energyplus_settings.energyplus_version,
+            file_version=energyplus_settings.energyplus_version,
+        )
+        geom = ShoeboxGeometry(
+            x=2,
+            y=-3,
+            w=w,
+            d=d,
+            h=3.2,
+            num_stories=num_stories,
+            zoning=zoning,
+            basement=basement,
+            wwr=wwr,
+            roof_height=roof_height,
+            engine=engine,
+        )
+        return geom.add(idf)
+
+    expected = build("geomeppy")
+    analytic = build("analytic")
+
+    assert [z.Name for z in analytic.idfobjects["ZONE"]] == [
+        z.Name for z in expected.idfobjects["ZONE"]
+    ]
+    for key in ("BUILDINGSURFACE:DETAILED", "FENESTRATIONSURFACE:DETAILED"):
+        assert _surface_summary(analytic, key) == _surface_summary(expected, key)
+    for key in ("MATERIAL", "WINDOWMATERIAL:SIMPLEGLAZINGSYSTEM", "CONSTRUCTION"):
+        assert sorted(o.fieldvalues for o in analytic.idfobjects[key]) == sorted(
+            o.fieldvalues for o in expected.idfobjects[key]
+        )
+
+
+def test_analytic_engine_rejects_deep_perimeters():
+    """Test that the analytic engine refuses a perimeter depth which leaves no core."""
+    geom = ShoeboxGeometry(
+        x=0,
+        y=0,
+        w=10,
+        d=6,
+        h=3,
+        num_stories=1,
+        zoning="core/perim",
+        perim_depth=3,
+        engine="analytic",
+    )
+    with pytest.raises(ValueError, match="too deep"):
+        geom.plan_zones()
+
+
+@pytest.mark.parametrize(
+    "zoning, basement, roof_height",
+    [("core/perim", True, 3.5), ("by_storey", True, None), ("by_storey", False, None)],
+)
+def test_floor_multiplier_models_typical_floors(
+    minimal_idf, zoning, basement, roof_height
+):
+    """Test that the floor multiplier models three stories which stand in for the full building's floor area."""
+    geom = ShoeboxGeometry(
+        x=0,
+        y=0,
+        w=20,
+        d=15,
+        h=3,
+        num_stories=12,
+        zoning=zoning,
+        basement=basement,
+        wwr=0.3,
+        roof_height=roof_height,
+        floor_multiplier=True,
+    )
+    assert geom.modeled_stories == 3
+    assert geom.middle_storey_multiplier == 10
+
+    idf = geom.add(minimal_idf)
+
+    zones = idf.idfobjects["ZONE"]
+    expected_zone_count = (3 + geom.basement_storey_count) * geom.zones_per_storey + (
+        1 if roof_height else 0
+    )
+    assert len(zones) == expected_zone_count
+
+    living_area = 0.0
+    for zone in zones:
+        is_attic = "attic" in zone.Name.lower()
+        is_basement = basement and zone.Name.endswith(geom.basement_suffix)
+        is_middle = zone.Name.endswith(f" {geom.middle_storey_suffix}")
+        assert not (is_middle and (is_attic or is_basement))
+        assert float(zone.Multiplier or 1) == (10 if is_middle else 1)
+        if not is_attic and not is_basement:
+            living_area += get_zone_floor_area(idf, zone.Name) * float(
+                zone.Multiplier or 1
+            )
+    assert living_area == pytest.approx(geom.total_living_area)
+
+    # each copy of the middle storey should sit between identical stories
+    surfaces = {srf.Name: srf for srf in idf.idfobjects["BUILDINGSURFACE:DETAILED"]}
+    for srf in surfaces.values():
+        if srf.Outside_Boundary_Condition.lower() != "surface":
+            continue
+        other = surfaces[srf.Outside_Boundary_Condition_Object]
+        assert other.Outside_Boundary_Condition_Object == srf.Name
+        if srf.Zone_Name.endswith(f" {geom.middle_storey_suffix}") and (
+            srf.Surface_Type.lower() in ("floor", "ceiling")
+        ):
+            assert other.Zone_Name == srf.Zone_Name
+
+    z_max = max(
+        float(srf[f"Vertex_{i}_Zcoordinate"])
+        for srf in idf.idfobjects["BUILDINGSURFACE:DETAILED"]
+        for i in range(1, 4)
+    )
+    assert z_max == pytest.approx(geom.total_height_with_gabling)
+
+
+def test_floor_multiplier_ignored_for_short_buildings():
+    """Test that buildings with three or fewer stories are modeled in full."""
+    geom = ShoeboxGeometry(
+        x=0,
+        y=0,
+        w=20,
+        d=15,
+        h=3,
+        num_stories=3,
+        zoning="by_storey",
+        floor_multiplier=True,
+    )
+    assert geom.modeled_stories == 3
+    assert geom.middle_storey_multiplier == 1
+    with pytest.raises(ValueError, match="floor multiplier"):
+        _ = geom.middle_storey_suffix
+
+
+@pytest.mark.parametrize(
+    "w, d, wwr, tolerance, expected",
+    [
+        # a 6m deep footprint cannot fit a core with 3m perimeters
+        (20, 6, 0.3, 0.05, "by_storey"),
+        # the default tolerance is tighter than any building with a core
+        (20, 15, 0.05, 0.05, "core/perim"),
+        (20, 15, 0.1, 0.1, "by_storey"),
+        (20, 15, 0.4, 0.1, "core/perim"),
+    ],
+)
+def test_auto_zoning_resolution(w, d, wwr, tolerance, expected):
+    """Test that auto zoning compares the estimated deviation against the tolerance."""
+    geom = ShoeboxGeometry(
+        x=0,
+        y=0,
+        w=w,
+        d=d,
+        h=3,
+        wwr=wwr,
+        num_stories=2,
+        zoning="auto",
+        zoning_tolerance=tolerance,
+    )
+    assert geom.resolved_zoning == expected
+    if geom.has_core:
+        assert geom.estimated_zoning_deviation == pytest.approx(
+            ZONING_DEVIATION_BASE + ZONING_DEVIATION_PER_WWR * wwr
+        )
+    else:
+        assert geom.estimated_zoning_deviation == 0
+    assert geom.zones_per_storey == (5 if expected == "core/perim" else 1)
+
+
+def test_explicit_zoning_ignores_tolerance():
+    """Test that an explicit zoning choice is never overridden."""
+    geom = ShoeboxGeometry(
+        x=0,
+        y=0,
+        w=20,
+        d=15,
+        h=3,
+        wwr=0.1,
+        num_stories=1,
+        zoning="core/perim",
+        zoning_tolerance=1,
+    )
+    assert geom.resolved_zoning == "core/perim"
+
+
+@pytest.mark.parametrize("engine", ["geomeppy", "analytic"])
+def test_auto_zoning_builds_resolved_zones(minimal_idf, engine):
+    """Test that auto zoning creates the zones of the zoning it resolves to."""
+    geom = ShoeboxGeometry(
+        x=0,
+        y=0,
+        w=20,
+        d=6,
+        h=3,
+        wwr=0.2,
+        num_stories=2,
+        zoning="auto",
+        engine=engine,
+    )
+    idf = geom.add(minimal_idf)
+    assert len(idf.idfobjects["ZONE"]) == 2
@@ -0,0 +1,177 @@
+"""Tests for the EnergyPlus object interface."""
+
+from pathlib import Path
+
+import pytest
+from archetypal.idfclass import IDF
+from pydantic import ValidationError
+
+from epinterface.data import EnergyPlusArtifactDir
+from epinterface.interface import (
+    FIDELITY_PROFILES,
+    FidelityProfile,
+    HVACTemplateThermostat,
+    HVACTemplateZoneIdealLoadsAirSystem,
+    SimulationFidelity,
+    add_default_sim_controls,
+    set_sizing_only_sim_controls,
+)
+from epinterface.settings import energyplus_settings
+
+
+@pytest.mark.parametrize("profile", list(FIDELITY_PROFILES))
+def test_fidelity_profile_sets_controls_together(
+    profile: FidelityProfile, tmp_path: Path
+):
+    """A fidelity profile should set the timestep, shading, solar distribution and warmup."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        prep_outputs=False,
+        output_directory=tmp_path.as_posix(),
+    )
+    fidelity = FIDELITY_PROFILES[profile]
+
+    idf = add_default_sim_controls(idf, fidelity)
+    # applying twice should not duplicate the unique objects
+    idf = fidelity.add(idf)
+
+    (timestep,) = idf.idfobjects["TIMESTEP"]
+    assert timestep.Number_of_Timesteps_per_Hour == fidelity.timesteps_per_hour
+    (shading,) = idf.idfobjects["SHADOWCALCULATION"]
+    assert shading.Shading_Calculation_Update_Frequency == (
+        fidelity.shading_update_frequency
+    )
+    (building,) = idf.idfobjects["BUILDING"]
+    assert building.Solar_Distribution == fidelity.solar_distribution
+    assert building.Minimum_Number_of_Warmup_Days == fidelity.minimum_warmup_days
+    assert building.Maximum_Number_of_Warmup_Days == fidelity.maximum_warmup_days
+    assert building.Loads_Convergence_Tolerance_Value == (
+        fidelity.loads_convergence_tolerance
+    )
+    assert building.Temperature_Convergence_Tolerance_Value == (
+        fidelity.temperature_convergence_tolerance
+    )
+
+
+def test_fidelity_profiles_are_ordered():
+    """Each profile should be at least as fine as the profile before it."""
+    screening, standard, detailed = (
+        FIDELITY_PROFILES[p] for p in ("screening", "standard", "detailed")
+    )
+    for coarse, fine in ((screening, standard), (standard, detailed)):
+        assert coarse.timesteps_per_hour < fine.timesteps_per_hour
+        assert coarse.shading_update_frequency > fine.shading_update_frequency
+        assert coarse.loads_convergence_tolerance > fine.loads_convergence_tolerance
+        assert coarse.maximum_warmup_days < fine.maximum_warmup_days
+
+
+def test_fidelity_rejects_invalid_settings():
+    """Timesteps which do not divide an hour and inverted warmup bounds should be rejected."""
+    standard = FIDELITY_PROFILES["standard"].model_dump()
+    with pytest.raises(ValidationError):
+        SimulationFidelity(**{**standard, "timesteps_per_hour": 7})
+    with pytest.raises(ValidationError):
+        SimulationFidelity(**{
+            **standard,
+            "minimum_warmup_days": 10,
+            "maximum_warmup_days": 5,
+        })
+
+
+def test_sizing_only_sim_controls_skip_the_run_period(tmp_path: Path):
+    """A sizing-only model should run the zone sizing and nothing else."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        prep_outputs=False,
+        output_directory=tmp_path.as_posix(),
+    )
+    idf = set_sizing_only_sim_controls(add_default_sim_controls(idf))
+
+    (sim_control,) = idf.idfobjects["SIMULATIONCONTROL"]
+    assert sim_control.Do_Zone_Sizing_Calculation == "Yes"
+    assert sim_control.Do_System_Sizing_Calculation == "No"
+    assert sim_control.Run_Simulation_for_Sizing_Periods == "No"
+    assert sim_control.Run_Simulation_for_Weather_File_Run_Periods == "No"
+
+
+@pytest.mark.parametrize(
+    ("outdoor_air_method", "autosize", "expect_sizing"),
+    [("None", False, False), ("Sum", False, True), ("None", True, True)],
+)
+def test_native_ideal_loads_match_expanded_template(
+    outdoor_air_method: str, autosize: bool, expect_sizing: bool, tmp_path: Path
+):
+    """The native backend should write the objects ExpandObjects would, with the same names."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        prep_outputs=False,
+        output_directory=tmp_path.as_posix(),
+    )
+    thermostat = HVACTemplateThermostat(
+        Name="Zone A Thermostat Template",
+        Constant_Heating_Setpoint=21,
+        Constant_Cooling_Setpoint=24,
+    )
+    thermostat.add_native(idf)
+    for zone in ("Zone A", "Zone B"):
+        HVACTemplateZoneIdealLoadsAirSystem(
+            Zone_Name=zone,
+            Template_Thermostat_Name=thermostat.Name,
+            Outdoor_Air_Method=outdoor_air_method,  # pyright: ignore [reportArgumentType]
+            Heating_Limit="LimitCapacity" if autosize else "NoLimit",
+            Maximum_Sensible_Heating_Capacity="autosize" if autosize else None,
+        ).add_native(idf, thermostat)
+
+    assert not idf.idfobjects["HVACTEMPLATE:THERMOSTAT"]
+    assert not idf.idfobjects["HVACTEMPLATE:ZONE:IDEALLOADSAIRSYSTEM"]
+    ideal_loads = idf.idfobjects["ZONEHVAC:IDEALLOADSAIRSYSTEM"]
+    assert [obj.Name for obj in ideal_loads] == [
+        "Zone A Ideal Loads Air System",
+        "Zone B Ideal Loads Air System",
+    ]
+    controls = idf.idfobjects["ZONECONTROL:THERMOSTAT"]
+    assert [obj.Name for obj in controls] == ["Zone A Thermostat", "Zone B Thermostat"]
+    assert {obj.Control_1_Name for obj in controls} == {
+        "Zone A Thermostat Template Dual SP Control"
+    }
+    (setpoint,) = idf.idfobjects["THERMOSTATSETPOINT:DUALSETPOINT"]
+    assert setpoint.Name == "Zone A Thermostat Template Dual SP Control"
+    # the always-on schedules are shared between zones rather than duplicated
+    schedule_names = [obj.Name for obj in idf.idfobjects["SCHEDULE:CONSTANT"]]
+    assert len(schedule_names) == len(set(schedule_names))
+    assert "HVACTemplate-Always 4" in schedule_names
+
+    connections = idf.idfobjects["ZONEHVAC:EQUIPMENTCONNECTIONS"]
+    assert [obj.Zone_Conditioning_Equipment_List_Name for obj in connections] == [
+        "Zone A Equipment",
+        "Zone B Equipment",
+    ]
+    assert len(idf.idfobjects["SIZING:ZONE"]) == (2 if expect_sizing else 0)
+    assert len(idf.idfobjects["DESIGNSPECIFICATION:OUTDOORAIR"]) == (
+        2 if outdoor_air_method != "None" else 0
+    )
+
+
+def test_native_ideal_loads_require_the_template_thermostat(tmp_path: Path):
+    """A system should not be wired to a thermostat other than its template thermostat."""
+    ep_version = energyplus_settings.archetypal_energyplus_version
+    idf = IDF(
+        (EnergyPlusArtifactDir / "Minimal.idf").as_posix(),
+        as_version=ep_version.dot,
+        file_version=ep_version.dot,
+        prep_outputs=False,
+        output_directory=tmp_path.as_posix(),
+    )
+    with pytest.raises(ValueError, match="not the template thermostat"):
+        HVACTemplateZoneIdealLoadsAirSystem(
+            Zone_Name="Zone A", Template_Thermostat_Name="Other Thermostat"
+        ).add_native(idf, HVACTemplateThermostat(Name="Zone A Thermostat Template"))